@@ -29,7 +29,9 @@ def show_status():
         service = get_authenticated_service()
 
         # Verify by getting channel info
-        request = service.channels().list(part="snippet", mine=True)
+        request = service.channels().list(
+            part="snippet", mine=True, fields="items/snippet(title,customUrl)"
+        )
         response = request.execute()
         if "items" in response:
             snippet = response["items"][0]["snippet"]
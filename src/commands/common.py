@@ -0,0 +1,22 @@
+import typer
+from rich.console import Console
+
+from ..lib.core.config import config
+from ..lib.data.quota import estimate_remaining_units
+
+console = Console()
+
+
+def require_quota(units: int, action: str):
+    """
+    units ユニットを使う操作 (action, 例: "3 件の更新") を実行できるだけの推定残量があるか確認する。
+    足りなければメッセージを表示して終了する。
+    """
+    remaining = estimate_remaining_units()
+    if units > remaining:
+        console.print(
+            f"[bold red]Quota不足: {action}に {units:,} ユニット必要ですが、"
+            f"推定残量は {remaining:,}/{config.upload.daily_quota_limit:,} ユニットです。[/]"
+        )
+        raise typer.Exit(code=1)
+    console.print(f"[dim]Quota: {units:,} ユニット使用予定 (推定残量 {remaining:,})[/]")
@@ -1,10 +1,20 @@
+from pathlib import Path
+
 import typer
 from rich.console import Console
+from rich.progress import BarColumn, MofNCompleteColumn, Progress, TextColumn
 from rich.table import Table
 
 from ..lib.auth.auth import get_credentials
 from ..lib.core.logger import setup_logging
+from ..lib.data.history import HistoryManager
+from ..lib.data.playlist_index import PlaylistIndex
+from ..lib.data.quota import COST_PLAYLIST_ITEM_WRITE
+from ..lib.data.remote_catalog import RemoteCatalog
+from ..lib.video.manager import VideoManager
 from ..lib.video.playlist import PlaylistManager
+from ..lib.video.playlist_sort import plan_moves, target_order
+from .common import require_quota
 
 app = typer.Typer(help="Manage playlists.")
 console = Console()
@@ -12,7 +22,7 @@ console = Console()
 def _get_manager():
     try:
         credentials = get_credentials()
-        return PlaylistManager(credentials)
+        return PlaylistManager(credentials, index=PlaylistIndex())
     except Exception as e:
         console.print(f"[bold red]Auth Error:[/] {e}")
         raise typer.Exit(code=1)
@@ -154,6 +164,8 @@ def _fix_orphans(orphans, pl_manager, yes: bool):
     
     console.print("\n[bold]Assigning Orphans...[/]")
     
+    # Resolve target playlists first, then add all videos in batched calls
+    assignments = []
     for orphan in orphans:
         vid_id = orphan["id"]
         # Look up in history
@@ -173,18 +185,24 @@ def _fix_orphans(orphans, pl_manager, yes: bool):
                     pass
         
         if target_playlist:
-            # Add to playlist
             # We assume get_or_create handles the existence check
             pl_id = pl_manager.get_or_create_playlist(target_playlist)
             if pl_id:
-                if pl_manager.add_video_to_playlist(pl_id, vid_id):
-                    console.print(f"[green]Assigned {orphan['title']} -> {target_playlist}[/]")
-                else:
-                     console.print(f"[red]Failed to assign {orphan['title']} -> {target_playlist}[/]")
+                assignments.append((orphan, target_playlist, pl_id))
             else:
                  console.print(f"[red]Failed to get/create playlist {target_playlist} for {orphan['title']}[/]")
         else:
             console.print(f"[dim]Skipping {orphan['title']} (no history/playlist found)[/]")
+
+    if assignments:
+        results = pl_manager.add_videos_to_playlists(
+            [(pl_id, orphan["id"]) for orphan, _, pl_id in assignments]
+        )
+        for orphan, target_playlist, pl_id in assignments:
+            if results.get((pl_id, orphan["id"])):
+                console.print(f"[green]Assigned {orphan['title']} -> {target_playlist}[/]")
+            else:
+                console.print(f"[red]Failed to assign {orphan['title']} -> {target_playlist}[/]")
             
     history.close()
 
@@ -200,10 +218,10 @@ def list_orphans(
     
     # 1. Initialize Managers
     credentials = get_credentials()
-    pl_manager = PlaylistManager(credentials)
-    # We need VideoManager for getting all uploads
+    pl_manager = PlaylistManager(credentials, index=PlaylistIndex())
+    # We need VideoManager for getting all uploads (served from the local mirror)
     from ..lib.video.manager import VideoManager
-    vid_manager = VideoManager(credentials)
+    vid_manager = VideoManager(credentials, catalog=RemoteCatalog())
     
     # 2. Fetch all videos and playlist map
     console.print("[yellow]Fetching all uploaded videos and playlist data... (this may take a while)[/]")
@@ -213,7 +231,17 @@ def list_orphans(
         console.print("[red]No uploaded videos found or API error.[/]")
         return
 
-    playlist_map = pl_manager.get_all_playlists_map()
+    with Progress(
+        TextColumn("[progress.description]{task.description}"),
+        BarColumn(),
+        MofNCompleteColumn(),
+        console=console,
+        transient=True,
+    ) as progress:
+        task = progress.add_task("Scanning playlists", total=None)
+        playlist_map = pl_manager.get_all_playlists_map(
+            progress_callback=lambda done, total: progress.update(task, completed=done, total=total)
+        )
     
     # 3. Identify Orphans
     # Create a set of all video IDs currently in ANY playlist
@@ -242,3 +270,168 @@ def list_orphans(
         
     # 4. Fix Orphans
     _fix_orphans(orphans, pl_manager, yes)
+
+SORT_KEYS = ("title", "index", "date")
+
+def _sort_keys(by: str, items, manager: PlaylistManager):
+    """並び替えキー {item_id: key} を作る。キーが無いアイテムは None。"""
+    if by == "title":
+        return {item["item_id"]: item["title"] for item in items}
+
+    if by == "index":
+        # アップロード時の {index} と同じく、ローカルのフォルダ → ファイル名の順
+        history = HistoryManager()
+        keys = {}
+        for item in items:
+            record = history.get_record_by_video_id(item["video_id"])
+            if record and record.get("file_path"):
+                path = Path(record["file_path"])
+                keys[item["item_id"]] = (str(path.parent), path.name)
+            else:
+                keys[item["item_id"]] = None
+        history.close()
+        return keys
+
+    # date: 撮影日 (recordingDetails.recordingDate)
+    videos = VideoManager(manager.credentials).get_videos(
+        list(dict.fromkeys(item["video_id"] for item in items)),
+        part="recordingDetails",
+        fields="items(id,recordingDetails/recordingDate)",
+    )
+    return {
+        item["item_id"]: videos.get(item["video_id"], {}).get("recordingDetails", {}).get("recordingDate")
+        for item in items
+    }
+
+@app.command("sort")
+def sort_playlist(
+    name_or_id: str = typer.Argument(..., help="Playlist Name or ID"),
+    by: str = typer.Option("title", "--by", help="Sort key: title, index (local file order from history), date (recording date)"),
+    reverse: bool = typer.Option(False, "--reverse", help="Sort in descending order"),
+    dry_run: bool = typer.Option(False, "--dry-run", help="Show the planned moves without changing anything"),
+    yes: bool = typer.Option(False, "-y", "--yes", help="Skip confirmation"),
+):
+    """
+    プレイリストを並び替える。
+    最長増加部分列 (LIS) に乗っている動画は動かさず、必要最小限の移動だけを実行する。
+    """
+    setup_logging(level="INFO")
+    if by not in SORT_KEYS:
+        console.print(f"[red]Invalid sort key: {by} (choose from {', '.join(SORT_KEYS)})[/]")
+        raise typer.Exit(code=1)
+
+    manager = _get_manager()
+    playlist_id = manager.find_playlist_id(name_or_id)
+    if not playlist_id:
+        console.print(f"[red]Playlist not found: {name_or_id}[/]")
+        raise typer.Exit(code=1)
+
+    items = sorted(manager.list_playlist_items(playlist_id), key=lambda item: item["position"])
+    if not items:
+        console.print(f"[yellow]No videos found in playlist: {name_or_id}[/]")
+        return
+
+    keys = _sort_keys(by, items, manager)
+    unkeyed = sum(1 for item in items if keys.get(item["item_id"]) is None)
+    if unkeyed:
+        console.print(f"[dim]{unkeyed} videos have no '{by}' key and will be kept at the end.[/]")
+
+    moves = plan_moves([item["item_id"] for item in items], target_order(items, keys, reverse))
+    if not moves:
+        console.print(f"[green]Playlist '{name_or_id}' is already sorted by {by}.[/]")
+        return
+
+    units = len(moves) * COST_PLAYLIST_ITEM_WRITE
+    console.print(
+        f"Plan: {len(moves)} moves for {len(items)} videos (~{units:,} units, "
+        f"vs {len(items) * COST_PLAYLIST_ITEM_WRITE:,} to rewrite every position)"
+    )
+
+    if dry_run:
+        titles = {item["item_id"]: item["title"] for item in items}
+        for item_id, position in moves:
+            console.print(f"[dim]Would move '{titles[item_id]}' to #{position + 1}[/]")
+        return
+
+    require_quota(units, f"{len(moves)} 件の移動")
+    if not yes and not typer.confirm(f"Move {len(moves)} videos in '{name_or_id}'?"):
+        raise typer.Abort()
+
+    with console.status(f"[bold green]Sorting '{name_or_id}' by {by}..."):
+        applied = manager.apply_moves(playlist_id, items, moves)
+
+    if applied < len(moves):
+        console.print(f"[red]Stopped after {applied}/{len(moves)} moves. Re-run to finish sorting.[/]")
+        raise typer.Exit(code=1)
+    console.print(f"[green]Sorted '{name_or_id}' by {by} with {applied} moves.[/]")
+
+@app.command("dedupe")
+def dedupe_playlists(
+    name_or_id: str = typer.Argument(None, help="Playlist Name or ID (default: all playlists)"),
+    dry_run: bool = typer.Option(False, "--dry-run", help="Report duplicates without deleting anything"),
+    yes: bool = typer.Option(False, "-y", "--yes", help="Skip confirmation"),
+    concurrency: int = typer.Option(None, "--concurrency", "-c", help="Concurrent API requests (default: api.concurrency)"),
+):
+    """
+    プレイリスト内で重複している動画を検出し、最初の1件を残して削除する。
+    """
+    setup_logging(level="INFO")
+    manager = _get_manager()
+    titles = manager.get_playlist_titles()
+
+    playlist_ids = None
+    if name_or_id:
+        playlist_id = manager.find_playlist_id(name_or_id)
+        if not playlist_id:
+            console.print(f"[red]Playlist not found: {name_or_id}[/]")
+            raise typer.Exit(code=1)
+        playlist_ids = [playlist_id]
+
+    with Progress(
+        TextColumn("[progress.description]{task.description}"),
+        BarColumn(),
+        MofNCompleteColumn(),
+        console=console,
+        transient=True,
+    ) as progress:
+        task = progress.add_task("Scanning playlists", total=None)
+        duplicates = manager.find_duplicate_items(
+            playlist_ids,
+            max_workers=concurrency,
+            progress_callback=lambda done, total: progress.update(task, completed=done, total=total),
+        )
+
+    if not duplicates:
+        console.print("[green]No duplicate videos found.[/]")
+        return
+
+    table = Table(title="Duplicate Videos")
+    table.add_column("Playlist", style="magenta")
+    table.add_column("Video ID", style="cyan")
+    table.add_column("Copies", justify="right")
+    extra_item_ids = []
+    for playlist_id, extras in duplicates.items():
+        for video_id, item_ids in extras.items():
+            table.add_row(titles.get(playlist_id, playlist_id), video_id, str(len(item_ids) + 1))
+            extra_item_ids.extend(item_ids)
+    console.print(table)
+
+    units = len(extra_item_ids) * COST_PLAYLIST_ITEM_WRITE
+    console.print(
+        f"Plan: delete {len(extra_item_ids)} duplicate items in {len(duplicates)} playlists (~{units:,} units)"
+    )
+    if dry_run:
+        return
+
+    require_quota(units, f"{len(extra_item_ids)} 件の削除")
+    if not yes and not typer.confirm(f"Delete {len(extra_item_ids)} duplicate items?"):
+        raise typer.Abort()
+
+    with console.status(f"[bold green]Deleting {len(extra_item_ids)} duplicate items..."):
+        results = manager.delete_playlist_items(extra_item_ids, concurrency=concurrency)
+
+    success_count = sum(results.values())
+    fail_count = len(extra_item_ids) - success_count
+    console.print(f"\n[bold]Dedupe Complete:[/] {success_count} removed, {fail_count} failed.")
+    if fail_count > 0:
+        raise typer.Exit(code=1)
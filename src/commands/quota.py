@@ -1,19 +1,19 @@
 
-from datetime import date, datetime
+from datetime import date
 
 import typer
 from rich.console import Console
 from rich.panel import Panel
+from rich.table import Table
 
+from ..lib.core.config import config
 from ..lib.data.history import HistoryManager
+from ..lib.data.quota import today_start
+from ..lib.data.quota_ledger import get_ledger
 
-app = typer.Typer(help="Check estimated API quota usage.")
+app = typer.Typer(help="Check API quota usage.")
 console = Console()
 
-# Estimated costs
-COST_VIDEO_UPLOAD = 1600
-# Playlist creation and item insertion costs are smaller, usually 50 each.
-# We will focus on video uploads as the main consumer.
 
 def sizeof_fmt(num, suffix="B"):
     for unit in ("", "Ki", "Mi", "Gi", "Ti", "Pi", "Ei", "Zi"):
@@ -25,56 +25,59 @@ def sizeof_fmt(num, suffix="B"):
 @app.command("quota")
 def quota(
     daily_limit: int = typer.Option(
-        10000, "--limit", "-l", help="Daily quota limit (default: 10,000)"
+        None, "--limit", "-l", help="Daily quota limit (default: daily_quota_limit in settings.yaml)"
     ),
 ):
     """
-    Show estimated API quota usage for today based on upload history.
-    Note: This is an estimation. Actual usage may vary.
+    Show today's API quota usage from the quota ledger.
+    Every API call made by this tool is recorded with its unit cost.
     """
-    history_manager = HistoryManager()
-    
-    # Get start of today (local time)
-    now = datetime.now()
-    today_start = datetime(now.year, now.month, now.day).timestamp()
-    
-    # Fetch all records
-    # We fetch all because TinyDB doesn't query by timestamp range efficiently without index,
-    # and the history size is expected to be manageable.
-    all_records = history_manager.get_all_records(limit=0)
-    
-    today_uploads = [
-        r for r in all_records 
-        if r.get("status") == "success" and r.get("timestamp", 0) >= today_start
-    ]
-    
-    count = len(today_uploads)
-    estimated_usage = count * COST_VIDEO_UPLOAD
-    
-    total_size_bytes = sum(r.get("file_size", 0) for r in today_uploads)
-    total_size_str = sizeof_fmt(total_size_bytes)
-    
+    daily_limit = config.upload.daily_quota_limit if daily_limit is None else daily_limit
+    since = today_start()
+
+    ledger = get_ledger()
+    usage = ledger.usage_by_method(since)
+    used_units = sum(units for _, _, units in usage)
+    history = HistoryManager()
+    try:
+        upload_count, total_size = history.get_upload_stats(since)
+    finally:
+        history.close()
+
     # Calculate percentage
-    percent = (estimated_usage / daily_limit) * 100 if daily_limit > 0 else 0
-    
+    percent = (used_units / daily_limit) * 100 if daily_limit > 0 else 0
+
     # Color coding
     color = "green"
     if percent > 50:
         color = "yellow"
     if percent > 80:
         color = "red"
-        
+
     console.print(
         Panel(
             f"[bold]Date:[/] {date.today()}\n"
-            f"[bold]Uploads Today:[/] {count}\n"
-            f"[bold]Total Size:[/] {total_size_str}\n"
-            f"[bold]Estimated Usage:[/] [{color}]{estimated_usage:,}[/] / {daily_limit:,} units\n"
-            f"[bold]Remaining:[/] {max(0, daily_limit - estimated_usage):,} units",
-            title="API Quota Estimation",
+            f"[bold]Project:[/] {ledger.project or 'unknown'}\n"
+            f"[bold]Uploads Today:[/] {upload_count}\n"
+            f"[bold]Total Size:[/] {sizeof_fmt(total_size)}\n"
+            f"[bold]Used:[/] [{color}]{used_units:,}[/] / {daily_limit:,} units\n"
+            f"[bold]Remaining:[/] {max(0, daily_limit - used_units):,} units",
+            title="API Quota Usage",
             border_style=color,
             expand=False
         )
     )
-    
-    console.print("[dim]Note: 1 Video Upload ≈ 1,600 units. Other API calls are negligible but add up.[/]")
+
+    if usage:
+        table = Table(title="Usage by method")
+        table.add_column("Method", style="cyan")
+        table.add_column("Calls", justify="right")
+        table.add_column("Units", justify="right", style="magenta")
+        for method, calls, units in usage:
+            table.add_row(method.removeprefix("youtube."), f"{calls:,}", f"{units:,}")
+        console.print(table)
+
+    console.print(
+        "[dim]Note: Counted from the calls this tool made (local midnight reset). "
+        "Calls from other tools sharing the project are not included.[/]"
+    )
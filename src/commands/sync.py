@@ -3,9 +3,11 @@ from rich.console import Console
 from rich.panel import Panel
 from rich.table import Table
 
-from ..lib.auth.auth import get_authenticated_service
+from ..lib.auth.auth import get_credentials
+from ..lib.auth.service import get_service
 from ..lib.core.logger import setup_logging
 from ..lib.data.history import HistoryManager
+from ..lib.data.remote_catalog import RemoteCatalog
 from ..services.sync_manager import SyncManager
 
 app = typer.Typer(help="Synchronize local history with YouTube.")
@@ -31,6 +33,43 @@ def _print_missing_remote(missing_remote, console: Console):
         table.add_row(link, item["local_path"])
     console.print(table)
 
+def _reconcile(manager: SyncManager, missing_local, directory: str, yes: bool):
+    console.print(f"\n[bold cyan]Matching {len(missing_local)} YouTube-only videos against {directory}...[/]")
+    try:
+        matches, unmatched = manager.reconcile_missing_local(missing_local, directory)
+    except Exception as e:
+        console.print(f"[bold red]Error matching local files:[/] {e}")
+        raise typer.Exit(code=1)
+
+    if not matches:
+        console.print("[yellow]No matching local files found.[/]")
+        return
+
+    table = Table(title=f"Matched Local Files ({len(matches)} of {len(missing_local)})")
+    table.add_column("Video ID", style="cyan")
+    table.add_column("Title", style="magenta")
+    table.add_column("Original File", style="green")
+    table.add_column("Local Path", style="dim")
+    for match in matches:
+        vid = match["video_id"]
+        table.add_row(
+            f"[link=https://youtu.be/{vid}]{vid}[/link]",
+            match["remote_title"],
+            match.get("remote_file_name") or "N/A",
+            match["file_path"],
+        )
+    console.print(table)
+    if unmatched:
+        console.print(f"[dim]{len(unmatched)} videos had no matching local file.[/]")
+
+    if not yes:
+        if not typer.confirm(f"Record {len(matches)} matched files as uploaded?"):
+            console.print("[yellow]Aborted.[/]")
+            raise typer.Abort()
+
+    recorded = manager.apply_reconciled(matches)
+    console.print(f"[green]Reconcile complete:[/] {recorded} records added")
+
 @app.command("sync")
 def sync(
     dry_run: bool = typer.Option(
@@ -42,6 +81,12 @@ def sync(
     yes: bool = typer.Option(
         False, "-y", "--yes", help="Skip confirmation prompt for --fix."
     ),
+    full_refresh: bool = typer.Option(
+        False, "--full-refresh", help="Re-fetch the whole upload list instead of an incremental mirror refresh."
+    ),
+    reconcile: str = typer.Option(
+        None, "--reconcile", help="Match YouTube-only videos to files in this directory (by original file size/name) and record them."
+    ),
 ):
     """
     Compare local history with actual YouTube uploads.
@@ -50,17 +95,19 @@ def sync(
     
     # Auth is required for sync
     try:
-        service = get_authenticated_service()
+        credentials = get_credentials()
+        service = get_service(credentials)
     except Exception as e:
         console.print(f"[bold red]Auth Error:[/] {e}")
         raise typer.Exit(code=1)
 
     history = HistoryManager()
-    manager = SyncManager(service, history)
+    manager = SyncManager(service, history, catalog=RemoteCatalog(history.db_path), credentials=credentials)
 
     console.print("[bold cyan]Fetching remote video list (this may take a while)...[/]")
     try:
-        in_sync, missing_local, missing_remote = manager.compare()
+        # --fix は履歴を削除するので、TTL 内でもミラーを全件取り直してから比較する
+        in_sync, missing_local, missing_remote = manager.compare(full_refresh=full_refresh or fix)
     except Exception as e:
         console.print(f"[bold red]Error fetching/comparing videos:[/] {e}")
         raise typer.Exit(code=1)
@@ -103,3 +150,7 @@ def sync(
         )
     elif fix and not missing_remote:
         console.print("[green]No local-only records to fix.[/]")
+
+    # --reconcile: リモートにだけある動画をローカルファイルと突き合わせて履歴へ登録
+    if reconcile and missing_local:
+        _reconcile(manager, missing_local, reconcile, yes)
@@ -25,12 +25,21 @@ def upload(
     workers: int = typer.Option(
         1, help="Number of concurrent uploads (careful with quota!)"
     ),
+    min_workers: int = typer.Option(
+        None, "--min-workers", help="Lower bound for adaptive concurrency (default: settings.yaml)"
+    ),
+    max_workers: int = typer.Option(
+        None, "--max-workers", help="Upper bound for adaptive concurrency (default: --workers)"
+    ),
     simple_check: bool = typer.Option(
         False, "--simple-check", help="Use simple file path check for deduplication (faster but less robust)"
     ),
     privacy: str = typer.Option(
         None, "--privacy", help="Override privacy status (private, public, unlisted)"
     ),
+    wait_processing: bool = typer.Option(
+        False, "--wait-processing", help="After uploading, wait until YouTube finishes processing the new videos"
+    ),
 ):
     """
     Upload videos from a directory.
@@ -59,6 +68,9 @@ def upload(
             workers,
             playlist,
             simple_check=simple_check,
-            privacy_status=privacy
+            privacy_status=privacy,
+            min_workers=min_workers,
+            max_workers=max_workers,
+            wait_processing=wait_processing,
         )
     )
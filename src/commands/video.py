@@ -1,11 +1,23 @@
+import json
+import time
+from pathlib import Path
+from typing import List
+
 import typer
 from rich.console import Console
 from rich.table import Table
 
 from ..lib.auth.auth import get_credentials
 from ..lib.core.logger import setup_logging
+from ..lib.data.history import HistoryManager
+from ..lib.data.playlist_index import PlaylistIndex
+from ..lib.data.quota import COST_LIST, COST_VIDEO_UPDATE, list_calls_for
+from ..lib.data.remote_catalog import RemoteCatalog
 from ..lib.video.manager import VideoManager
 from ..lib.video.playlist import PlaylistManager
+from ..services.metadata_sync import MetadataSyncManager
+from ..services.processing_poller import ProcessingPoller, is_failed
+from .common import require_quota
 
 app = typer.Typer(help="Manage videos.")
 console = Console()
@@ -13,71 +25,108 @@ console = Console()
 def _get_manager():
     try:
         credentials = get_credentials()
-        return VideoManager(credentials)
+        return VideoManager(credentials, catalog=RemoteCatalog())
     except Exception as e:
         console.print(f"[bold red]Auth Error:[/] {e}")
         raise typer.Exit(code=1)
 
+_PRIVACY_STYLES = {"public": "green", "unlisted": "yellow"}
+
+
+def _video_rows_table(show_header: bool) -> Table:
+    # 行を届いた分ずつ出力するので、列幅を固定してチャンク間で揃える
+    table = Table(show_header=show_header, box=None, pad_edge=False)
+    table.add_column("#", style="dim", width=6, no_wrap=True)
+    table.add_column("Video ID", style="cyan", width=11, no_wrap=True)
+    table.add_column("Privacy", width=8, no_wrap=True)
+    table.add_column("Title", style="magenta")
+    return table
+
+
 @app.command("list")
 def list_videos(
     status: str = typer.Option(
         None, "--status", "-s", help="Filter by privacy status (private/public/unlisted)"
     ),
+    limit: int = typer.Option(
+        None, "--limit", "-n", help="Show at most this many videos (newest first); stops fetching early"
+    ),
+    format: str = typer.Option("table", "--format", "-f", help="Output format (table/ndjson)"),
+    full_refresh: bool = typer.Option(
+        False, "--full-refresh", help="Re-fetch the whole upload list instead of an incremental mirror refresh."
+    ),
 ):
     """
-    アップロード済み動画の一覧を表示する。
+    アップロード済み動画の一覧を、取得できた分から順に表示する。
     """
-    setup_logging(level="INFO")
+    if format not in ("table", "ndjson"):
+        console.print(f"[bold red]Unknown format: {format}[/] (table/ndjson)")
+        raise typer.Exit(code=1)
+    ndjson = format == "ndjson"
+    # NDJSON は標準出力をそのままパイプに流せるよう、ログを警告以上に絞る
+    setup_logging(level="WARNING" if ndjson else "INFO")
     manager = _get_manager()
 
-    console.print("[bold cyan]Fetching videos (this may take a while)...[/]")
-    videos = manager.get_all_uploaded_videos()
+    if not ndjson:
+        console.print("[bold cyan]Fetching videos...[/]")
+    videos = manager.iter_uploaded_videos(full_refresh=full_refresh, privacy=status, limit=limit)
 
-    if not videos:
-        console.print("[yellow]No uploaded videos found.[/]")
-        return
+    count = 0
+    table = None
+    for count, v in enumerate(videos, 1):
+        if ndjson:
+            typer.echo(json.dumps(v, ensure_ascii=False))
+            continue
 
-    # フィルタリング
-    if status:
-        videos = [v for v in videos if v.get("privacy") == status]
-        if not videos:
-            console.print(f"[yellow]No videos found with status: {status}[/]")
-            return
-
-    table = Table(title=f"Uploaded Videos ({len(videos)} total)")
-    table.add_column("#", style="dim", width=5)
-    table.add_column("Title", style="magenta")
-    table.add_column("Video ID", style="cyan")
-    table.add_column("Privacy", style="dim")
-
-    for i, v in enumerate(videos, 1):
+        if table is None:
+            table = _video_rows_table(show_header=count == 1)
         vid = v["id"]
-        link = f"[link=https://youtu.be/{vid}]{vid}[/link]"
         privacy = v.get("privacy", "unknown")
-        # 公開状態に色を付ける
-        if privacy == "public":
-            privacy_display = f"[green]{privacy}[/]"
-        elif privacy == "unlisted":
-            privacy_display = f"[yellow]{privacy}[/]"
-        else:
-            privacy_display = f"[dim]{privacy}[/]"
-        table.add_row(str(i), v["title"], link, privacy_display)
+        style = _PRIVACY_STYLES.get(privacy, "dim")
+        table.add_row(str(count), f"[link=https://youtu.be/{vid}]{vid}[/link]", f"[{style}]{privacy}[/]", v["title"])
+        # 1ページ (50件) ごとに出力する
+        if count % 50 == 0:
+            console.print(table)
+            table = None
 
-    console.print(table)
+    if table is not None:
+        console.print(table)
+
+    if ndjson:
+        return
+    if count == 0:
+        if status:
+            console.print(f"[yellow]No videos found with status: {status}[/]")
+        else:
+            console.print("[yellow]No uploaded videos found.[/]")
+        return
+    console.print(f"[bold]{count} videos[/]" + (f" (status: {status})" if status else ""))
 
 def _get_playlist_manager():
     try:
         credentials = get_credentials()
-        return PlaylistManager(credentials)
+        return PlaylistManager(credentials, index=PlaylistIndex())
     except Exception as e:
         console.print(f"[bold red]Auth Error:[/] {e}")
         raise typer.Exit(code=1)
 
+def _print_plan_failures(missing, fetch_errors):
+    for vid in missing:
+        console.print(f"[red]✖ Not found {vid}[/]")
+    for vid in fetch_errors:
+        console.print(f"[red]✖ Fetch error {vid}[/]")
+
+def _fetch_errors_note(fetch_errors) -> str:
+    return f", {len(fetch_errors)} fetch errors" if fetch_errors else ""
+
 @app.command("update-privacy")
 def update_privacy(
     target: str = typer.Argument(..., help="YouTube Video ID or 'all' if using --playlist"),
     status: str = typer.Argument(..., help="Privacy status (private, public, unlisted)"),
     playlist: str = typer.Option(None, "--playlist", help="Target playlist for bulk update"),
+    concurrency: int = typer.Option(
+        None, "--concurrency", "-c", help="Requests in flight at once (default: api.concurrency)"
+    ),
 ):
     """
     Update the privacy status of a video or a playlist.
@@ -97,25 +146,55 @@ def update_privacy(
         
         console.print(f"[bold]Fetching videos from playlist: {playlist}...[/]")
         pl_manager = _get_playlist_manager()
-        video_ids = pl_manager.get_video_ids_from_playlist(playlist)
+        # プレイリストに同じ動画が複数回入っていても更新は1回 (順序は保つ)
+        video_ids = list(dict.fromkeys(pl_manager.get_video_ids_from_playlist(playlist)))
         
         if not video_ids:
             console.print(f"[red]No videos found in playlist {playlist} (or failed to retrieve).[/]")
             raise typer.Exit(code=1)
             
+        if status not in ["public", "private", "unlisted"]:
+            console.print(f"[red]Invalid privacy status: {status}[/]")
+            raise typer.Exit(code=1)
+
+        # 既に目的の状態になっている動画は更新しない (1回50ユニットの節約)
+        with console.status(f"[bold green]Checking current privacy of {len(video_ids)} videos..."):
+            current = manager.get_privacy_statuses(video_ids, concurrency=concurrency)
+        # 取得できなかった動画 (削除済み・他人の非公開動画) は更新しても失敗するだけなので送らない
+        missing = [vid for vid in video_ids if vid not in current]
+        to_update = [vid for vid in video_ids if vid in current and current[vid] != status]
+        skipped = len(video_ids) - len(to_update) - len(missing)
+        for vid in missing:
+            console.print(f"[red]✖ Not found {vid}[/]")
+        if skipped:
+            console.print(f"[dim]Skipping {skipped} videos already {status}.[/]")
+        if not to_update:
+            if missing:
+                console.print(f"[red]{len(missing)} videos not found; nothing to update.[/]")
+                raise typer.Exit(code=1)
+            console.print(f"[green]All {len(video_ids)} videos are already {status}.[/]")
+            return
+
+        require_quota(len(to_update) * COST_VIDEO_UPDATE, f"{len(to_update)} 件の更新")
+
         success_count = 0
-        fail_count = 0
-        
-        with console.status(f"[bold green]Updating privacy to {status} for {len(video_ids)} videos..."):
-            for vid in video_ids:
-                if manager.update_privacy_status(vid, status):
-                    console.print(f"[green]✔ Updated {vid}[/]")
-                    success_count += 1
-                else:
-                    console.print(f"[red]✖ Failed {vid}[/]")
-                    fail_count += 1
+        fail_count = len(missing)
+
+        with console.status(f"[bold green]Updating privacy to {status} for {len(to_update)} videos..."):
+            results = manager.update_privacy_status_bulk(to_update, status, concurrency=concurrency)
+
+        for vid, ok in results.items():
+            if ok:
+                console.print(f"[green]✔ Updated {vid}[/]")
+                success_count += 1
+            else:
+                console.print(f"[red]✖ Failed {vid}[/]")
+                fail_count += 1
         
-        console.print(f"\n[bold]Bulk Update Complete:[/] {success_count} success, {fail_count} failed.")
+        console.print(
+            f"\n[bold]Bulk Update Complete:[/] {success_count} success, "
+            f"{fail_count} failed, {skipped} skipped."
+        )
         if fail_count > 0:
             raise typer.Exit(code=1)
             
@@ -135,12 +214,19 @@ def update_meta(
     tags: str = typer.Option(None, "--tags", help="Comma separated tags"),
     category: str = typer.Option(None, "--category", help="New category ID"),
     playlist: str = typer.Option(None, "--playlist", help="Target playlist for bulk update"),
+    concurrency: int = typer.Option(
+        None, "--concurrency", "-c", help="Requests in flight at once (default: api.concurrency)"
+    ),
+    dry_run: bool = typer.Option(False, "--dry-run", help="Show which videos would change and the quota cost"),
 ):
     """
     Update metadata (title, description, tags, category) for a video or a playlist.
     
     Example:
       yt-up video update-meta <VIDEO_ID> --title "New Title" --tags "tag1,tag2"
+
+    With --playlist, current snippets are fetched 50 at a time and only
+    videos whose metadata actually changes are updated.
     """
     setup_logging(level="INFO")
     manager = _get_manager()
@@ -160,19 +246,52 @@ def update_meta(
             console.print(f"[red]No videos found in playlist {playlist} (or failed to retrieve).[/]")
             raise typer.Exit(code=1)
             
+        fields = manager.metadata_fields(title, description, tag_list, category)
+        if not fields:
+            console.print("[yellow]Nothing to update: specify --title, --desc, --tags or --category.[/]")
+            raise typer.Exit(code=1)
+
+        with console.status(f"[bold green]Fetching current metadata for {len(video_ids)} videos..."):
+            updates, missing, fetch_errors = manager.plan_metadata_updates(
+                {vid: fields for vid in video_ids}, concurrency=concurrency
+            )
+        unchanged = len(video_ids) - len(updates) - len(missing) - len(fetch_errors)
+        _print_plan_failures(missing, fetch_errors)
+
+        console.print(
+            f"[bold]Plan:[/] {len(updates)} to update, {unchanged} unchanged, {len(missing)} not found"
+            f"{_fetch_errors_note(fetch_errors)} "
+            f"(~{len(updates) * COST_VIDEO_UPDATE + list_calls_for(len(video_ids)) * COST_LIST:,} units)"
+        )
+        if dry_run:
+            for vid in updates:
+                console.print(f"[cyan]• Would update {vid}[/]")
+            return
+        if not updates:
+            if missing or fetch_errors:
+                raise typer.Exit(code=1)
+            return
+
+        require_quota(len(updates) * COST_VIDEO_UPDATE, f"{len(updates)} 件の更新")
+
         success_count = 0
-        fail_count = 0
-        
-        with console.status(f"[bold green]Updating metadata for {len(video_ids)} videos..."):
-            for vid in video_ids:
-                if manager.update_metadata(vid, title=title, description=description, tags=tag_list, category_id=category):
-                    console.print(f"[green]✔ Updated {vid}[/]")
-                    success_count += 1
-                else:
-                    console.print(f"[red]✖ Failed {vid}[/]")
-                    fail_count += 1
-        
-        console.print(f"\n[bold]Bulk Update Complete:[/] {success_count} success, {fail_count} failed.")
+        fail_count = len(missing) + len(fetch_errors)
+
+        with console.status(f"[bold green]Updating metadata for {len(updates)} videos..."):
+            results = manager.apply_metadata_updates(updates, concurrency=concurrency)
+
+        for vid, ok in results.items():
+            if ok:
+                console.print(f"[green]✔ Updated {vid}[/]")
+                success_count += 1
+            else:
+                console.print(f"[red]✖ Failed {vid}[/]")
+                fail_count += 1
+
+        console.print(
+            f"\n[bold]Bulk Update Complete:[/] {success_count} success, "
+            f"{fail_count} failed, {unchanged} unchanged."
+        )
         if fail_count > 0:
             raise typer.Exit(code=1)
     
@@ -184,6 +303,76 @@ def update_meta(
              console.print("[red]Failed to update metadata.[/]")
              raise typer.Exit(code=1)
 
+@app.command("reapply-meta")
+def reapply_meta(
+    workers: int = typer.Option(4, "--workers", "-w", help="Files to re-render in parallel"),
+    concurrency: int = typer.Option(
+        None, "--concurrency", "-c", help="Requests in flight at once (default: api.concurrency)"
+    ),
+    dry_run: bool = typer.Option(False, "--dry-run", help="Show which videos would change and the quota cost"),
+):
+    """
+    Re-render title/description/tags from the current templates and apply them to uploaded videos.
+
+    Only fields that differ from the metadata stored in history are sent,
+    and only for videos whose current snippet actually changes.
+    """
+    setup_logging(level="INFO")
+    manager = _get_manager()
+    history = HistoryManager()
+    sync = MetadataSyncManager(manager, history)
+
+    with console.status("[bold green]Re-rendering metadata from templates..."):
+        rendered = sync.render(workers=workers)
+    changes = rendered["changes"]
+
+    if rendered["missing_files"]:
+        console.print(f"[yellow]Skipping {len(rendered['missing_files'])} records whose local file no longer exists.[/]")
+    if not changes:
+        console.print("[green]All uploaded videos already match the current templates.[/]")
+        return
+
+    with console.status(f"[bold green]Fetching current metadata for {len(changes)} videos..."):
+        updates, missing, fetch_errors = manager.plan_metadata_updates(changes, concurrency=concurrency)
+    # テンプレートは変わったが YouTube 側は既に新しい値 (手動で修正済みなど)
+    unresolved = set(missing) | set(fetch_errors)
+    already_applied = [vid for vid in changes if vid not in updates and vid not in unresolved]
+    _print_plan_failures(missing, fetch_errors)
+
+    console.print(
+        f"[bold]Plan:[/] {len(updates)} to update, {len(already_applied)} already applied, "
+        f"{len(missing)} not found{_fetch_errors_note(fetch_errors)} "
+        f"(~{len(updates) * COST_VIDEO_UPDATE + list_calls_for(len(changes)) * COST_LIST:,} units)"
+    )
+    if dry_run:
+        for vid in updates:
+            console.print(f"[cyan]• Would update {vid}: {', '.join(changes[vid])}[/]")
+        return
+
+    results = {}
+    if updates:
+        require_quota(len(updates) * COST_VIDEO_UPDATE, f"{len(updates)} 件の更新")
+        with console.status(f"[bold green]Updating metadata for {len(updates)} videos..."):
+            results = manager.apply_metadata_updates(updates, concurrency=concurrency)
+
+    fail_count = len(missing) + len(fetch_errors)
+    for vid, ok in results.items():
+        if ok:
+            console.print(f"[green]✔ Updated {vid}[/]")
+        else:
+            console.print(f"[red]✖ Failed {vid}[/]")
+            fail_count += 1
+
+    applied = [vid for vid, ok in results.items() if ok] + already_applied
+    sync.persist(rendered["rendered"], applied)
+
+    console.print(
+        f"\n[bold]Reapply Complete:[/] {sum(results.values())} updated, "
+        f"{fail_count} failed, {len(already_applied)} already applied."
+    )
+    if fail_count > 0:
+        raise typer.Exit(code=1)
+
 @app.command("update-thumbnail")
 def update_thumbnail(
     video_id: str = typer.Argument(..., help="YouTube Video ID"),
@@ -206,24 +395,114 @@ def update_thumbnail(
 
 @app.command("delete-video")
 def delete_video(
-    video_id: str = typer.Argument(..., help="YouTube Video ID"),
+    video_ids: List[str] = typer.Argument(..., help="YouTube Video ID(s)"),
     force: bool = typer.Option(False, "--yes", "-y", help="Skip confirmation"),
 ):
     """
-    Delete a video from YouTube.
+    Delete one or more videos from YouTube.
     
     WARNING: This action is irreversible.
     """
     setup_logging(level="INFO")
     manager = _get_manager()
     
+    if len(video_ids) == 1:
+        video_id = video_ids[0]
+        if not force:
+            if not typer.confirm(f"Are you sure you want to delete video {video_id}?"):
+                console.print("[yellow]Aborted.[/]")
+                raise typer.Abort()
+
+        if manager.delete_video(video_id):
+            console.print(f"[green]Successfully deleted video {video_id}[/]")
+        else:
+            console.print("[red]Failed to delete video.[/]")
+            raise typer.Exit(code=1)
+        return
+
+    # Bulk mode
     if not force:
-        if not typer.confirm(f"Are you sure you want to delete video {video_id}?"):
+        if not typer.confirm(f"Are you sure you want to delete {len(video_ids)} videos?"):
             console.print("[yellow]Aborted.[/]")
             raise typer.Abort()
 
-    if manager.delete_video(video_id):
-        console.print(f"[green]Successfully deleted video {video_id}[/]")
-    else:
-        console.print("[red]Failed to delete video.[/]")
+    with console.status(f"[bold red]Deleting {len(video_ids)} videos..."):
+        results = manager.delete_videos(video_ids)
+
+    fail_count = 0
+    for vid, ok in results.items():
+        if ok:
+            console.print(f"[green]✔ Deleted {vid}[/]")
+        else:
+            console.print(f"[red]✖ Failed {vid}[/]")
+            fail_count += 1
+
+    console.print(f"\n[bold]Bulk Delete Complete:[/] {len(results) - fail_count} success, {fail_count} failed.")
+    if fail_count > 0:
+        raise typer.Exit(code=1)
+
+@app.command("processing")
+def processing(
+    since: float = typer.Option(24, "--since", help="Check videos uploaded within this many hours"),
+    wait: bool = typer.Option(False, "--wait", "-w", help="Keep polling until every video is processed"),
+    timeout: int = typer.Option(
+        None, "--timeout", help="Give up waiting after this many seconds (default: settings.yaml)"
+    ),
+):
+    """
+    最近アップロードした動画の YouTube 側の処理状況を確認し、履歴に記録する。
+    """
+    setup_logging(level="INFO")
+    history = HistoryManager()
+    since_ts = time.time() - since * 3600
+
+    video_ids = history.get_unprocessed_video_ids(since=since_ts)
+    if video_ids:
+        console.print(
+            f"[dim]Checking {len(video_ids)} videos "
+            f"(~{list_calls_for(len(video_ids)) * COST_LIST:,} units per check)[/]"
+        )
+        poller = ProcessingPoller(_get_manager(), history)
+        if wait:
+            poller.wait(
+                video_ids,
+                timeout=timeout,
+                on_poll=lambda _, pending: console.print(f"[dim]  {pending} still processing[/]") if pending else None,
+            )
+        else:
+            poller.poll(video_ids)
+
+    rows = history.get_processing_states(since=since_ts)
+    if not rows:
+        console.print("[yellow]No recent uploads found.[/]")
+        return
+
+    table = Table(title=f"Processing Status ({len(rows)} videos)")
+    table.add_column("Video ID", style="cyan")
+    table.add_column("File", style="magenta")
+    table.add_column("Upload", style="dim")
+    table.add_column("Processing")
+    table.add_column("Reason", style="red")
+
+    failed = 0
+    for row in rows:
+        vid = row["video_id"]
+        state = row["processing_status"] or "unknown"
+        if is_failed(row):
+            failed += 1
+            state_display = f"[red]{state}[/]"
+        elif row["done"]:
+            state_display = f"[green]{state}[/]"
+        else:
+            state_display = f"[yellow]{state}[/]"
+        table.add_row(
+            f"[link=https://youtu.be/{vid}]{vid}[/link]",
+            Path(row["file_path"]).name,
+            row["upload_status"] or "-",
+            state_display,
+            row["failure_reason"] or "",
+        )
+    console.print(table)
+
+    if failed:
         raise typer.Exit(code=1)
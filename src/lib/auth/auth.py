@@ -4,7 +4,7 @@ import pickle
 
 from google.auth.transport.requests import Request
 from google_auth_oauthlib.flow import InstalledAppFlow
-from googleapiclient.discovery import Resource, build
+from googleapiclient.discovery import Resource
 
 from ..core.config import config
 from .profiles import (
@@ -15,6 +15,7 @@ from .profiles import (
     migrate_legacy_token,
     set_active_profile,
 )
+from .service import build_service
 
 logger = logging.getLogger("youtube_up")
 
@@ -80,7 +81,7 @@ def get_authenticated_service() -> Resource:
     Handles token storage and refreshing for the active profile.
     """
     creds = get_credentials()
-    return build("youtube", "v3", credentials=creds)
+    return build_service(creds)
 
 
 def authenticate_new_profile(name: str) -> Resource:
@@ -0,0 +1,142 @@
+import logging
+import threading
+from contextlib import contextmanager
+from typing import Dict, Iterator, List, Tuple
+
+from googleapiclient.discovery import Resource, build
+from googleapiclient.http import HttpRequest
+
+from ..data.quota import cost_of
+from ..data.quota_ledger import get_ledger
+
+logger = logging.getLogger("youtube_up")
+
+
+def record_call(request: HttpRequest):
+    """Appends one call of request's API method and its unit cost to the quota ledger."""
+    method_id = getattr(request, "methodId", None)
+    if isinstance(method_id, str):
+        get_ledger().record(method_id, cost_of(method_id))
+
+
+class LedgerHttpRequest(HttpRequest):
+    """
+    HttpRequest that records every API call it sends in the quota ledger.
+
+    execute() records once per call (num_retries の再試行は含めない).
+    A resumable upload is recorded once per request object, on its first
+    next_chunk() — retrying a failed session-initiation POST is not charged again.
+    Requests sent inside a batch never go through here; the batch sender
+    records them with record_call().
+    """
+
+    _recorded = False
+
+    def execute(self, http=None, num_retries=0):
+        if not self.resumable:
+            record_call(self)
+        return super().execute(http=http, num_retries=num_retries)
+
+    def next_chunk(self, http=None, num_retries=0):
+        if not self._recorded:
+            self._recorded = True
+            record_call(self)
+        return super().next_chunk(http=http, num_retries=num_retries)
+
+
+def build_service(credentials) -> Resource:
+    """Builds a YouTube API service whose calls are recorded in the quota ledger."""
+    return build(
+        "youtube", "v3", credentials=credentials,
+        requestBuilder=LedgerHttpRequest, cache_discovery=False,
+    )
+
+
+class ServicePool:
+    """
+    Caches YouTube API service objects so discovery parsing and the
+    authorized HTTP connection are set up once instead of per call.
+
+    httplib2 is not thread-safe, so a service is never shared between
+    threads at the same time:
+    - get() returns a service owned by the calling thread (thread-local).
+    - lease() checks a service out exclusively for work that hops between
+      threads, such as a resumable upload driven through asyncio.to_thread.
+    """
+
+    def __init__(self):
+        self._local = threading.local()
+        self._lock = threading.Lock()
+        # id(credentials) -> idle services available for lease()
+        self._idle: Dict[int, List[Tuple[object, Resource]]] = {}
+        self._builds = 0
+        self._reuses = 0
+
+    def _build(self, credentials) -> Resource:
+        with self._lock:
+            self._builds += 1
+        logger.debug("Building YouTube API service")
+        return build_service(credentials)
+
+    def _count_reuse(self):
+        with self._lock:
+            self._reuses += 1
+
+    def get(self, credentials) -> Resource:
+        """Returns the calling thread's service for these credentials, building it once."""
+        services = getattr(self._local, "services", None)
+        if services is None:
+            services = self._local.services = {}
+        cached = services.get(id(credentials))
+        # Keep the credentials alongside so a recycled id() never matches
+        if cached and cached[0] is credentials:
+            self._count_reuse()
+            return cached[1]
+        service = self._build(credentials)
+        services[id(credentials)] = (credentials, service)
+        return service
+
+    @contextmanager
+    def lease(self, credentials) -> Iterator[Resource]:
+        """
+        Checks out a service exclusively for the duration of the block.
+        If the block raises, the service is discarded instead of returned.
+        """
+        service = None
+        with self._lock:
+            idle = self._idle.get(id(credentials), [])
+            while idle:
+                creds, candidate = idle.pop()
+                if creds is credentials:
+                    service = candidate
+                    self._reuses += 1
+                    break
+        if service is None:
+            service = self._build(credentials)
+        # Only return the service to the pool on success: after an error its
+        # connection may be broken or still held by an abandoned thread.
+        yield service
+        with self._lock:
+            self._idle.setdefault(id(credentials), []).append((credentials, service))
+
+    def stats(self) -> Dict[str, int]:
+        """Returns how many services were built and how many calls reused one."""
+        with self._lock:
+            return {"builds": self._builds, "reuses": self._reuses}
+
+    def clear(self):
+        """Drops every cached service (e.g. after switching profiles)."""
+        with self._lock:
+            self._idle.clear()
+            self._builds = 0
+            self._reuses = 0
+        self._local = threading.local()
+
+
+# Process-wide pool
+service_pool = ServicePool()
+
+
+def get_service(credentials) -> Resource:
+    """Shortcut for service_pool.get()."""
+    return service_pool.get(credentials)
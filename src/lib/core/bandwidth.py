@@ -0,0 +1,84 @@
+import asyncio
+import logging
+import time
+from datetime import datetime
+from datetime import time as dtime
+from typing import Callable, List, Optional, Tuple
+
+from .config import BandwidthConfig
+
+logger = logging.getLogger("youtube_up")
+
+# Longest single sleep, so schedule changes take effect promptly
+_MAX_WAIT = 1.0
+
+
+def _parse_hhmm(value: str) -> dtime:
+    return datetime.strptime(value, "%H:%M").time()
+
+
+class BandwidthLimiter:
+    """
+    Token-bucket bandwidth governor shared by all concurrent uploads.
+
+    The rate follows the time-of-day schedule in settings.yaml and is
+    re-evaluated on every acquire, so crossing a schedule boundary changes
+    the limit during a long run. Waiters are served in FIFO order one chunk
+    at a time, so a large file cannot starve the others.
+    """
+
+    def __init__(
+        self,
+        bandwidth_config: BandwidthConfig,
+        clock: Callable[[], datetime] = datetime.now,
+    ):
+        self.default_mbps = bandwidth_config.default_mbps
+        self.rules: List[Tuple[dtime, dtime, float]] = [
+            (_parse_hhmm(r.start), _parse_hhmm(r.end), r.mbps)
+            for r in bandwidth_config.schedule
+        ]
+        self._clock = clock
+        self._lock = asyncio.Lock()
+        self._tokens = 0.0
+        self._last_refill = time.monotonic()
+        self._current_mbps: Optional[float] = None
+
+    def current_mbps(self) -> float:
+        """Returns the limit in Mbps for the current time of day (0 = unlimited)."""
+        now = self._clock().time()
+        for start, end, mbps in self.rules:
+            if start <= end:
+                if start <= now < end:
+                    return mbps
+            elif now >= start or now < end:
+                # Overnight range such as 22:00-06:00
+                return mbps
+        return self.default_mbps
+
+    def _current_rate(self) -> float:
+        mbps = self.current_mbps()
+        if mbps != self._current_mbps:
+            if self._current_mbps is not None:
+                label = f"{mbps:g} Mbps" if mbps > 0 else "unlimited"
+                logger.info(f"Bandwidth limit changed: {label}")
+            self._current_mbps = mbps
+        return mbps * 1_000_000 / 8  # bytes per second
+
+    async def acquire(self, nbytes: int):
+        """Waits until `nbytes` may be sent under the current limit."""
+        async with self._lock:
+            while True:
+                rate = self._current_rate()
+                now = time.monotonic()
+                if rate <= 0:
+                    self._tokens = 0.0
+                    self._last_refill = now
+                    return
+                # Allow at most one second of burst
+                self._tokens = min(rate, self._tokens + (now - self._last_refill) * rate)
+                self._last_refill = now
+                if self._tokens >= 0:
+                    # Chunks may exceed the bucket; the debt is paid by the next caller.
+                    self._tokens -= nbytes
+                    return
+                await asyncio.sleep(min(-self._tokens / rate, _MAX_WAIT))
@@ -0,0 +1,160 @@
+import asyncio
+import logging
+import statistics
+import time
+from typing import List, Optional
+
+logger = logging.getLogger("youtube_up")
+
+# 基準レイテンシを毎ウィンドウこの割合だけ緩める (回線が恒常的に遅くなった場合に学び直すため)
+BASELINE_DRIFT = 0.1
+
+
+class AdaptiveConcurrencyController:
+    """
+    AIMD (additive-increase / multiplicative-decrease) limiter for concurrent uploads.
+
+    Drop-in replacement for asyncio.Semaphore (`async with controller:`).
+    The limit grows by one slot per evaluation window while aggregate
+    throughput keeps improving, backs off by one when an extra slot brought
+    no gain or when chunk latency rises above its baseline (queues building
+    up before errors appear), and is cut multiplicatively on retryable errors
+    (429/5xx/timeouts).
+    """
+
+    def __init__(
+        self,
+        initial: int,
+        min_limit: int = 1,
+        max_limit: Optional[int] = None,
+        decrease_factor: float = 0.5,
+        min_gain: float = 0.05,
+        latency_factor: float = 2.0,
+    ):
+        self.min_limit = max(1, min_limit)
+        self.max_limit = max(self.min_limit, max_limit or initial)
+        self.limit = min(max(initial, self.min_limit), self.max_limit)
+        self.decrease_factor = decrease_factor
+        self.min_gain = min_gain
+        self.latency_factor = latency_factor
+        self.active = 0
+        self._cond = asyncio.Condition()
+        self._last_throughput: Optional[float] = None
+        self._last_action: Optional[str] = None
+        self._base_latency: Optional[float] = None  # 秒/バイト
+        self._reset_window()
+
+    @property
+    def adaptive(self) -> bool:
+        return self.min_limit < self.max_limit
+
+    def _reset_window(self):
+        self._window_start = time.monotonic()
+        self._window_bytes = 0
+        self._window_completed = 0
+        self._window_errors = 0
+        self._window_latencies: List[float] = []
+
+    async def acquire(self):
+        async with self._cond:
+            await self._cond.wait_for(lambda: self.active < self.limit)
+            self.active += 1
+
+    async def release(self):
+        async with self._cond:
+            self.active -= 1
+            self._cond.notify_all()
+
+    async def __aenter__(self):
+        await self.acquire()
+        return self
+
+    async def __aexit__(self, exc_type, exc, tb):
+        await self.release()
+
+    def _set_limit(self, new_limit: int, reason: str):
+        new_limit = min(max(new_limit, self.min_limit), self.max_limit)
+        if new_limit == self.limit:
+            return
+        logger.info(
+            f"Concurrency {self.limit} -> {new_limit}: {reason} "
+            f"(active={self.active}, bounds={self.min_limit}-{self.max_limit})"
+        )
+        self.limit = new_limit
+
+    def record_success(self, nbytes: int):
+        """
+        Records a completed upload and re-evaluates the limit once per window.
+        Whole-upload duration scales with file size, so latency is taken per
+        chunk through record_latency() instead.
+        """
+        self._window_bytes += nbytes
+        self._window_completed += 1
+        # One window = as many completions as there are slots
+        if self.adaptive and self._window_completed >= self.limit:
+            self._adjust()
+
+    def record_latency(self, seconds: float, nbytes: int):
+        """
+        Records how long one chunk took to be acknowledged.
+        Stored as seconds per byte so chunks of different sizes (the last one)
+        compare fairly; the window median is checked against the baseline in _adjust().
+        """
+        if nbytes > 0 and seconds >= 0:
+            self._window_latencies.append(seconds / nbytes)
+
+    def record_error(self, exception: Optional[BaseException] = None):
+        """
+        Records a retryable error (congestion signal).
+        Cuts the limit at most once per window so a burst of errors from the
+        same overload does not collapse concurrency to the minimum.
+        """
+        self._window_errors += 1
+        if not self.adaptive or (self._last_action == "decrease" and self._window_completed == 0):
+            return
+        self._set_limit(
+            int(self.limit * self.decrease_factor),
+            f"retryable error ({exception})",
+        )
+        self._last_action = "decrease"
+        self._last_throughput = None
+        self._reset_window()
+
+    def _adjust(self):
+        elapsed = max(time.monotonic() - self._window_start, 1e-6)
+        throughput = self._window_bytes / elapsed
+        stats = (
+            f"throughput={throughput / 1024 / 1024:.2f}MB/s, "
+            f"completed={self._window_completed}, errors={self._window_errors}"
+        )
+
+        latency = statistics.median(self._window_latencies) if self._window_latencies else None
+        if latency is not None and self._base_latency:
+            stats += f", latency={latency / self._base_latency:.1f}x baseline"
+
+        if latency is not None and self._base_latency and latency > self._base_latency * self.latency_factor:
+            # Chunks queue up (bufferbloat / server-side throttling) before errors show up
+            self._set_limit(self.limit - 1, f"latency rising, {stats}")
+            self._last_action = "hold"
+        elif (
+            self._last_action == "increase"
+            and self._last_throughput
+            and throughput < self._last_throughput * (1 + self.min_gain)
+        ):
+            # The extra slot did not buy more bandwidth: the link is saturated
+            self._set_limit(self.limit - 1, f"no throughput gain, {stats}")
+            self._last_action = "hold"
+        elif self.limit < self.max_limit:
+            self._set_limit(self.limit + 1, f"probing, {stats}")
+            self._last_action = "increase"
+        else:
+            logger.debug(f"Concurrency held at {self.limit}: {stats}")
+            self._last_action = "hold"
+
+        if latency is not None:
+            if self._base_latency is None:
+                self._base_latency = latency
+            else:
+                self._base_latency = min(latency, self._base_latency * (1 + BASELINE_DRIFT))
+        self._last_throughput = throughput
+        self._reset_window()
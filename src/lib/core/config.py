@@ -22,6 +22,43 @@ class UploadConfig(BaseModel):
     retry_count: int = 5
     privacy_status: str = "private"
     daily_quota_limit: int = 10000  # YouTube API の1日あたりのクォータ上限
+    read_ahead_chunks: int = 2  # 送信中に先読みするチャンク数 (0 で無効)
+    min_workers: int = 1  # 適応的並列数の下限 (上限は --workers / --max-workers)
+    stall_timeout: int = 300  # 進捗が無い状態がこの秒数続いたら接続をリセット (0 で無効)
+    processing_poll_interval: int = 30  # 処理状況ポーリングの初回間隔 (秒、以降は倍々に延ばす)
+    processing_poll_max_interval: int = 300  # ポーリング間隔の上限 (秒)
+    processing_poll_timeout: int = 1800  # 処理完了を待つ最大時間 (秒)
+
+
+class ApiConfig(BaseModel):
+    # 一括操作 (プライバシー変更・削除・プレイリスト追加など) の実行方式
+    batch_mode: str = "batch"  # batch: BatchHttpRequest, concurrent: スレッドプール
+    batch_size: int = 50  # 1 バッチあたりの最大リクエスト数 (上限 50)
+    concurrency: int = 8  # 同時に送信するリクエスト (バッチ) 数
+    retry_count: int = 3  # 429/5xx などのリトライ回数
+    playlist_cache_ttl: int = 3600  # 永続プレイリストインデックスの有効期間 (秒, 0 で毎回再取得)
+    remote_catalog_ttl: int = 300  # アップロード済み動画ミラーを差分更新せずに使う期間 (秒, 0 で毎回差分更新)
+    remote_catalog_full_refresh: int = 86400  # ミラーを全件取り直す間隔 (秒)
+
+
+class BandwidthRule(BaseModel):
+    start: str  # "HH:MM"
+    end: str  # "HH:MM" (start > end は日付をまたぐ範囲)
+    mbps: float  # 0 で無制限
+
+
+class BandwidthConfig(BaseModel):
+    default_mbps: float = 0  # スケジュール外の上限 (0 で無制限)
+    schedule: List[BandwidthRule] = []
+
+
+class GovernorConfig(BaseModel):
+    # 同一ホスト上の複数 yt-up プロセス間で並列数と帯域を共有する
+    enabled: bool = False
+    db_path: str = "~/.youtube-bulkup/governor.db"
+    max_uploads: int = 4  # ホスト全体の同時アップロード数
+    total_mbps: float = 0  # ホスト全体の帯域上限 (0 で無制限)
+    lease_seconds: int = 120  # ハートビートが途絶えたスロットを回収するまでの秒数
 
 
 class MetadataConfig(BaseModel):
@@ -39,7 +76,10 @@ class MetadataConfig(BaseModel):
 class AppConfig(BaseModel):
     auth: AuthConfig = Field(default_factory=AuthConfig)
     upload: UploadConfig = Field(default_factory=UploadConfig)
+    api: ApiConfig = Field(default_factory=ApiConfig)
     metadata: MetadataConfig = Field(default_factory=MetadataConfig)
+    bandwidth: BandwidthConfig = Field(default_factory=BandwidthConfig)
+    governor: GovernorConfig = Field(default_factory=GovernorConfig)
     history_db: str = "upload_history.db"
 
     @classmethod
@@ -0,0 +1,190 @@
+import asyncio
+import logging
+import os
+import sqlite3
+import time
+import uuid
+from contextlib import asynccontextmanager
+from pathlib import Path
+
+from .config import GovernorConfig
+
+logger = logging.getLogger("youtube_up")
+
+_CREATE_TABLES_SQL = [
+    """
+    CREATE TABLE IF NOT EXISTS upload_slots (
+        token TEXT PRIMARY KEY,
+        pid INTEGER NOT NULL,
+        heartbeat REAL NOT NULL
+    );
+    """,
+    """
+    CREATE TABLE IF NOT EXISTS bandwidth_bucket (
+        id INTEGER PRIMARY KEY CHECK (id = 1),
+        tokens REAL NOT NULL,
+        updated REAL NOT NULL
+    );
+    """,
+]
+
+# Longest single sleep while waiting for a slot or tokens
+_POLL_INTERVAL = 1.0
+
+
+def _pid_alive(pid: int) -> bool:
+    if os.name != "posix":
+        # os.kill(pid, 0) terminates the process on Windows; rely on heartbeats.
+        return True
+    try:
+        os.kill(pid, 0)
+    except ProcessLookupError:
+        return False
+    except PermissionError:
+        return True
+    return True
+
+
+class HostGovernor:
+    """
+    Host-wide limit on concurrent uploads and total bandwidth, shared by
+    every yt-up process on the machine through a small SQLite file.
+
+    Slots are rows in upload_slots, refreshed by a heartbeat and reclaimed
+    when the owning process dies or the lease expires. Bandwidth is a single
+    token-bucket row updated inside BEGIN IMMEDIATE transactions.
+    """
+
+    def __init__(self, governor_config: GovernorConfig):
+        self.db_path = str(Path(governor_config.db_path).expanduser())
+        self.max_uploads = governor_config.max_uploads
+        self.total_mbps = governor_config.total_mbps
+        self.lease_seconds = governor_config.lease_seconds
+        Path(self.db_path).parent.mkdir(parents=True, exist_ok=True)
+        conn = self._connect()
+        try:
+            for sql in _CREATE_TABLES_SQL:
+                conn.execute(sql)
+        finally:
+            conn.close()
+
+    def _connect(self) -> sqlite3.Connection:
+        # Autocommit mode: transactions are opened explicitly with BEGIN IMMEDIATE
+        conn = sqlite3.connect(self.db_path, timeout=30, isolation_level=None)
+        conn.execute("PRAGMA journal_mode=WAL;")
+        return conn
+
+    # --- Upload slots ---
+
+    def _try_acquire_slot(self, token: str) -> int:
+        """Claims a slot if one is free. Returns 0 on success, else slots in use."""
+        now = time.time()
+        conn = self._connect()
+        try:
+            conn.execute("BEGIN IMMEDIATE")
+            rows = conn.execute("SELECT token, pid, heartbeat FROM upload_slots").fetchall()
+            stale = [
+                t for t, pid, hb in rows
+                if hb < now - self.lease_seconds or not _pid_alive(pid)
+            ]
+            for t in stale:
+                conn.execute("DELETE FROM upload_slots WHERE token = ?", (t,))
+            in_use = len(rows) - len(stale)
+            if in_use >= self.max_uploads:
+                conn.execute("COMMIT")
+                return in_use
+            conn.execute(
+                "INSERT INTO upload_slots (token, pid, heartbeat) VALUES (?, ?, ?)",
+                (token, os.getpid(), now),
+            )
+            conn.execute("COMMIT")
+            return 0
+        except Exception:
+            conn.execute("ROLLBACK")
+            raise
+        finally:
+            conn.close()
+
+    def _refresh_slot(self, token: str):
+        conn = self._connect()
+        try:
+            conn.execute(
+                "UPDATE upload_slots SET heartbeat = ? WHERE token = ?", (time.time(), token)
+            )
+        finally:
+            conn.close()
+
+    def _release_slot(self, token: str):
+        conn = self._connect()
+        try:
+            conn.execute("DELETE FROM upload_slots WHERE token = ?", (token,))
+        finally:
+            conn.close()
+
+    async def _heartbeat(self, token: str):
+        while True:
+            await asyncio.sleep(self.lease_seconds / 3)
+            await asyncio.to_thread(self._refresh_slot, token)
+
+    @asynccontextmanager
+    async def slot(self):
+        """Holds one host-wide upload slot for the duration of the block."""
+        token = uuid.uuid4().hex
+        waiting_logged = False
+        while True:
+            in_use = await asyncio.to_thread(self._try_acquire_slot, token)
+            if in_use == 0:
+                break
+            if not waiting_logged:
+                logger.info(
+                    f"Waiting for a host-wide upload slot ({in_use}/{self.max_uploads} in use)..."
+                )
+                waiting_logged = True
+            await asyncio.sleep(_POLL_INTERVAL)
+
+        heartbeat = asyncio.create_task(self._heartbeat(token))
+        try:
+            yield
+        finally:
+            heartbeat.cancel()
+            await asyncio.to_thread(self._release_slot, token)
+
+    # --- Bandwidth ---
+
+    def _try_take_tokens(self, nbytes: int, rate: float) -> float:
+        """Takes tokens if the shared bucket is not in debt. Returns seconds to wait."""
+        now = time.time()
+        conn = self._connect()
+        try:
+            conn.execute("BEGIN IMMEDIATE")
+            row = conn.execute("SELECT tokens, updated FROM bandwidth_bucket WHERE id = 1").fetchone()
+            tokens, updated = row if row else (0.0, now)
+            # Allow at most one second of burst
+            tokens = min(rate, tokens + max(0.0, now - updated) * rate)
+            wait = 0.0
+            if tokens >= 0:
+                tokens -= nbytes
+            else:
+                wait = min(-tokens / rate, _POLL_INTERVAL)
+            conn.execute(
+                "INSERT OR REPLACE INTO bandwidth_bucket (id, tokens, updated) VALUES (1, ?, ?)",
+                (tokens, now),
+            )
+            conn.execute("COMMIT")
+            return wait
+        except Exception:
+            conn.execute("ROLLBACK")
+            raise
+        finally:
+            conn.close()
+
+    async def acquire_bandwidth(self, nbytes: int):
+        """Waits until `nbytes` fit in the host-wide bandwidth budget."""
+        if self.total_mbps <= 0:
+            return
+        rate = self.total_mbps * 1_000_000 / 8
+        while True:
+            wait = await asyncio.to_thread(self._try_take_tokens, nbytes, rate)
+            if wait <= 0:
+                return
+            await asyncio.sleep(wait)
@@ -5,7 +5,7 @@ import logging
 import sqlite3
 import time
 from pathlib import Path
-from typing import Any, Dict, Optional
+from typing import Any, Dict, Iterator, List, Optional, Set, Tuple
 
 from ..core.config import config
 
@@ -23,7 +23,8 @@ CREATE TABLE IF NOT EXISTS uploads (
     status TEXT DEFAULT 'success',
     error TEXT,
     playlist_name TEXT,
-    file_size INTEGER DEFAULT 0
+    file_size INTEGER DEFAULT 0,
+    reconciled INTEGER NOT NULL DEFAULT 0
 );
 """
 
@@ -34,8 +35,22 @@ _CREATE_INDEX_SQL = [
     "CREATE INDEX IF NOT EXISTS idx_video_id ON uploads (video_id);",
     "CREATE INDEX IF NOT EXISTS idx_status ON uploads (status);",
     "CREATE INDEX IF NOT EXISTS idx_timestamp ON uploads (timestamp);",
+    # sync 比較用のカバリングインデックス (テーブル本体を読まずに済む)
+    "CREATE INDEX IF NOT EXISTS idx_success_video_path ON uploads (status, video_id, file_path);",
 ]
 
+# アップロード後の YouTube 側の処理状況 (ProcessingPoller が書き込む)
+_CREATE_PROCESSING_TABLE_SQL = """
+CREATE TABLE IF NOT EXISTS processing_status (
+    video_id TEXT PRIMARY KEY,
+    upload_status TEXT,
+    processing_status TEXT,
+    failure_reason TEXT,
+    done INTEGER NOT NULL DEFAULT 0,
+    checked_at REAL NOT NULL
+);
+"""
+
 
 class HistoryManager:
     def __init__(self, db_path: Optional[str] = None):
@@ -50,6 +65,11 @@ class HistoryManager:
     def _init_schema(self):
         """テーブルとインデックスを作成する。"""
         self.conn.execute(_CREATE_TABLE_SQL)
+        # reconciled 列が無い古い DB に追加する
+        columns = {row[1] for row in self.conn.execute("PRAGMA table_info(uploads)")}
+        if "reconciled" not in columns:
+            self.conn.execute("ALTER TABLE uploads ADD COLUMN reconciled INTEGER NOT NULL DEFAULT 0")
+        self.conn.execute(_CREATE_PROCESSING_TABLE_SQL)
         for idx_sql in _CREATE_INDEX_SQL:
             self.conn.execute(idx_sql)
         self.conn.commit()
@@ -176,8 +196,13 @@ class HistoryManager:
         metadata: Dict[str, Any],
         playlist_name: Optional[str] = None,
         file_size: int = 0,
+        reconciled: bool = False,
     ):
-        """Record a successful upload. file_hash が既存なら上書き (upsert)。"""
+        """
+        Record a successful upload. file_hash が既存なら上書き (upsert)。
+        reconciled=True は sync --reconcile で既存の YouTube 動画と突き合わせた記録で、
+        その日のアップロード件数や処理状況の確認対象には含めない。
+        """
         metadata_json = json.dumps(metadata, ensure_ascii=False)
         now = time.time()
 
@@ -190,16 +215,19 @@ class HistoryManager:
             self.conn.execute(
                 """UPDATE uploads SET
                    file_path=?, video_id=?, metadata=?, timestamp=?,
-                   status='success', error=NULL, playlist_name=?, file_size=?
+                   status='success', error=NULL, playlist_name=?, file_size=?, reconciled=?
                    WHERE file_hash=?""",
-                (str(file_path), video_id, metadata_json, now, playlist_name, file_size, file_hash),
+                (str(file_path), video_id, metadata_json, now, playlist_name, file_size,
+                 int(reconciled), file_hash),
             )
         else:
             self.conn.execute(
                 """INSERT INTO uploads
-                   (file_path, file_hash, video_id, metadata, timestamp, status, error, playlist_name, file_size)
-                   VALUES (?, ?, ?, ?, ?, 'success', NULL, ?, ?)""",
-                (str(file_path), file_hash, video_id, metadata_json, now, playlist_name, file_size),
+                   (file_path, file_hash, video_id, metadata, timestamp, status, error, playlist_name,
+                    file_size, reconciled)
+                   VALUES (?, ?, ?, ?, ?, 'success', NULL, ?, ?, ?)""",
+                (str(file_path), file_hash, video_id, metadata_json, now, playlist_name, file_size,
+                 int(reconciled)),
             )
         self.conn.commit()
         logger.info(f"Recorded upload history for {file_path}")
@@ -265,6 +293,40 @@ class HistoryManager:
             return True
         return False
 
+    def delete_records_by_video_ids(self, video_ids: list) -> Set[str]:
+        """
+        複数の video ID のレコードを1トランザクションで削除する。
+        1つの video ID に複数のレコードがあり得るので、削除件数ではなく
+        レコードが見つかって削除された video ID の集合を返す。
+        """
+        deleted_ids: Set[str] = set()
+        deleted = 0
+        for i in range(0, len(video_ids), 500):
+            batch = video_ids[i:i + 500]
+            placeholders = ",".join("?" * len(batch))
+            deleted_ids.update(
+                row[0] for row in self.conn.execute(
+                    f"SELECT DISTINCT video_id FROM uploads WHERE video_id IN ({placeholders})", batch
+                )
+            )
+            cursor = self.conn.execute(
+                f"DELETE FROM uploads WHERE video_id IN ({placeholders})", batch
+            )
+            deleted += cursor.rowcount
+        self.conn.commit()
+        logger.info(f"Deleted upload history for {deleted} records ({len(deleted_ids)} videos)")
+        return deleted_ids
+
+    def update_metadata_bulk(self, metadata_by_hash: Dict[str, Dict[str, Any]]) -> int:
+        """file_hash ごとの metadata を1トランザクションで書き換える。更新件数を返す。"""
+        rows = [
+            (json.dumps(metadata, ensure_ascii=False), file_hash)
+            for file_hash, metadata in metadata_by_hash.items()
+        ]
+        cursor = self.conn.executemany("UPDATE uploads SET metadata = ? WHERE file_hash = ?", rows)
+        self.conn.commit()
+        return cursor.rowcount
+
     def get_record(self, file_hash: str) -> Optional[Dict[str, Any]]:
         """Get an upload record by file hash."""
         cursor = self.conn.execute(
@@ -285,6 +347,18 @@ class HistoryManager:
         cursor = self.conn.execute("SELECT COUNT(*) FROM uploads")
         return cursor.fetchone()[0]
 
+    def get_upload_stats(self, since: float = 0) -> Tuple[int, int]:
+        """
+        since 以降に成功したアップロードの (件数, 合計サイズ) を SQL で集計する。
+        sync --reconcile で記録しただけの動画は数えない。
+        """
+        row = self.conn.execute(
+            "SELECT COUNT(*), COALESCE(SUM(file_size), 0) FROM uploads "
+            "WHERE timestamp >= ? AND status = 'success' AND reconciled = 0",
+            (since,),
+        ).fetchone()
+        return row[0], row[1]
+
     def get_all_records(self, limit: Optional[int] = None) -> list:
         """Get all upload records, sorted by timestamp descending."""
         if limit and limit > 0:
@@ -295,6 +369,84 @@ class HistoryManager:
             cursor = self.conn.execute("SELECT * FROM uploads ORDER BY timestamp DESC")
         return [self._row_to_dict(row) for row in cursor.fetchall()]
 
+    def get_success_records(self) -> list:
+        """Get successful upload records that have a video ID."""
+        cursor = self.conn.execute(
+            "SELECT * FROM uploads WHERE status = 'success' AND video_id IS NOT NULL "
+            "ORDER BY timestamp DESC"
+        )
+        return [self._row_to_dict(row) for row in cursor.fetchall()]
+
+    def iter_success_video_paths(self, batch_size: int = 1000) -> Iterator[Tuple[str, str]]:
+        """
+        success かつ video_id のあるレコードの (video_id, file_path) を順に返す。
+        必要な2列だけを選択し、metadata の JSON デコードもせず、
+        batch_size 行ずつ読み出すので全件をメモリに載せない。
+        """
+        cursor = self.conn.execute(
+            "SELECT video_id, file_path FROM uploads WHERE status = 'success' AND video_id IS NOT NULL"
+        )
+        while rows := cursor.fetchmany(batch_size):
+            for row in rows:
+                yield row[0], row[1]
+
+    # --- Processing status ---
+
+    def get_unprocessed_video_ids(self, since: float = 0) -> List[str]:
+        """
+        since 以降に成功したアップロードのうち、YouTube 側の処理結果が
+        まだ確定していない (未確認または処理中の) 動画の video_id を古い順に返す。
+        """
+        cursor = self.conn.execute(
+            """SELECT u.video_id FROM uploads u
+               LEFT JOIN processing_status p ON p.video_id = u.video_id
+               WHERE u.status = 'success' AND u.video_id IS NOT NULL
+                 AND u.reconciled = 0 AND u.timestamp >= ? AND COALESCE(p.done, 0) = 0
+               ORDER BY u.timestamp""",
+            (since,),
+        )
+        return [row[0] for row in cursor.fetchall()]
+
+    def update_processing_states(self, states: Dict[str, Dict[str, Any]]) -> int:
+        """
+        {video_id: {"upload_status", "processing_status", "failure_reason", "done"}} を
+        1トランザクションで書き込む。書き込んだ件数を返す。
+        """
+        now = time.time()
+        rows = [
+            (
+                vid, s.get("upload_status"), s.get("processing_status"),
+                s.get("failure_reason"), int(bool(s.get("done"))), now,
+            )
+            for vid, s in states.items()
+        ]
+        self.conn.executemany(
+            """INSERT OR REPLACE INTO processing_status
+               (video_id, upload_status, processing_status, failure_reason, done, checked_at)
+               VALUES (?, ?, ?, ?, ?, ?)""",
+            rows,
+        )
+        self.conn.commit()
+        return len(rows)
+
+    def get_processing_states(self, since: float = 0) -> list:
+        """
+        since 以降に成功したアップロードと、その処理状況を新しい順に返す。
+        未確認の動画は upload_status などが None になる。
+        """
+        cursor = self.conn.execute(
+            """SELECT u.video_id, u.file_path, u.timestamp,
+                      p.upload_status, p.processing_status, p.failure_reason,
+                      COALESCE(p.done, 0) AS done, p.checked_at
+               FROM uploads u
+               LEFT JOIN processing_status p ON p.video_id = u.video_id
+               WHERE u.status = 'success' AND u.video_id IS NOT NULL
+                 AND u.reconciled = 0 AND u.timestamp >= ?
+               ORDER BY u.timestamp DESC""",
+            (since,),
+        )
+        return [dict(row) for row in cursor.fetchall()]
+
     def get_failed_records(self) -> list:
         """Get all failed upload records."""
         cursor = self.conn.execute(
@@ -0,0 +1,272 @@
+import json
+import logging
+import sqlite3
+import threading
+import time
+from typing import Any, Dict, List, Optional
+
+from ..auth.profiles import get_active_profile
+from ..core.config import config
+
+logger = logging.getLogger("youtube_up")
+
+_CREATE_TABLES_SQL = [
+    """
+    CREATE TABLE IF NOT EXISTS playlist_index (
+        channel TEXT NOT NULL,
+        playlist_id TEXT NOT NULL,
+        title TEXT NOT NULL,
+        PRIMARY KEY (channel, playlist_id)
+    );
+    """,
+    "CREATE INDEX IF NOT EXISTS idx_playlist_index_title ON playlist_index (channel, title);",
+    """
+    CREATE TABLE IF NOT EXISTS playlist_index_pages (
+        channel TEXT NOT NULL,
+        page INTEGER NOT NULL,
+        page_token TEXT,
+        next_page_token TEXT,
+        etag TEXT,
+        playlist_ids TEXT NOT NULL DEFAULT '[]',
+        PRIMARY KEY (channel, page)
+    );
+    """,
+    """
+    CREATE TABLE IF NOT EXISTS playlist_index_state (
+        channel TEXT PRIMARY KEY,
+        refreshed_at REAL NOT NULL
+    );
+    """,
+    # プレイリストの中身 (playlistItems) のローカルコピー
+    """
+    CREATE TABLE IF NOT EXISTS playlist_items (
+        channel TEXT NOT NULL,
+        playlist_id TEXT NOT NULL,
+        video_id TEXT NOT NULL,
+        item_id TEXT NOT NULL,
+        position INTEGER,
+        PRIMARY KEY (channel, item_id)
+    );
+    """,
+    "CREATE INDEX IF NOT EXISTS idx_playlist_items_video ON playlist_items (channel, playlist_id, video_id);",
+    """
+    CREATE TABLE IF NOT EXISTS playlist_items_state (
+        channel TEXT NOT NULL,
+        playlist_id TEXT NOT NULL,
+        loaded_at REAL NOT NULL,
+        PRIMARY KEY (channel, playlist_id)
+    );
+    """,
+]
+
+
+class PlaylistIndex:
+    """
+    プレイリスト一覧 (タイトル → ID) を履歴 DB に永続化するインデックス。
+
+    プロファイル (チャンネル) ごとに保持し、TTL 内であれば API を呼ばずに
+    タイトルを解決する。playlists.list の各ページの etag も保存しておき、
+    再取得時は If-None-Match で変更の無いページの転送を省く。
+
+    プレイリストの中身 (playlist_id, video_id, playlistItem ID, position) も
+    一覧取得時に保存し、追加・削除のたびに更新する。中身を丸ごと取得してから
+    TTL 内のプレイリストだけ、追加済みかどうかをローカルで判定できる。
+    複数スレッドから使われるため接続は1本をロックで共有する。
+    """
+
+    def __init__(self, db_path: Optional[str] = None, channel: Optional[str] = None):
+        self.db_path = db_path or config.history_db
+        self._channel = channel
+        self._conn: Optional[sqlite3.Connection] = None
+        self._lock = threading.Lock()
+
+    @property
+    def channel(self) -> str:
+        if self._channel is None:
+            self._channel = get_active_profile()
+        return self._channel
+
+    def _connection(self) -> sqlite3.Connection:
+        # 実際に使われるまで DB を開かない
+        if self._conn is None:
+            conn = sqlite3.connect(self.db_path, check_same_thread=False)
+            conn.execute("PRAGMA journal_mode=WAL;")
+            for sql in _CREATE_TABLES_SQL:
+                conn.execute(sql)
+            conn.commit()
+            self._conn = conn
+        return self._conn
+
+    def is_fresh(self, ttl: float) -> bool:
+        """最後の全件更新から ttl 秒以内なら True。"""
+        if ttl <= 0:
+            return False
+        with self._lock:
+            row = self._connection().execute(
+                "SELECT refreshed_at FROM playlist_index_state WHERE channel = ?", (self.channel,)
+            ).fetchone()
+        return row is not None and time.time() - row[0] < ttl
+
+    def playlists(self) -> Dict[str, str]:
+        """{playlist_id: title} を返す (同名のプレイリストもそれぞれ含む)。"""
+        with self._lock:
+            rows = self._connection().execute(
+                "SELECT playlist_id, title FROM playlist_index WHERE channel = ? ORDER BY rowid",
+                (self.channel,),
+            ).fetchall()
+        return {playlist_id: title for playlist_id, title in rows}
+
+    def pages(self) -> List[Dict[str, Any]]:
+        """前回取得したページ情報 (page_token, next_page_token, etag, playlist_ids) を返す。"""
+        with self._lock:
+            rows = self._connection().execute(
+                "SELECT page_token, next_page_token, etag, playlist_ids FROM playlist_index_pages "
+                "WHERE channel = ? ORDER BY page",
+                (self.channel,),
+            ).fetchall()
+        return [
+            {
+                "page_token": page_token,
+                "next_page_token": next_page_token,
+                "etag": etag,
+                "playlist_ids": json.loads(playlist_ids),
+            }
+            for page_token, next_page_token, etag, playlist_ids in rows
+        ]
+
+    def replace(self, pages: List[Dict[str, Any]], playlists: Dict[str, str]):
+        """
+        全件更新の結果で置き換える (1トランザクション)。
+        playlists は {playlist_id: title}。
+        """
+        with self._lock:
+            conn = self._connection()
+            with conn:
+                conn.execute("DELETE FROM playlist_index WHERE channel = ?", (self.channel,))
+                conn.execute("DELETE FROM playlist_index_pages WHERE channel = ?", (self.channel,))
+                conn.executemany(
+                    "INSERT INTO playlist_index (channel, playlist_id, title) VALUES (?, ?, ?)",
+                    [(self.channel, pid, title) for pid, title in playlists.items()],
+                )
+                conn.executemany(
+                    "INSERT INTO playlist_index_pages "
+                    "(channel, page, page_token, next_page_token, etag, playlist_ids) "
+                    "VALUES (?, ?, ?, ?, ?, ?)",
+                    [
+                        (
+                            self.channel, i, p["page_token"], p["next_page_token"], p["etag"],
+                            json.dumps(p["playlist_ids"]),
+                        )
+                        for i, p in enumerate(pages)
+                    ],
+                )
+                conn.execute(
+                    "INSERT OR REPLACE INTO playlist_index_state (channel, refreshed_at) VALUES (?, ?)",
+                    (self.channel, time.time()),
+                )
+        logger.debug(f"Saved playlist index with {len(playlists)} playlists ({len(pages)} pages)")
+
+    def upsert(self, playlist_id: str, title: str):
+        """作成・名前変更したプレイリストをその場で反映する。"""
+        with self._lock:
+            conn = self._connection()
+            with conn:
+                conn.execute(
+                    "INSERT INTO playlist_index (channel, playlist_id, title) VALUES (?, ?, ?) "
+                    "ON CONFLICT (channel, playlist_id) DO UPDATE SET title = excluded.title",
+                    (self.channel, playlist_id, title),
+                )
+
+    # --- Playlist items ---
+
+    def replace_items(self, playlist_id: str, items: List[Dict[str, Any]]):
+        """
+        プレイリストの中身を丸ごと置き換える (1トランザクション)。
+        items は {"video_id", "item_id", "position"} の辞書。
+        """
+        with self._lock:
+            conn = self._connection()
+            with conn:
+                conn.execute(
+                    "DELETE FROM playlist_items WHERE channel = ? AND playlist_id = ?",
+                    (self.channel, playlist_id),
+                )
+                conn.executemany(
+                    "INSERT OR REPLACE INTO playlist_items "
+                    "(channel, playlist_id, video_id, item_id, position) VALUES (?, ?, ?, ?, ?)",
+                    [
+                        (self.channel, playlist_id, i["video_id"], i["item_id"], i.get("position"))
+                        for i in items
+                    ],
+                )
+                conn.execute(
+                    "INSERT OR REPLACE INTO playlist_items_state (channel, playlist_id, loaded_at) "
+                    "VALUES (?, ?, ?)",
+                    (self.channel, playlist_id, time.time()),
+                )
+
+    def items_loaded(self, playlist_id: str, ttl: float) -> bool:
+        """プレイリストの中身を ttl 秒以内に丸ごと取得済みなら True。"""
+        if ttl <= 0:
+            return False
+        with self._lock:
+            row = self._connection().execute(
+                "SELECT loaded_at FROM playlist_items_state WHERE channel = ? AND playlist_id = ?",
+                (self.channel, playlist_id),
+            ).fetchone()
+        return row is not None and time.time() - row[0] < ttl
+
+    def find_item(self, playlist_id: str, video_id: str) -> Optional[str]:
+        """動画の playlistItem ID を返す (無ければ None)。"""
+        with self._lock:
+            row = self._connection().execute(
+                "SELECT item_id FROM playlist_items "
+                "WHERE channel = ? AND playlist_id = ? AND video_id = ? ORDER BY position LIMIT 1",
+                (self.channel, playlist_id, video_id),
+            ).fetchone()
+        return row[0] if row else None
+
+    def add_item(self, playlist_id: str, video_id: str, item_id: str, position: Optional[int] = None):
+        with self._lock:
+            conn = self._connection()
+            with conn:
+                if position is not None:
+                    # 途中への挿入なら後続の位置をずらす
+                    conn.execute(
+                        "UPDATE playlist_items SET position = position + 1 "
+                        "WHERE channel = ? AND playlist_id = ? AND position >= ?",
+                        (self.channel, playlist_id, position),
+                    )
+                conn.execute(
+                    "INSERT OR REPLACE INTO playlist_items "
+                    "(channel, playlist_id, video_id, item_id, position) VALUES (?, ?, ?, ?, ?)",
+                    (self.channel, playlist_id, video_id, item_id, position),
+                )
+
+    def remove_item(self, item_id: str):
+        with self._lock:
+            conn = self._connection()
+            with conn:
+                row = conn.execute(
+                    "SELECT playlist_id, position FROM playlist_items WHERE channel = ? AND item_id = ?",
+                    (self.channel, item_id),
+                ).fetchone()
+                if not row:
+                    return
+                playlist_id, position = row
+                conn.execute(
+                    "DELETE FROM playlist_items WHERE channel = ? AND item_id = ?",
+                    (self.channel, item_id),
+                )
+                if position is not None:
+                    conn.execute(
+                        "UPDATE playlist_items SET position = position - 1 "
+                        "WHERE channel = ? AND playlist_id = ? AND position > ?",
+                        (self.channel, playlist_id, position),
+                    )
+
+    def close(self):
+        with self._lock:
+            if self._conn is not None:
+                self._conn.close()
+                self._conn = None
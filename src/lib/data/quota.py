@@ -0,0 +1,45 @@
+from datetime import datetime
+from typing import Optional
+
+from ..core.config import config
+from .quota_ledger import QuotaLedger, get_ledger
+
+# YouTube Data API v3 のユニットコスト
+COST_VIDEO_UPLOAD = 1600
+COST_VIDEO_UPDATE = 50
+COST_PLAYLIST_ITEM_WRITE = 50  # playlistItems.insert / update / delete
+COST_WRITE = 50  # その他の書き込み系 (thumbnails.set, playlists.insert, videos.delete など)
+COST_LIST = 1
+
+# videos.list などで1回に指定できる ID の上限
+MAX_IDS_PER_LIST = 50
+
+
+def list_calls_for(count: int) -> int:
+    """count 件の ID を videos.list で取得するのに必要な呼び出し回数。"""
+    return -(-count // MAX_IDS_PER_LIST)
+
+
+def cost_of(method: str) -> int:
+    """API メソッド (methodId, 例: "youtube.videos.list") 1回あたりのユニットコスト。"""
+    if method == "youtube.videos.insert":
+        return COST_VIDEO_UPLOAD
+    if method.endswith(".list"):
+        return COST_LIST
+    return COST_WRITE
+
+
+def today_start() -> float:
+    """本日 0 時 (ローカル時刻) のタイムスタンプ。"""
+    now = datetime.now()
+    return datetime(now.year, now.month, now.day).timestamp()
+
+
+def estimate_used_units_today(ledger: Optional[QuotaLedger] = None) -> int:
+    """quota ledger に記録された本日の API 呼び出しの合計ユニット。"""
+    return (ledger or get_ledger()).used_units(today_start())
+
+
+def estimate_remaining_units(ledger: Optional[QuotaLedger] = None) -> int:
+    """daily_quota_limit に対する本日の推定残量。"""
+    return max(0, config.upload.daily_quota_limit - estimate_used_units_today(ledger))
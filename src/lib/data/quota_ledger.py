@@ -0,0 +1,139 @@
+import json
+import logging
+import sqlite3
+import threading
+import time
+from typing import List, Optional, Tuple
+
+from ..auth.profiles import get_active_profile
+from ..core.config import config
+
+logger = logging.getLogger("youtube_up")
+
+_CREATE_TABLES_SQL = [
+    """
+    CREATE TABLE IF NOT EXISTS quota_ledger (
+        id INTEGER PRIMARY KEY AUTOINCREMENT,
+        timestamp REAL NOT NULL,
+        profile TEXT NOT NULL,
+        project TEXT NOT NULL,
+        method TEXT NOT NULL,
+        units INTEGER NOT NULL
+    );
+    """,
+    # 集計用のカバリングインデックス (プロジェクト・期間で絞り、テーブル本体を読まずに合計する)
+    "CREATE INDEX IF NOT EXISTS idx_quota_ledger_project_ts "
+    "ON quota_ledger (project, timestamp, method, units);",
+]
+
+
+def _project_from_client_secrets() -> str:
+    """client_secrets.json の project_id (クォータはプロジェクト単位)。読めなければ空文字。"""
+    try:
+        with open(config.auth.client_secrets_file, "r", encoding="utf-8") as f:
+            data = json.load(f)
+        # {"installed": {...}} または {"web": {...}}
+        return next(iter(data.values())).get("project_id", "")
+    except (OSError, ValueError, StopIteration, AttributeError):
+        return ""
+
+
+class QuotaLedger:
+    """
+    実際に発行した API 呼び出しのコストを記録する台帳 (履歴 DB の quota_ledger テーブル)。
+
+    1呼び出しごとに (timestamp, profile, project, method, units) を1行追記し、
+    使用量は SQL の集計1回で求める。YouTube API のクォータは Google Cloud
+    プロジェクト単位なので、集計はプロジェクトで絞り込む。
+    API 呼び出しはワーカースレッドからも記録されるため接続は1本をロックで共有する。
+    """
+
+    def __init__(
+        self,
+        db_path: Optional[str] = None,
+        profile: Optional[str] = None,
+        project: Optional[str] = None,
+    ):
+        self.db_path = db_path or config.history_db
+        self._profile = profile
+        self._project = project
+        self._conn: Optional[sqlite3.Connection] = None
+        self._lock = threading.Lock()
+
+    @property
+    def profile(self) -> str:
+        if self._profile is None:
+            self._profile = get_active_profile()
+        return self._profile
+
+    @property
+    def project(self) -> str:
+        if self._project is None:
+            self._project = _project_from_client_secrets()
+        return self._project
+
+    def _connection(self) -> sqlite3.Connection:
+        # 実際に使われるまで DB を開かない
+        if self._conn is None:
+            conn = sqlite3.connect(self.db_path, check_same_thread=False)
+            conn.execute("PRAGMA journal_mode=WAL;")
+            for sql in _CREATE_TABLES_SQL:
+                conn.execute(sql)
+            conn.commit()
+            self._conn = conn
+        return self._conn
+
+    def record(self, method: str, units: int, timestamp: Optional[float] = None):
+        """API 呼び出し1回分 (method は "youtube.videos.list" などの methodId) を記録する。"""
+        row = (timestamp or time.time(), self.profile, self.project, method, units)
+        try:
+            with self._lock:
+                conn = self._connection()
+                with conn:
+                    conn.execute(
+                        "INSERT INTO quota_ledger (timestamp, profile, project, method, units) "
+                        "VALUES (?, ?, ?, ?, ?)",
+                        row,
+                    )
+        except sqlite3.Error as e:
+            # 記録に失敗しても API 呼び出し自体は止めない
+            logger.warning(f"Failed to record quota usage for {method}: {e}")
+
+    def used_units(self, since: float) -> int:
+        """since 以降にこのプロジェクトで使ったユニット数。"""
+        with self._lock:
+            row = self._connection().execute(
+                "SELECT COALESCE(SUM(units), 0) FROM quota_ledger WHERE project = ? AND timestamp >= ?",
+                (self.project, since),
+            ).fetchone()
+        return row[0]
+
+    def usage_by_method(self, since: float) -> List[Tuple[str, int, int]]:
+        """since 以降の [(method, calls, units)] をユニットの多い順で返す。"""
+        with self._lock:
+            rows = self._connection().execute(
+                "SELECT method, COUNT(*), SUM(units) FROM quota_ledger "
+                "WHERE project = ? AND timestamp >= ? GROUP BY method ORDER BY SUM(units) DESC, method",
+                (self.project, since),
+            ).fetchall()
+        return [(method, calls, units) for method, calls, units in rows]
+
+    def close(self):
+        with self._lock:
+            if self._conn is not None:
+                self._conn.close()
+                self._conn = None
+
+
+# Process-wide ledger (API 呼び出しの記録先)
+_ledger: Optional[QuotaLedger] = None
+_ledger_lock = threading.Lock()
+
+
+def get_ledger() -> QuotaLedger:
+    """プロセス共通の QuotaLedger を返す (初回に作成)。"""
+    global _ledger
+    with _ledger_lock:
+        if _ledger is None:
+            _ledger = QuotaLedger()
+        return _ledger
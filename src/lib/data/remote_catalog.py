@@ -0,0 +1,328 @@
+import logging
+import sqlite3
+import threading
+import time
+from typing import Any, Dict, Iterator, List, Optional
+
+from googleapiclient.discovery import Resource
+
+from ..auth.profiles import get_active_profile
+from ..core.config import config
+
+logger = logging.getLogger("youtube_up")
+
+_CREATE_TABLES_SQL = [
+    """
+    CREATE TABLE IF NOT EXISTS remote_videos (
+        channel TEXT NOT NULL,
+        video_id TEXT NOT NULL,
+        title TEXT,
+        privacy TEXT,
+        published_at TEXT,
+        seq INTEGER NOT NULL,
+        local_only INTEGER NOT NULL DEFAULT 0,
+        PRIMARY KEY (channel, video_id)
+    );
+    """,
+    "CREATE INDEX IF NOT EXISTS idx_remote_videos_seq ON remote_videos (channel, seq);",
+    """
+    CREATE TABLE IF NOT EXISTS remote_videos_state (
+        channel TEXT PRIMARY KEY,
+        uploads_playlist_id TEXT NOT NULL,
+        refreshed_at REAL NOT NULL,
+        full_refreshed_at REAL NOT NULL
+    );
+    """,
+]
+
+
+class RemoteCatalog:
+    """
+    チャンネルのアップロード済み動画一覧 (uploads プレイリスト) を履歴 DB にミラーする。
+
+    uploads プレイリストは新しい順に並ぶため、差分更新では先頭から読み進め、
+    既知の動画に到達した時点で打ち切る (通常は1ページ = 1ユニット)。
+    差分更新では削除やタイトル変更を検出できないので、
+    api.remote_catalog_full_refresh 秒ごとに全件を取り直して置き換える。
+    api.remote_catalog_ttl 秒以内の再実行では API を呼ばずにミラーをそのまま使う。
+
+    seq は新しい動画ほど大きい通し番号で、一覧はこの降順で返す。
+    """
+
+    def __init__(self, db_path: Optional[str] = None, channel: Optional[str] = None):
+        self.db_path = db_path or config.history_db
+        self._channel = channel
+        self._conn: Optional[sqlite3.Connection] = None
+        self._lock = threading.Lock()
+
+    @property
+    def channel(self) -> str:
+        if self._channel is None:
+            self._channel = get_active_profile()
+        return self._channel
+
+    def _connection(self) -> sqlite3.Connection:
+        # 実際に使われるまで DB を開かない
+        if self._conn is None:
+            conn = sqlite3.connect(self.db_path, check_same_thread=False)
+            conn.execute("PRAGMA journal_mode=WAL;")
+            for sql in _CREATE_TABLES_SQL:
+                conn.execute(sql)
+            columns = {row[1] for row in conn.execute("PRAGMA table_info(remote_videos)")}
+            if "local_only" not in columns:
+                # local_only 列が無い古いミラー
+                conn.execute("ALTER TABLE remote_videos ADD COLUMN local_only INTEGER NOT NULL DEFAULT 0")
+            conn.commit()
+            self._conn = conn
+        return self._conn
+
+    def _state(self) -> Optional[Dict[str, Any]]:
+        with self._lock:
+            row = self._connection().execute(
+                "SELECT uploads_playlist_id, refreshed_at, full_refreshed_at "
+                "FROM remote_videos_state WHERE channel = ?",
+                (self.channel,),
+            ).fetchone()
+        if not row:
+            return None
+        return {"uploads_playlist_id": row[0], "refreshed_at": row[1], "full_refreshed_at": row[2]}
+
+    # --- Refresh ---
+
+    def full_refresh_due(self, full: bool = False) -> bool:
+        """次の refresh(full=full) が全件の取り直しになるか (初回・TTL 切れで全件更新の期限を過ぎた場合)。"""
+        state = self._state()
+        if full or state is None:
+            return True
+        now = time.time()
+        if now - state["refreshed_at"] < config.api.remote_catalog_ttl:
+            return False
+        return now - state["full_refreshed_at"] >= config.api.remote_catalog_full_refresh
+
+    def refresh(self, service: Resource, full: bool = False, enricher=None) -> int:
+        """
+        ミラーを更新する。full=True または前回の全件更新から
+        remote_catalog_full_refresh 秒以上経っていれば全件を取り直す。
+        enricher (VideoEnricher, part=status) を渡すと、公開状態の取得を
+        ページが届くたびに並列で開始する。無ければ最後に50件ずつ順に取得する。
+        Returns: 取得した (新規または全件の) 動画数。TTL 内でスキップした場合は 0。
+        """
+        state = self._state()
+        now = time.time()
+        if not full and state and now - state["refreshed_at"] < config.api.remote_catalog_ttl:
+            logger.debug("Remote catalog is fresh; skipping refresh")
+            return 0
+
+        uploads_playlist_id = state["uploads_playlist_id"] if state else self._fetch_uploads_playlist_id(service)
+        if not uploads_playlist_id:
+            return 0
+
+        full = full or state is None or now - state["full_refreshed_at"] >= config.api.remote_catalog_full_refresh
+        # 自分で追加しただけの動画 (local_only) は打ち切りの目印にしない。
+        # それより前に Web などからアップロードされた動画を取りこぼさないため。
+        known = set() if full else self.video_ids(confirmed_only=True)
+
+        items = []
+        next_page_token = None
+        while True:
+            response = service.playlistItems().list(
+                playlistId=uploads_playlist_id,
+                part="snippet,contentDetails",
+                maxResults=50,
+                pageToken=next_page_token,
+                fields="nextPageToken,items(snippet(title,publishedAt),contentDetails/videoId)",
+            ).execute()
+
+            reached_known = False
+            page = []
+            for item in response.get("items", []):
+                if item["contentDetails"]["videoId"] in known:
+                    reached_known = True
+                    break
+                page.append(item)
+            items.extend(page)
+            if enricher:
+                enricher.add(item["contentDetails"]["videoId"] for item in page)
+
+            next_page_token = response.get("nextPageToken")
+            if reached_known or not next_page_token:
+                break
+
+        if enricher:
+            privacy = {vid: v["status"]["privacyStatus"] for vid, v in enricher.results().items()}
+        else:
+            privacy = self._fetch_privacy(service, [item["contentDetails"]["videoId"] for item in items])
+        rows = [
+            (
+                item["contentDetails"]["videoId"],
+                item["snippet"].get("title"),
+                privacy.get(item["contentDetails"]["videoId"], "unknown"),
+                item["snippet"].get("publishedAt"),
+            )
+            for item in items
+        ]
+        self._store(uploads_playlist_id, rows, full, now)
+        logger.info(
+            f"Remote catalog {'fully refreshed' if full else 'updated'}: "
+            f"{len(rows)} {'videos' if full else 'new videos'}"
+        )
+        return len(rows)
+
+    def _fetch_uploads_playlist_id(self, service: Resource) -> Optional[str]:
+        response = service.channels().list(
+            mine=True, part="contentDetails", fields="items/contentDetails/relatedPlaylists/uploads"
+        ).execute()
+        items = response.get("items", [])
+        if not items:
+            logger.warning("No channel found for authenticated user.")
+            return None
+        return items[0]["contentDetails"]["relatedPlaylists"]["uploads"]
+
+    def _fetch_privacy(self, service: Resource, video_ids: List[str]) -> Dict[str, str]:
+        """videos.list(part=status) を50件ずつ呼び、{video_id: privacyStatus} を返す。"""
+        privacy = {}
+        for i in range(0, len(video_ids), 50):
+            response = service.videos().list(
+                id=",".join(video_ids[i:i + 50]), part="status", fields="items(id,status/privacyStatus)"
+            ).execute()
+            for item in response.get("items", []):
+                privacy[item["id"]] = item["status"]["privacyStatus"]
+        return privacy
+
+    def replace(self, uploads_playlist_id: str, videos: List[Dict[str, str]]):
+        """
+        uploads プレイリストを最後まで読んだ一覧 ({"id", "title", "privacy"}, 新しい順) で
+        ミラーを置き換える (全件更新として記録する)。
+        """
+        rows = [(v["id"], v.get("title"), v.get("privacy", "unknown"), None) for v in videos]
+        self._store(uploads_playlist_id, rows, True, time.time())
+        logger.info(f"Remote catalog fully refreshed: {len(rows)} videos")
+
+    def _store(self, uploads_playlist_id: str, rows: List[tuple], full: bool, now: float):
+        """rows は新しい順の (video_id, title, privacy, published_at)。"""
+        with self._lock:
+            conn = self._connection()
+            with conn:
+                if full:
+                    conn.execute("DELETE FROM remote_videos WHERE channel = ?", (self.channel,))
+                    base = 0
+                else:
+                    base = conn.execute(
+                        "SELECT COALESCE(MAX(seq), -1) + 1 FROM remote_videos WHERE channel = ?",
+                        (self.channel,),
+                    ).fetchone()[0]
+                conn.executemany(
+                    "INSERT OR REPLACE INTO remote_videos "
+                    "(channel, video_id, title, privacy, published_at, seq) VALUES (?, ?, ?, ?, ?, ?)",
+                    [
+                        (self.channel, vid, title, privacy, published_at, base + len(rows) - 1 - i)
+                        for i, (vid, title, privacy, published_at) in enumerate(rows)
+                    ],
+                )
+                conn.execute(
+                    "INSERT INTO remote_videos_state "
+                    "(channel, uploads_playlist_id, refreshed_at, full_refreshed_at) VALUES (?, ?, ?, ?) "
+                    "ON CONFLICT (channel) DO UPDATE SET uploads_playlist_id = excluded.uploads_playlist_id, "
+                    "refreshed_at = excluded.refreshed_at"
+                    + (", full_refreshed_at = excluded.full_refreshed_at" if full else ""),
+                    (self.channel, uploads_playlist_id, now, now),
+                )
+
+    # --- Queries ---
+
+    def video_ids(self, confirmed_only: bool = False) -> set:
+        """confirmed_only=True ならリモートの一覧で確認済みの動画 (local_only でないもの) だけ。"""
+        sql = "SELECT video_id FROM remote_videos WHERE channel = ?"
+        if confirmed_only:
+            sql += " AND local_only = 0"
+        with self._lock:
+            rows = self._connection().execute(sql, (self.channel,)).fetchall()
+        return {row[0] for row in rows}
+
+    def videos(self) -> List[Dict[str, str]]:
+        """[{"id", "title", "privacy"}] を新しい順で返す。"""
+        return list(self.iter_videos())
+
+    def iter_videos(
+        self,
+        privacy: Optional[str] = None,
+        limit: Optional[int] = None,
+        batch_size: int = 500,
+    ) -> Iterator[Dict[str, str]]:
+        """
+        {"id", "title", "privacy"} を新しい順に返す。絞り込みと件数制限は SQL で行い、
+        batch_size 行ずつ読み出すので全件をメモリに載せない。
+        """
+        sql = "SELECT video_id, title, privacy FROM remote_videos WHERE channel = ?"
+        params: List[Any] = [self.channel]
+        if privacy:
+            sql += " AND privacy = ?"
+            params.append(privacy)
+        sql += " ORDER BY seq DESC"
+        if limit:
+            sql += " LIMIT ?"
+            params.append(limit)
+
+        with self._lock:
+            cursor = self._connection().execute(sql, params)
+        while True:
+            with self._lock:
+                rows = cursor.fetchmany(batch_size)
+            if not rows:
+                break
+            for vid, title, privacy_status in rows:
+                yield {"id": vid, "title": title, "privacy": privacy_status}
+
+    # --- Local updates (自分で行った変更をその場で反映する) ---
+
+    def add(self, video_id: str, title: str, privacy: str):
+        """
+        自分でアップロードした動画を最新の動画として追加する。
+        次にリモートの一覧で確認されるまでは local_only として扱う。
+        """
+        with self._lock:
+            conn = self._connection()
+            with conn:
+                seq = conn.execute(
+                    "SELECT COALESCE(MAX(seq), -1) + 1 FROM remote_videos WHERE channel = ?",
+                    (self.channel,),
+                ).fetchone()[0]
+                conn.execute(
+                    "INSERT OR REPLACE INTO remote_videos "
+                    "(channel, video_id, title, privacy, published_at, seq, local_only) "
+                    "VALUES (?, ?, ?, ?, NULL, ?, 1)",
+                    (self.channel, video_id, title, privacy, seq),
+                )
+
+    def update_privacy(self, video_ids: List[str], privacy: str):
+        with self._lock:
+            conn = self._connection()
+            with conn:
+                conn.executemany(
+                    "UPDATE remote_videos SET privacy = ? WHERE channel = ? AND video_id = ?",
+                    [(privacy, self.channel, vid) for vid in video_ids],
+                )
+
+    def update_titles(self, titles: Dict[str, str]):
+        with self._lock:
+            conn = self._connection()
+            with conn:
+                conn.executemany(
+                    "UPDATE remote_videos SET title = ? WHERE channel = ? AND video_id = ?",
+                    [(title, self.channel, vid) for vid, title in titles.items()],
+                )
+
+    def remove(self, video_ids: List[str]):
+        with self._lock:
+            conn = self._connection()
+            with conn:
+                conn.executemany(
+                    "DELETE FROM remote_videos WHERE channel = ? AND video_id = ?",
+                    [(self.channel, vid) for vid in video_ids],
+                )
+
+    def close(self):
+        with self._lock:
+            if self._conn is not None:
+                self._conn.close()
+                self._conn = None
@@ -0,0 +1,132 @@
+import logging
+import time
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Callable, Dict, Hashable, List, Optional, Tuple
+
+from googleapiclient.discovery import Resource
+from googleapiclient.http import HttpRequest
+
+from ..auth.service import get_service, record_call
+from ..core.config import config
+from .uploader import should_retry_exception
+
+logger = logging.getLogger("youtube_up")
+
+# Builds the (unexecuted) request for one operation from a service object
+RequestFactory = Callable[[Resource], HttpRequest]
+
+# Largest number of calls the API accepts in one batch request
+MAX_BATCH_SIZE = 50
+
+
+class BatchExecutor:
+    """
+    Runs many independent control-plane API calls with few round-trips.
+
+    - mode="batch": groups up to batch_size calls into one BatchHttpRequest.
+    - mode="concurrent": runs each call as its own request.
+
+    Either way, up to max_workers requests are in flight at once, each
+    worker thread using its own cached service.
+
+    Retryable per-item failures (429/5xx/timeouts) are retried with
+    exponential backoff; every item gets an outcome
+    {"ok": bool, "response": dict | None, "error": Exception | None}.
+    """
+
+    def __init__(
+        self,
+        credentials,
+        mode: Optional[str] = None,
+        batch_size: Optional[int] = None,
+        max_workers: Optional[int] = None,
+        retry_count: Optional[int] = None,
+    ):
+        self.credentials = credentials
+        self.mode = mode or config.api.batch_mode
+        if self.mode not in ("batch", "concurrent"):
+            raise ValueError(f"Invalid batch mode: {self.mode}")
+        self.batch_size = min(batch_size or config.api.batch_size, MAX_BATCH_SIZE)
+        self.max_workers = max_workers or config.api.concurrency
+        self.retry_count = config.api.retry_count if retry_count is None else retry_count
+
+    def execute(self, operations: List[Tuple[Hashable, RequestFactory]]) -> Dict[Hashable, Dict[str, Any]]:
+        """
+        Executes operations given as (key, request_factory) pairs.
+        Returns {key: outcome} in the order of the input.
+        """
+        outcomes: Dict[Hashable, Dict[str, Any]] = {}
+        pending = list(operations)
+
+        for attempt in range(self.retry_count + 1):
+            if not pending:
+                break
+            if attempt:
+                delay = min(2 ** attempt, 30)
+                logger.warning(f"Retrying {len(pending)} failed API calls in {delay}s (attempt {attempt + 1})...")
+                time.sleep(delay)
+
+            if self.mode == "batch":
+                results = self._run_batches(pending)
+            else:
+                results = self._run_concurrent(pending)
+
+            retry_next = []
+            for key, factory in pending:
+                response, error = results[key]
+                if error is None:
+                    outcomes[key] = {"ok": True, "response": response, "error": None}
+                elif should_retry_exception(error) and attempt < self.retry_count:
+                    retry_next.append((key, factory))
+                else:
+                    logger.error(f"API call failed for {key}: {error}")
+                    outcomes[key] = {"ok": False, "response": None, "error": error}
+            pending = retry_next
+
+        return {key: outcomes[key] for key, _ in operations}
+
+    def _run_batches(self, operations) -> Dict[Hashable, Tuple[Optional[dict], Optional[Exception]]]:
+        results = {}
+
+        def run_chunk(chunk):
+            # Each worker thread uses its own cached service (httplib2 is not thread-safe)
+            service = get_service(self.credentials)
+
+            requests = [factory(service) for _, factory in chunk]
+
+            def callback(request_id, response, exception):
+                key = chunk[int(request_id)][0]
+                results[key] = (response, exception)
+                # Each call inside a batch is billed like a separate request;
+                # a callback means the API received (and answered) this call
+                record_call(requests[int(request_id)])
+
+            batch = service.new_batch_http_request(callback=callback)
+            for i, request in enumerate(requests):
+                batch.add(request, request_id=str(i))
+            try:
+                batch.execute()
+            except Exception as e:
+                # The batch round-trip failed; items without a callback share the error
+                for key, _ in chunk:
+                    results.setdefault(key, (None, e))
+
+        chunks = [
+            operations[start:start + self.batch_size]
+            for start in range(0, len(operations), self.batch_size)
+        ]
+        with ThreadPoolExecutor(max_workers=min(self.max_workers, len(chunks)) or 1) as pool:
+            list(pool.map(run_chunk, chunks))
+
+        return results
+
+    def _run_concurrent(self, operations) -> Dict[Hashable, Tuple[Optional[dict], Optional[Exception]]]:
+        def run(op):
+            key, factory = op
+            try:
+                return key, (factory(get_service(self.credentials)).execute(), None)
+            except Exception as e:
+                return key, (None, e)
+
+        with ThreadPoolExecutor(max_workers=self.max_workers) as pool:
+            return dict(pool.map(run, operations))
@@ -0,0 +1,90 @@
+import logging
+import threading
+from concurrent.futures import Future, ThreadPoolExecutor
+from typing import Dict, Iterable, List, Optional, Sequence
+
+from googleapiclient.errors import HttpError
+
+from ..auth.service import get_service
+from ..core.config import config
+from ..data.quota import MAX_IDS_PER_LIST
+
+logger = logging.getLogger("youtube_up")
+
+
+class VideoEnricher:
+    """
+    Fetches extra video parts (status, processingDetails, fileDetails, ...)
+    with videos.list while the caller is still producing IDs.
+
+    add() queues IDs as they arrive (e.g. one uploads-playlist page at a time)
+    and starts a videos.list call for every 50 of them right away on a
+    bounded thread pool; results() flushes the remainder and waits.
+    Each worker thread uses its own cached service. Failed chunks are logged
+    and left out of the results, like VideoManager.get_videos.
+
+        with VideoEnricher(credentials, parts=("status",)) as enricher:
+            for page in pages:
+                enricher.add(ids_in(page))
+            videos = enricher.results()
+    """
+
+    def __init__(
+        self,
+        credentials,
+        parts: Sequence[str] = ("status",),
+        fields: Optional[str] = None,
+        max_workers: Optional[int] = None,
+    ):
+        self.credentials = credentials
+        self.part = ",".join(parts)
+        self.fields = fields
+        self._pool = ThreadPoolExecutor(max_workers=max_workers or config.api.concurrency)
+        self._lock = threading.Lock()
+        self._pending: List[str] = []  # 50件に満たない端数
+        self._futures: List[Future] = []
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+    def add(self, video_ids: Iterable[str]):
+        """Queues IDs; every full chunk of 50 is sent immediately."""
+        with self._lock:
+            self._pending.extend(video_ids)
+            while len(self._pending) >= MAX_IDS_PER_LIST:
+                self._submit(self._pending[:MAX_IDS_PER_LIST])
+                del self._pending[:MAX_IDS_PER_LIST]
+
+    def _submit(self, chunk: List[str]):
+        self._futures.append(self._pool.submit(self._fetch, chunk))
+
+    def _fetch(self, chunk: List[str]) -> List[dict]:
+        service = get_service(self.credentials)
+        try:
+            response = service.videos().list(
+                id=",".join(chunk), part=self.part, maxResults=MAX_IDS_PER_LIST, fields=self.fields,
+            ).execute(num_retries=config.api.retry_count)
+        except HttpError as e:
+            logger.error(f"Failed to fetch {self.part} for {len(chunk)} videos: {e}")
+            return []
+        return response.get("items", [])
+
+    def results(self) -> Dict[str, dict]:
+        """Sends the remaining IDs, waits for every call and returns {video_id: resource}."""
+        with self._lock:
+            if self._pending:
+                self._submit(self._pending)
+                self._pending = []
+            futures, self._futures = self._futures, []
+
+        videos = {}
+        for future in futures:
+            for item in future.result():
+                videos[item["id"]] = item
+        return videos
+
+    def close(self):
+        self._pool.shutdown(wait=True)
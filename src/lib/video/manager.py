@@ -1,20 +1,27 @@
 import logging
-from typing import Dict, List, Optional
+from typing import Any, Dict, Iterator, List, Optional, Sequence, Tuple
 
-from googleapiclient.discovery import build
 from googleapiclient.errors import HttpError
 from googleapiclient.http import MediaFileUpload
 
+from ..auth.service import get_service
+from ..data.remote_catalog import RemoteCatalog
+from .batch import BatchExecutor
+from .enrich import VideoEnricher
+
 logger = logging.getLogger("youtube_up")
 
 
 class VideoManager:
     """
     Manages general YouTube Video interactions (metadata, settings, deletion).
+    When a RemoteCatalog is given, the uploaded-video list is served from the
+    local mirror and this manager's own changes are written back to it.
     """
 
-    def __init__(self, credentials):
+    def __init__(self, credentials, catalog: Optional[RemoteCatalog] = None):
         self.credentials = credentials
+        self.catalog = catalog
 
     def update_privacy_status(self, video_id: str, privacy_status: str) -> bool:
         """
@@ -25,7 +32,7 @@ class VideoManager:
             return False
 
         try:
-            service = build("youtube", "v3", credentials=self.credentials, cache_discovery=False)
+            service = get_service(self.credentials)
 
             body = {
                 "id": video_id,
@@ -39,6 +46,8 @@ class VideoManager:
                 body=body
             )
             request.execute()
+            if self.catalog:
+                self.catalog.update_privacy([video_id], privacy_status)
             
             logger.info(f"Updated privacy status for {video_id} to {privacy_status}")
             return True
@@ -47,6 +56,88 @@ class VideoManager:
             logger.error(f"Failed to update privacy status for {video_id}: {e}")
             return False
 
+    def get_videos(
+        self,
+        video_ids: List[str],
+        part: str = "status",
+        concurrency: Optional[int] = None,
+        fields: Optional[str] = None,
+    ) -> Dict[str, dict]:
+        """
+        Fetches video resources 50 IDs per videos.list call.
+        fields is an optional partial-response mask (it must keep items/id).
+        Returns {video_id: resource}; IDs that were not found are omitted.
+        """
+        return self.fetch_videos(video_ids, part=part, concurrency=concurrency, fields=fields)[0]
+
+    def fetch_videos(
+        self,
+        video_ids: List[str],
+        part: str = "status",
+        concurrency: Optional[int] = None,
+        fields: Optional[str] = None,
+    ) -> Tuple[Dict[str, dict], List[str]]:
+        """
+        Like get_videos, but also reports the IDs whose videos.list call failed,
+        so callers can tell "not found" apart from "could not be fetched".
+        Returns ({video_id: resource}, failed video IDs).
+        """
+        operations = [
+            (i, lambda service, ids=video_ids[i:i + 50]: service.videos().list(
+                id=",".join(ids), part=part, maxResults=50, fields=fields,
+            ))
+            for i in range(0, len(video_ids), 50)
+        ]
+        outcomes = BatchExecutor(self.credentials, max_workers=concurrency).execute(operations)
+
+        videos = {}
+        failed = []
+        for i, outcome in outcomes.items():
+            if outcome["ok"]:
+                for item in outcome["response"].get("items", []):
+                    videos[item["id"]] = item
+            else:
+                failed.extend(video_ids[i:i + 50])
+        return videos, failed
+
+    def get_privacy_statuses(self, video_ids: List[str], concurrency: Optional[int] = None) -> Dict[str, str]:
+        """Returns {video_id: privacyStatus} for the videos that exist."""
+        videos = self.get_videos(
+            video_ids, part="status", concurrency=concurrency, fields="items(id,status/privacyStatus)"
+        )
+        return {vid: item["status"]["privacyStatus"] for vid, item in videos.items()}
+
+    def update_privacy_status_bulk(
+        self,
+        video_ids: List[str],
+        privacy_status: str,
+        concurrency: Optional[int] = None,
+    ) -> Dict[str, bool]:
+        """
+        Updates the privacy status of many videos with batched API calls.
+        Returns {video_id: success}.
+        """
+        if privacy_status not in ["public", "private", "unlisted"]:
+            logger.error(f"Invalid privacy status: {privacy_status}")
+            return {vid: False for vid in video_ids}
+
+        operations = [
+            (vid, lambda service, vid=vid: service.videos().update(
+                part="status",
+                body={"id": vid, "status": {"privacyStatus": privacy_status}},
+            ))
+            for vid in video_ids
+        ]
+        outcomes = BatchExecutor(self.credentials, max_workers=concurrency).execute(operations)
+        results = {vid: outcome["ok"] for vid, outcome in outcomes.items()}
+        if self.catalog:
+            self.catalog.update_privacy([vid for vid, ok in results.items() if ok], privacy_status)
+        logger.info(
+            f"Updated privacy status to {privacy_status} for "
+            f"{sum(results.values())}/{len(video_ids)} videos"
+        )
+        return results
+
     def update_metadata(
         self,
         video_id: str,
@@ -59,12 +150,13 @@ class VideoManager:
         Updates metadata for a video. Fetches current snippet first to preserve other fields.
         """
         try:
-            service = build("youtube", "v3", credentials=self.credentials, cache_discovery=False)
+            service = get_service(self.credentials)
             
             # 1. Get current snippet
             request = service.videos().list(
                 part="snippet",
-                id=video_id
+                id=video_id,
+                fields="items/snippet",
             )
             response = request.execute()
             items = response.get("items", [])
@@ -76,24 +168,16 @@ class VideoManager:
             snippet = items[0]["snippet"]
             
             # 2. Update fields if provided
-            if title:
-                snippet["title"] = title
-            if description:
-                snippet["description"] = description
-            if tags is not None:
-                snippet["tags"] = tags
-            if category_id:
-                snippet["categoryId"] = category_id
-                
+            fields = self.metadata_fields(title, description, tags, category_id)
+            new_snippet = self.diff_snippet(snippet, fields)
+            if new_snippet is None:
+                logger.info(f"Metadata for {video_id} is already up to date")
+                return True
+
             # 3. specific update
             update_body = {
                 "id": video_id,
-                "snippet": {
-                    "title": snippet["title"],
-                    "description": snippet["description"],
-                    "tags": snippet.get("tags", []),
-                    "categoryId": snippet["categoryId"]
-                }
+                "snippet": new_snippet
             }
             
             update_request = service.videos().update(
@@ -101,6 +185,8 @@ class VideoManager:
                 body=update_body
             )
             update_request.execute()
+            if self.catalog:
+                self.catalog.update_titles({video_id: new_snippet["title"]})
             
             logger.info(f"Updated metadata for {video_id}")
             return True
@@ -109,12 +195,102 @@ class VideoManager:
             logger.error(f"Failed to update metadata for {video_id}: {e}")
             return False
 
+    @staticmethod
+    def metadata_fields(
+        title: Optional[str] = None,
+        description: Optional[str] = None,
+        tags: Optional[list] = None,
+        category_id: Optional[str] = None,
+    ) -> Dict[str, object]:
+        """Builds the snippet fields to set; empty values mean "keep current"."""
+        fields = {}
+        if title:
+            fields["title"] = title
+        if description:
+            fields["description"] = description
+        if tags is not None:
+            fields["tags"] = tags
+        if category_id:
+            fields["categoryId"] = category_id
+        return fields
+
+    @staticmethod
+    def diff_snippet(snippet: dict, fields: Dict[str, object]) -> Optional[dict]:
+        """
+        Applies `fields` to the current snippet.
+        Returns the snippet to send with videos.update, or None when nothing changes.
+        """
+        current = {
+            "title": snippet.get("title", ""),
+            "description": snippet.get("description", ""),
+            "tags": snippet.get("tags", []),
+            "categoryId": snippet.get("categoryId"),
+        }
+        updated = {**current, **fields}
+        if updated == current:
+            return None
+        return updated
+
+    def plan_metadata_updates(
+        self,
+        desired: Dict[str, Dict[str, object]],
+        concurrency: Optional[int] = None,
+    ) -> Tuple[Dict[str, dict], List[str], List[str]]:
+        """
+        Fetches current snippets (50 IDs per call) and diffs them against
+        `desired` ({video_id: fields}) locally.
+        Returns ({video_id: snippet to send} for videos that change, missing video IDs,
+        IDs whose snippet could not be fetched).
+        """
+        videos, failed = self.fetch_videos(list(desired), part="snippet", concurrency=concurrency)
+        failed_ids = set(failed)
+        updates = {}
+        missing = []
+        errors = []
+        for vid, fields in desired.items():
+            if vid in failed_ids:
+                errors.append(vid)
+                continue
+            if vid not in videos:
+                missing.append(vid)
+                continue
+            new_snippet = self.diff_snippet(videos[vid]["snippet"], fields)
+            if new_snippet is not None:
+                updates[vid] = new_snippet
+        logger.info(
+            f"Metadata plan: {len(updates)}/{len(desired)} videos change, {len(missing)} not found, "
+            f"{len(errors)} fetch errors"
+        )
+        return updates, missing, errors
+
+    def apply_metadata_updates(
+        self,
+        updates: Dict[str, dict],
+        concurrency: Optional[int] = None,
+    ) -> Dict[str, bool]:
+        """
+        Sends videos.update(part=snippet) for each planned snippet.
+        Returns {video_id: success}.
+        """
+        operations = [
+            (vid, lambda service, vid=vid, snippet=snippet: service.videos().update(
+                part="snippet", body={"id": vid, "snippet": snippet},
+            ))
+            for vid, snippet in updates.items()
+        ]
+        outcomes = BatchExecutor(self.credentials, max_workers=concurrency).execute(operations)
+        results = {vid: outcome["ok"] for vid, outcome in outcomes.items()}
+        if self.catalog:
+            self.catalog.update_titles({vid: updates[vid]["title"] for vid, ok in results.items() if ok})
+        logger.info(f"Updated metadata for {sum(results.values())}/{len(updates)} videos")
+        return results
+
     def update_thumbnail(self, video_id: str, image_path: str) -> bool:
         """
         Updates the thumbnail of a video.
         """
         try:
-            service = build("youtube", "v3", credentials=self.credentials, cache_discovery=False)
+            service = get_service(self.credentials)
             
             request = service.thumbnails().set(
                 videoId=video_id,
@@ -133,12 +309,14 @@ class VideoManager:
         Deletes a video from YouTube.
         """
         try:
-            service = build("youtube", "v3", credentials=self.credentials, cache_discovery=False)
+            service = get_service(self.credentials)
             
             request = service.videos().delete(
                 id=video_id
             )
             request.execute()
+            if self.catalog:
+                self.catalog.remove([video_id])
             
             logger.info(f"Deleted video {video_id}")
             return True
@@ -146,66 +324,77 @@ class VideoManager:
             logger.error(f"Failed to delete video {video_id}: {e}")
             return False
 
-    def get_all_uploaded_videos(self) -> List[Dict[str, str]]:
+    def delete_videos(self, video_ids: List[str]) -> Dict[str, bool]:
+        """
+        Deletes many videos with batched API calls.
+        Returns {video_id: success}.
+        """
+        operations = [
+            (vid, lambda service, vid=vid: service.videos().delete(id=vid))
+            for vid in video_ids
+        ]
+        outcomes = BatchExecutor(self.credentials).execute(operations)
+        results = {vid: outcome["ok"] for vid, outcome in outcomes.items()}
+        if self.catalog:
+            self.catalog.remove([vid for vid, ok in results.items() if ok])
+        logger.info(f"Deleted {sum(results.values())}/{len(video_ids)} videos")
+        return results
+
+    def get_all_uploaded_videos(
+        self,
+        full_refresh: bool = False,
+        parts: Sequence[str] = ("status",),
+        concurrency: Optional[int] = None,
+    ) -> List[Dict[str, Any]]:
         """
         Retrieves all videos uploaded by the authenticated user.
         公開状態 (privacyStatus) も含めて返す。
+        RemoteCatalog があればミラーを差分更新してから返す (full_refresh で全件取り直し)。
+
+        parts に processingDetails や fileDetails などを指定すると、各動画の辞書に
+        その part を同名のキーで付与する。videos.list はページが届くたびに
+        50件ずつ並列 (最大 concurrency) で発行する。
         """
+        parts = tuple(parts)
+        fields = "items(id,status/privacyStatus)" if parts == ("status",) else None
         try:
-            service = build("youtube", "v3", credentials=self.credentials, cache_discovery=False)
+            service = get_service(self.credentials)
+
+            if self.catalog:
+                with VideoEnricher(self.credentials, ("status",), fields="items(id,status/privacyStatus)",
+                                   max_workers=concurrency) as enricher:
+                    self.catalog.refresh(service, full=full_refresh, enricher=enricher)
+                videos = self.catalog.videos()
+                extra_parts = tuple(p for p in parts if p != "status")
+                if extra_parts:
+                    with VideoEnricher(self.credentials, extra_parts, max_workers=concurrency) as enricher:
+                        enricher.add(v["id"] for v in videos)
+                        self._attach_parts(videos, enricher.results(), extra_parts)
+                logger.info(f"Found {len(videos)} uploaded videos (local mirror).")
+                return videos
             
             # 1. Get the "uploads" playlist ID from the channel resource
-            channels_response = service.channels().list(
-                mine=True,
-                part="contentDetails"
-            ).execute()
-            
-            channel_items = channels_response.get("items", [])
-            if not channel_items:
-                logger.error("No channel found for authenticated user.")
+            uploads_playlist_id = self._uploads_playlist_id(service)
+            if not uploads_playlist_id:
                 return []
-                
-            uploads_playlist_id = channel_items[0]["contentDetails"]["relatedPlaylists"]["uploads"]
             
-            # 2. Iterate through the uploads playlist
+            # 2. Iterate through the uploads playlist, starting videos.list
+            #    for each page of IDs while the next page is being fetched
             videos = []
             next_page_token = None
             
             logger.info("Fetching all uploaded videos...")
-            while True:
-                pl_request = service.playlistItems().list(
-                    playlistId=uploads_playlist_id,
-                    part="snippet,contentDetails",
-                    maxResults=50,
-                    pageToken=next_page_token
-                )
-                pl_response = pl_request.execute()
-                
-                for item in pl_response.get("items", []):
-                    videos.append({
-                        "id": item["contentDetails"]["videoId"],
-                        "title": item["snippet"]["title"]
-                    })
-                
-                next_page_token = pl_response.get("nextPageToken")
-                if not next_page_token:
-                    break
-            
-            # 3. Batch fetch privacy status (50件ずつ)
-            if videos:
-                video_ids = [v["id"] for v in videos]
-                privacy_map = {}
-                for i in range(0, len(video_ids), 50):
-                    batch_ids = video_ids[i:i + 50]
-                    vid_response = service.videos().list(
-                        id=",".join(batch_ids),
-                        part="status"
-                    ).execute()
-                    for item in vid_response.get("items", []):
-                        privacy_map[item["id"]] = item["status"]["privacyStatus"]
-                
-                for v in videos:
-                    v["privacy"] = privacy_map.get(v["id"], "unknown")
+            with VideoEnricher(self.credentials, parts, fields=fields, max_workers=concurrency) as enricher:
+                while True:
+                    page, next_page_token = self._fetch_upload_page(service, uploads_playlist_id, next_page_token)
+                    videos.extend(page)
+                    if parts:
+                        enricher.add(v["id"] for v in page)
+                    if not next_page_token:
+                        break
+
+                # 3. Wait for the in-flight videos.list calls
+                self._attach_parts(videos, enricher.results(), parts)
             
             logger.info(f"Found {len(videos)} uploaded videos.")
             return videos
@@ -213,3 +402,110 @@ class VideoManager:
         except HttpError as e:
             logger.error(f"Failed to fetch uploaded videos: {e}")
             return []
+
+    def iter_uploaded_videos(
+        self,
+        full_refresh: bool = False,
+        privacy: Optional[str] = None,
+        limit: Optional[int] = None,
+        concurrency: Optional[int] = None,
+    ) -> Iterator[Dict[str, Any]]:
+        """
+        Yields uploaded videos ({"id", "title", "privacy"}, newest first) as they arrive.
+        privacy で絞り込み、limit 件返した時点で打ち切る。
+
+        RemoteCatalog があり差分更新で済むなら、ミラーを更新して絞り込みと件数制限を SQL に渡して読み出す。
+        それ以外 (ミラーが無い・初回・full_refresh・全件更新の期限切れ) は uploads プレイリストを
+        1ページずつ読み、そのページの公開状態を取得している間に次のページを先読みする。
+        limit に達したらそれ以降のページは取得しない。ミラーは最後のページまで読めたときだけ置き換える。
+        """
+        if limit is not None and limit <= 0:
+            return
+        try:
+            service = get_service(self.credentials)
+
+            if self.catalog and not self.catalog.full_refresh_due(full_refresh):
+                with VideoEnricher(self.credentials, ("status",), fields="items(id,status/privacyStatus)",
+                                   max_workers=concurrency) as enricher:
+                    self.catalog.refresh(service, full=False, enricher=enricher)
+                yield from self.catalog.iter_videos(privacy=privacy, limit=limit)
+                return
+
+            uploads_playlist_id = self._uploads_playlist_id(service)
+            if not uploads_playlist_id:
+                return
+
+            count = 0
+            fetched: List[Dict[str, Any]] = []  # ミラーの置き換え用 (絞り込み前の全件)
+            with VideoEnricher(self.credentials, ("status",), fields="items(id,status/privacyStatus)",
+                               max_workers=concurrency) as enricher:
+                page, next_page_token = self._fetch_upload_page(service, uploads_playlist_id, None)
+                while page:
+                    enricher.add(v["id"] for v in page)
+
+                    # 公開状態の取得中に次のページを読む (このページで limit に届くなら読まない)
+                    next_page = []
+                    if next_page_token and not (limit and not privacy and count + len(page) >= limit):
+                        next_page, next_page_token = self._fetch_upload_page(
+                            service, uploads_playlist_id, next_page_token
+                        )
+
+                    self._attach_parts(page, enricher.results(), ("status",))
+                    if self.catalog:
+                        fetched.extend(dict(v) for v in page)
+                    for v in page:
+                        if privacy and v["privacy"] != privacy:
+                            continue
+                        yield v
+                        count += 1
+                        if limit and count >= limit:
+                            return
+                    page = next_page
+
+            if self.catalog:
+                self.catalog.replace(uploads_playlist_id, fetched)
+
+        except HttpError as e:
+            logger.error(f"Failed to fetch uploaded videos: {e}")
+
+    def _uploads_playlist_id(self, service) -> Optional[str]:
+        channels_response = service.channels().list(
+            mine=True,
+            part="contentDetails",
+            fields="items/contentDetails/relatedPlaylists/uploads",
+        ).execute()
+
+        channel_items = channels_response.get("items", [])
+        if not channel_items:
+            logger.error("No channel found for authenticated user.")
+            return None
+        return channel_items[0]["contentDetails"]["relatedPlaylists"]["uploads"]
+
+    @staticmethod
+    def _fetch_upload_page(
+        service, uploads_playlist_id: str, page_token: Optional[str]
+    ) -> Tuple[List[Dict[str, Any]], Optional[str]]:
+        """uploads プレイリストの1ページを [{"id", "title"}] と次ページのトークンで返す。"""
+        response = service.playlistItems().list(
+            playlistId=uploads_playlist_id,
+            part="snippet,contentDetails",
+            maxResults=50,
+            pageToken=page_token,
+            fields="nextPageToken,items(snippet/title,contentDetails/videoId)",
+        ).execute()
+        page = [
+            {"id": item["contentDetails"]["videoId"], "title": item["snippet"]["title"]}
+            for item in response.get("items", [])
+        ]
+        return page, response.get("nextPageToken")
+
+    @staticmethod
+    def _attach_parts(videos: List[Dict[str, Any]], resources: Dict[str, dict], parts: Sequence[str]):
+        """videos.list の結果を各動画の辞書へ付与する (status は privacy として)。"""
+        for v in videos:
+            resource = resources.get(v["id"], {})
+            for part in parts:
+                if part == "status":
+                    v["privacy"] = resource.get("status", {}).get("privacyStatus", "unknown")
+                else:
+                    v[part] = resource.get(part)
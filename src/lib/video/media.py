@@ -0,0 +1,86 @@
+import logging
+from concurrent.futures import Future, ThreadPoolExecutor
+from typing import Dict, Optional
+
+from googleapiclient.http import MediaFileUpload
+
+logger = logging.getLogger("youtube_up")
+
+
+class ReadAheadMediaFileUpload(MediaFileUpload):
+    """
+    MediaFileUpload that prefetches upcoming chunks in a background thread.
+
+    googleapiclient reads chunk N only after chunk N-1 has been acknowledged,
+    so the network sits idle during every disk read. This class serves chunks
+    through getbytes() and keeps up to `read_ahead` following chunks in flight
+    on a dedicated reader thread, bounding memory to
+    (read_ahead + 1) * chunksize per upload.
+    """
+
+    def __init__(
+        self,
+        filename: str,
+        chunksize: int,
+        read_ahead: int = 2,
+        mimetype: Optional[str] = None,
+    ):
+        super().__init__(filename, mimetype=mimetype, chunksize=chunksize, resumable=True)
+        self._read_ahead = max(0, read_ahead)
+        # Offset -> pending read. Only touched from getbytes(), which the
+        # upload loop calls sequentially.
+        self._pending: Dict[int, Future] = {}
+        # The reader thread owns its own handle so it never races the
+        # parent's file object.
+        self._reader = open(filename, "rb")
+        self._executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix="yt-readahead")
+
+    def has_stream(self) -> bool:
+        # Force next_chunk() through getbytes() so reads come from the buffer.
+        return False
+
+    def _read(self, begin: int, length: int) -> bytes:
+        self._reader.seek(begin)
+        return self._reader.read(length)
+
+    def _discard_pending(self):
+        for future in self._pending.values():
+            future.cancel()
+        self._pending.clear()
+
+    def getbytes(self, begin: int, length: int) -> bytes:
+        """
+        Returns `length` bytes starting at `begin`, then schedules the
+        following chunks so they are read while this one is being sent.
+        """
+        future = self._pending.pop(begin, None)
+        if future is None:
+            # Miss: either the first chunk or the server acknowledged a
+            # partial chunk and the offsets shifted. Start over from here.
+            self._discard_pending()
+            future = self._executor.submit(self._read, begin, length)
+
+        # Drop anything behind the current offset
+        for offset in [o for o in self._pending if o < begin]:
+            self._pending.pop(offset).cancel()
+
+        size = self.size()
+        for i in range(1, self._read_ahead + 1):
+            offset = begin + i * length
+            if offset >= size:
+                break
+            if offset not in self._pending:
+                self._pending[offset] = self._executor.submit(self._read, offset, length)
+
+        return future.result()
+
+    def close(self):
+        """Stops the reader thread and releases file handles."""
+        self._discard_pending()
+        self._executor.shutdown(wait=True)
+        if self._reader:
+            self._reader.close()
+            self._reader = None
+        if self._fd:
+            self._fd.close()
+            self._fd = None
@@ -1,20 +1,34 @@
 import logging
-from typing import Dict, List, Optional
+import threading
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from typing import Callable, Dict, List, Optional, Tuple
 
-from googleapiclient.discovery import build
 from googleapiclient.errors import HttpError
 
+from ..auth.service import get_service
+from ..core.config import config
+from ..data.playlist_index import PlaylistIndex
+from .batch import BatchExecutor
+
 logger = logging.getLogger("youtube_up")
 
 class PlaylistManager:
     """
     Manages YouTube Playlist interactions.
     """
-    def __init__(self, credentials):
+    def __init__(self, credentials, index: Optional[PlaylistIndex] = None):
         self.credentials = credentials
+        # 永続プレイリストインデックス (None ならプロセス内キャッシュのみ)
+        self.index = index
         # Cache playlist IDs to avoid redundant API calls: {title: playlist_id}
         self._playlist_cache: Dict[str, str] = {}
+        # 全プレイリスト {playlist_id: title} (同名のプレイリストも別々に保持する)
+        self._playlists: Dict[str, str] = {}
         self._initialized = False
+        # get_or_create_playlist は asyncio.to_thread 経由で複数スレッドから呼ばれるため、
+        # キャッシュ初期化とタイトルごとの作成を threading.Lock で直列化する
+        self._lock = threading.Lock()
+        self._title_locks: Dict[str, threading.Lock] = {}
 
     def _ensure_cache(self):
         """
@@ -24,21 +38,20 @@ class PlaylistManager:
         if self._initialized:
             return
 
+        with self._lock:
+            if not self._initialized:
+                self._load_cache()
+
+    def _load_cache(self):
+        # 永続インデックスが TTL 内ならAPIを呼ばずに使う
+        if self.index and self.index.is_fresh(config.api.playlist_cache_ttl):
+            self._set_playlists(self.index.playlists())
+            self._initialized = True
+            logger.debug(f"Loaded {len(self._playlist_cache)} playlists from local index.")
+            return
+
         try:
-            service = build("youtube", "v3", credentials=self.credentials, cache_discovery=False)
-            
-            request = service.playlists().list(
-                part="snippet,id",
-                mine=True,
-                maxResults=50  # Adjust pagination if user has many playlists
-            )
-            response = request.execute()
-            
-            # Todo: Handle pagination for >50 playlists
-            for item in response.get("items", []):
-                title = item["snippet"]["title"]
-                self._playlist_cache[title] = item["id"]
-            
+            self._refresh_cache()
             self._initialized = True
             logger.debug(f"Initialized playlist cache with {len(self._playlist_cache)} items.")
             
@@ -48,15 +61,106 @@ class PlaylistManager:
             # Or just proceed with empty cache and potentially fail duplicates?
             # Safe to assume empty for now.
 
+    def _refresh_cache(self):
+        """
+        Fetches every page of the channel's playlists.
+        With a persistent index, each page is requested with its previous
+        etag; pages answered with 304 Not Modified are reused from the index.
+        """
+        service = get_service(self.credentials)
+        cached_pages = self.index.pages() if self.index else []
+        cached_titles = self.index.playlists() if self.index else {}
+
+        playlists: Dict[str, str] = {}  # {playlist_id: title}
+        pages = []
+        page_token = None
+        while True:
+            cached = cached_pages[len(pages)] if len(pages) < len(cached_pages) else None
+            request = service.playlists().list(
+                part="snippet",
+                mine=True,
+                maxResults=50,
+                pageToken=page_token,
+                fields="etag,nextPageToken,items(id,snippet/title)",
+            )
+            if cached and cached["page_token"] == page_token and cached["etag"]:
+                request.headers["If-None-Match"] = cached["etag"]
+
+            try:
+                response = request.execute()
+            except HttpError as e:
+                if (
+                    e.resp.status != 304
+                    or cached is None
+                    or not all(pid in cached_titles for pid in cached["playlist_ids"])
+                ):
+                    raise
+                # ページに変更なし: 前回の内容を使う
+                playlists.update({pid: cached_titles[pid] for pid in cached["playlist_ids"]})
+                pages.append(cached)
+                page_token = cached["next_page_token"]
+            else:
+                items = response.get("items", [])
+                playlists.update({item["id"]: item["snippet"]["title"] for item in items})
+                pages.append({
+                    "page_token": page_token,
+                    "next_page_token": response.get("nextPageToken"),
+                    "etag": response.get("etag"),
+                    "playlist_ids": [item["id"] for item in items],
+                })
+                page_token = response.get("nextPageToken")
+
+            if not page_token:
+                break
+
+        self._set_playlists(playlists)
+        if self.index:
+            self.index.replace(pages, playlists)
+
+    def _set_playlists(self, playlists: Dict[str, str]):
+        """{playlist_id: title} からキャッシュを作り直す。"""
+        self._playlists = dict(playlists)
+        self._playlist_cache = {title: pid for pid, title in playlists.items()}
+
+    def _membership_known(self, playlist_id: str) -> bool:
+        """ローカルインデックスにこのプレイリストの中身が (TTL 内で) 揃っているか。"""
+        return bool(self.index) and self.index.items_loaded(playlist_id, config.api.playlist_cache_ttl)
+
+    def _record_items(self, playlist_id: str, items: List[dict]):
+        """playlistItems.list で取得した全アイテムをローカルインデックスへ保存する。"""
+        if not self.index:
+            return
+        self.index.replace_items(playlist_id, [
+            {
+                "video_id": item["contentDetails"]["videoId"],
+                "item_id": item["id"],
+                "position": item.get("snippet", {}).get("position", position),
+            }
+            for position, item in enumerate(items)
+        ])
+
+    def _title_lock(self, title: str) -> threading.Lock:
+        with self._lock:
+            return self._title_locks.setdefault(title, threading.Lock())
+
     def get_or_create_playlist(self, title: str, privacy_status: str = "private") -> Optional[str]:
         """
         Retrieves a playlist ID by title, or creates one if it doesn't exist.
+        Concurrent callers for the same title wait for a single in-flight
+        creation instead of each inserting a duplicate playlist.
         """
         self._ensure_cache()
         
         if title in self._playlist_cache:
             return self._playlist_cache[title]
-        
+
+        with self._title_lock(title):
+            # 待っている間に別スレッドが作成済みならそれを使う
+            if title in self._playlist_cache:
+                return self._playlist_cache[title]
+            return self._create_playlist(title, privacy_status)
+
+    def _create_playlist(self, title: str, privacy_status: str) -> Optional[str]:
         # Create new playlist
         logger.info(f"Creating new playlist: '{title}' ({privacy_status})")
         
@@ -71,8 +175,8 @@ class PlaylistManager:
         }
         
         try:
-            # Build fresh service for write operation
-            service = build("youtube", "v3", credentials=self.credentials, cache_discovery=False)
+            # Per-thread cached service (see ServicePool)
+            service = get_service(self.credentials)
             
             request = service.playlists().insert(
                 part="snippet,status",
@@ -82,6 +186,9 @@ class PlaylistManager:
             
             playlist_id = response["id"]
             self._playlist_cache[title] = playlist_id
+            self._playlists[playlist_id] = title
+            if self.index:
+                self.index.upsert(playlist_id, title)
             logger.info(f"Created playlist '{title}' -> {playlist_id}")
             return playlist_id
             
@@ -92,7 +199,12 @@ class PlaylistManager:
     def add_video_to_playlist(self, playlist_id: str, video_id: str) -> bool:
         """
         Adds a video to a specific playlist.
+        Skips the API call when the local index already has the video in the playlist.
         """
+        if self._membership_known(playlist_id) and self.index.find_item(playlist_id, video_id):
+            logger.info(f"Video {video_id} already in playlist {playlist_id} (local index)")
+            return True
+
         body = {
             "snippet": {
                 "playlistId": playlist_id,
@@ -104,13 +216,17 @@ class PlaylistManager:
         }
         
         try:
-            service = build("youtube", "v3", credentials=self.credentials, cache_discovery=False)
+            service = get_service(self.credentials)
 
             request = service.playlistItems().insert(
                 part="snippet",
                 body=body
             )
-            request.execute()
+            response = request.execute()
+            if self.index:
+                self.index.add_item(
+                    playlist_id, video_id, response["id"], response.get("snippet", {}).get("position")
+                )
             logger.info(f"Added video {video_id} to playlist {playlist_id}")
             return True
             
@@ -122,20 +238,81 @@ class PlaylistManager:
             logger.error(f"Failed to add video {video_id} to playlist {playlist_id}: {e}")
             return False
 
+    def add_videos_to_playlists(self, pairs: List[Tuple[str, str]]) -> Dict[Tuple[str, str], bool]:
+        """
+        Adds many (playlist_id, video_id) pairs with batched API calls.
+        Returns {(playlist_id, video_id): success}; videos already in the
+        playlist count as success.
+        """
+        results = {}
+        pending = []
+        for pair in pairs:
+            if self._membership_known(pair[0]) and self.index.find_item(*pair):
+                results[pair] = True
+            else:
+                pending.append(pair)
+        if len(pending) < len(pairs):
+            logger.info(f"Skipping {len(pairs) - len(pending)} videos already in playlists (local index)")
+
+        operations = [
+            ((playlist_id, video_id), lambda service, playlist_id=playlist_id, video_id=video_id:
+                service.playlistItems().insert(
+                    part="snippet",
+                    body={
+                        "snippet": {
+                            "playlistId": playlist_id,
+                            "resourceId": {"kind": "youtube#video", "videoId": video_id},
+                        }
+                    },
+                ))
+            for playlist_id, video_id in pending
+        ]
+        outcomes = BatchExecutor(self.credentials).execute(operations) if operations else {}
+
+        for key, outcome in outcomes.items():
+            if not outcome["ok"] and "videoAlreadyInPlaylist" in str(outcome["error"]):
+                logger.info(f"Video {key[1]} already in playlist {key[0]}")
+                results[key] = True
+            else:
+                results[key] = outcome["ok"]
+                if outcome["ok"] and self.index:
+                    response = outcome["response"]
+                    self.index.add_item(
+                        key[0], key[1], response["id"], response.get("snippet", {}).get("position")
+                    )
+        results = {pair: results[pair] for pair in pairs}
+        logger.info(f"Added {sum(results.values())}/{len(pairs)} videos to playlists")
+        return results
+
     def remove_video_from_playlist(self, playlist_id: str, video_id: str) -> bool:
         """
         Removes a video from a specific playlist.
-        Requires finding the playlistItemId first.
+        Requires finding the playlistItemId first (from the local index when
+        possible, otherwise with a playlistItems.list call).
         """
         try:
-            service = build("youtube", "v3", credentials=self.credentials, cache_discovery=False)
-            
+            service = get_service(self.credentials)
+
             # 1. Find the playlistItem ID for this video in this playlist
             # API doesn't let us delete by videoId directly, we need the item ID.
+            playlist_item_id = self.index.find_item(playlist_id, video_id) if self.index else None
+            if playlist_item_id:
+                try:
+                    service.playlistItems().delete(id=playlist_item_id).execute()
+                    self.index.remove_item(playlist_item_id)
+                    logger.info(f"Removed video {video_id} from playlist {playlist_id}")
+                    return True
+                except HttpError as e:
+                    if e.resp.status != 404:
+                        raise
+                    # ローカルインデックスが古い: API で探し直す
+                    self.index.remove_item(playlist_item_id)
+
             request = service.playlistItems().list(
                 part="id",
                 playlistId=playlist_id,
-                videoId=video_id
+                videoId=video_id,
+                fields="items/id",
             )
             response = request.execute()
             items = response.get("items", [])
@@ -150,6 +327,8 @@ class PlaylistManager:
             # 2. Delete the playlist item
             delete_request = service.playlistItems().delete(id=playlist_item_id)
             delete_request.execute()
+            if self.index:
+                self.index.remove_item(playlist_item_id)
             
             logger.info(f"Removed video {video_id} from playlist {playlist_id}")
             return True
@@ -174,21 +353,24 @@ class PlaylistManager:
 
         video_ids = []
         try:
-            service = build("youtube", "v3", credentials=self.credentials, cache_discovery=False)
+            service = get_service(self.credentials)
             
             request = service.playlistItems().list(
                 part="contentDetails",
                 playlistId=playlist_id,
-                maxResults=50
+                maxResults=50,
+                fields="nextPageToken,items(id,contentDetails/videoId)",
             )
             
+            items = []
             while request:
                 response = request.execute()
-                for item in response.get("items", []):
-                    video_ids.append(item["contentDetails"]["videoId"])
+                items.extend(response.get("items", []))
                 
                 request = service.playlistItems().list_next(request, response)
-                
+
+            video_ids = [item["contentDetails"]["videoId"] for item in items]
+            self._record_items(playlist_id, items)
             logger.info(f"Found {len(video_ids)} videos in playlist {playlist_name_or_id}")
             return video_ids
 
@@ -207,8 +389,8 @@ class PlaylistManager:
         if name_or_id in self._playlist_cache:
             return self._playlist_cache[name_or_id]
             
-        # 2. Check if it's a known ID (value in cache)
-        if name_or_id in self._playlist_cache.values():
+        # 2. Check if it's a known ID
+        if name_or_id in self._playlists or name_or_id in self._playlist_cache.values():
             return name_or_id
             
         # 3. If not found in cache, it might be an ID we haven't seen (unlikely if cache is full list),
@@ -232,12 +414,13 @@ class PlaylistManager:
                  return False
 
         try:
-            service = build("youtube", "v3", credentials=self.credentials, cache_discovery=False)
+            service = get_service(self.credentials)
             
             # 1. Get current snippet to preserve other fields
             request = service.playlists().list(
                 part="snippet",
-                id=playlist_id
+                id=playlist_id,
+                fields="items/snippet",
             )
             response = request.execute()
             items = response.get("items", [])
@@ -269,6 +452,9 @@ class PlaylistManager:
             for k in keys_to_remove:
                 del self._playlist_cache[k]
             self._playlist_cache[new_title] = playlist_id
+            self._playlists[playlist_id] = new_title
+            if self.index:
+                self.index.upsert(playlist_id, new_title)
             
             logger.info(f"Renamed playlist {playlist_id} to '{new_title}'")
             return True
@@ -283,7 +469,7 @@ class PlaylistManager:
         各プレイリストのタイトル、ID、動画数、公開設定を返す。
         """
         try:
-            service = build("youtube", "v3", credentials=self.credentials, cache_discovery=False)
+            service = get_service(self.credentials)
 
             playlists = []
             next_page_token = None
@@ -293,7 +479,8 @@ class PlaylistManager:
                     part="snippet,contentDetails,status",
                     mine=True,
                     maxResults=50,
-                    pageToken=next_page_token
+                    pageToken=next_page_token,
+                    fields="nextPageToken,items(id,snippet/title,contentDetails/itemCount,status/privacyStatus)",
                 )
                 response = request.execute()
 
@@ -328,9 +515,10 @@ class PlaylistManager:
             return []
 
         try:
-            service = build("youtube", "v3", credentials=self.credentials, cache_discovery=False)
+            service = get_service(self.credentials)
 
             items = []
+            raw_items = []
             next_page_token = None
 
             while True:
@@ -338,13 +526,16 @@ class PlaylistManager:
                     part="snippet,contentDetails",
                     playlistId=playlist_id,
                     maxResults=50,
-                    pageToken=next_page_token
+                    pageToken=next_page_token,
+                    fields="nextPageToken,items(id,snippet(title,position),contentDetails/videoId)",
                 )
                 response = request.execute()
 
                 for item in response.get("items", []):
+                    raw_items.append(item)
                     items.append({
                         "video_id": item["contentDetails"]["videoId"],
+                        "item_id": item["id"],
                         "title": item["snippet"]["title"],
                         "position": item["snippet"]["position"],
                     })
@@ -353,6 +544,8 @@ class PlaylistManager:
                 if not next_page_token:
                     break
 
+            self._record_items(playlist_id, raw_items)
+
             logger.info(f"Found {len(items)} items in playlist {playlist_name_or_id}.")
             return items
 
@@ -360,37 +553,160 @@ class PlaylistManager:
             logger.error(f"Failed to list playlist items for {playlist_name_or_id}: {e}")
             return []
 
-    def get_all_playlists_map(self) -> Dict[str, set[str]]:
+    def move_playlist_item(self, playlist_id: str, item_id: str, video_id: str, position: int) -> bool:
+        """
+        Moves one playlist item to `position` (playlistItems.update, 50 units).
+        The items in between shift by one, as with a remove + insert.
+        """
+        try:
+            service = get_service(self.credentials)
+            service.playlistItems().update(
+                part="snippet",
+                body={
+                    "id": item_id,
+                    "snippet": {
+                        "playlistId": playlist_id,
+                        "resourceId": {"kind": "youtube#video", "videoId": video_id},
+                        "position": position,
+                    },
+                },
+            ).execute()
+        except HttpError as e:
+            logger.error(f"Failed to move {video_id} to position {position} in playlist {playlist_id}: {e}")
+            return False
+
+        if self.index:
+            self.index.remove_item(item_id)
+            self.index.add_item(playlist_id, video_id, item_id, position)
+        return True
+
+    def apply_moves(self, playlist_id: str, items: List[Dict[str, str]], moves: List[Tuple[str, int]]) -> int:
+        """
+        Applies a move plan [(item_id, position)] in order (see playlist_sort.plan_moves).
+        Each move depends on the positions left by the previous ones, so the
+        calls are sequential and stop at the first failure.
+        Returns the number of moves applied.
+        """
+        video_ids = {item["item_id"]: item["video_id"] for item in items}
+        for done, (item_id, position) in enumerate(moves):
+            if not self.move_playlist_item(playlist_id, item_id, video_ids[item_id], position):
+                return done
+        logger.info(f"Applied {len(moves)} moves to playlist {playlist_id}")
+        return len(moves)
+
+    def _fetch_item_ids(self, playlist_id: str) -> List[dict]:
+        """Pages through one playlist, requesting only item IDs and video IDs."""
+        # Per-thread cached service (see ServicePool)
+        service = get_service(self.credentials)
+        items = []
+        request = service.playlistItems().list(
+            part="contentDetails",
+            playlistId=playlist_id,
+            maxResults=50,
+            fields="nextPageToken,items(id,contentDetails/videoId)",
+        )
+        while request:
+            response = request.execute()
+            items.extend(response.get("items", []))
+            request = service.playlistItems().list_next(request, response)
+        return items
+
+    def get_playlist_titles(self) -> Dict[str, str]:
+        """Returns {playlist_id: title} from the cache."""
+        self._ensure_cache()
+        return dict(self._playlists)
+
+    def find_duplicate_items(
+        self,
+        playlist_ids: Optional[List[str]] = None,
+        max_workers: Optional[int] = None,
+        progress_callback: Optional[Callable[[int, int], None]] = None,
+    ) -> Dict[str, Dict[str, List[str]]]:
+        """
+        Scans playlists (all of them by default) once and finds videos that appear more than once.
+        Returns {playlist_id: {video_id: [extra playlistItem IDs]}}; the first
+        occurrence of each video is kept. Playlists that fail to load are skipped.
+        """
+        if playlist_ids is None:
+            playlist_ids = list(self.get_playlist_titles())
+        duplicates = {}
+
+        with ThreadPoolExecutor(max_workers=max_workers or config.api.concurrency) as pool:
+            futures = {pool.submit(self._fetch_item_ids, pid): pid for pid in playlist_ids}
+            for done, future in enumerate(as_completed(futures), start=1):
+                playlist_id = futures[future]
+                try:
+                    items = future.result()
+                except HttpError as e:
+                    logger.error(f"Failed to scan playlist {playlist_id}: {e}")
+                    items = None
+
+                if items is not None:
+                    self._record_items(playlist_id, items)
+                    item_ids_by_video: Dict[str, List[str]] = {}
+                    for item in items:
+                        item_ids_by_video.setdefault(item["contentDetails"]["videoId"], []).append(item["id"])
+                    extras = {vid: ids[1:] for vid, ids in item_ids_by_video.items() if len(ids) > 1}
+                    if extras:
+                        duplicates[playlist_id] = extras
+                if progress_callback:
+                    progress_callback(done, len(playlist_ids))
+
+        logger.info(
+            f"Found {sum(len(ids) for extras in duplicates.values() for ids in extras.values())} "
+            f"duplicate items in {len(duplicates)}/{len(playlist_ids)} playlists"
+        )
+        return duplicates
+
+    def delete_playlist_items(self, item_ids: List[str], concurrency: Optional[int] = None) -> Dict[str, bool]:
+        """
+        Deletes playlist items by playlistItem ID with batched API calls.
+        Returns {item_id: success}; items that are already gone count as success.
+        """
+        operations = [
+            (item_id, lambda service, item_id=item_id: service.playlistItems().delete(id=item_id))
+            for item_id in item_ids
+        ]
+        outcomes = BatchExecutor(self.credentials, max_workers=concurrency).execute(operations) if operations else {}
+
+        results = {}
+        for item_id, outcome in outcomes.items():
+            error = outcome["error"]
+            gone = isinstance(error, HttpError) and error.resp.status == 404
+            results[item_id] = outcome["ok"] or gone
+            if results[item_id] and self.index:
+                self.index.remove_item(item_id)
+        logger.info(f"Deleted {sum(results.values())}/{len(item_ids)} playlist items")
+        return results
+
+    def get_all_playlists_map(
+        self,
+        max_workers: Optional[int] = None,
+        progress_callback: Optional[Callable[[int, int], None]] = None,
+    ) -> Dict[str, set[str]]:
         """
         Returns a map where key is Playlist ID and value is a Set of Video IDs in that playlist.
+        Playlists are fetched concurrently; progress_callback(done, total) is
+        called as each one completes.
         """
         self._ensure_cache()
+        playlist_ids = list(self._playlists)
         playlist_map = {}
         
         try:
-            service = build("youtube", "v3", credentials=self.credentials, cache_discovery=False)
-            
-            # Use cached playlist IDs to fetch items for each
-            for title, playlist_id in self._playlist_cache.items():
-                video_ids = set()
-                
-                request = service.playlistItems().list(
-                    part="contentDetails",
-                    playlistId=playlist_id,
-                    maxResults=50
-                )
-                
-                while request:
-                    response = request.execute()
-                    for item in response.get("items", []):
-                        video_ids.add(item["contentDetails"]["videoId"])
-                        
-                    request = service.playlistItems().list_next(request, response)
-                    
-                playlist_map[playlist_id] = video_ids
+            with ThreadPoolExecutor(max_workers=max_workers or config.api.concurrency) as pool:
+                futures = {pool.submit(self._fetch_item_ids, pid): pid for pid in playlist_ids}
+                for done, future in enumerate(as_completed(futures), start=1):
+                    playlist_id = futures[future]
+                    items = future.result()
+                    playlist_map[playlist_id] = {item["contentDetails"]["videoId"] for item in items}
+                    self._record_items(playlist_id, items)
+                    if progress_callback:
+                        progress_callback(done, len(playlist_ids))
                 
             return playlist_map
             
         except HttpError as e:
+            # 一部でも欠けると所属なし (orphan) と誤判定するため全体を失敗扱いにする
             logger.error(f"Failed to build playlist map: {e}")
             return {}
@@ -0,0 +1,73 @@
+from bisect import bisect_left
+from typing import Any, Dict, Hashable, List, Optional, Sequence, Set, Tuple
+
+
+def longest_increasing_subsequence(seq: Sequence[int]) -> List[int]:
+    """
+    Returns the indices of one longest strictly increasing subsequence of seq.
+    O(n log n) patience sorting.
+    """
+    tails: List[int] = []  # tails[k] = seq value ending the best run of length k+1
+    tail_idx: List[int] = []  # index in seq of that value
+    prev = [-1] * len(seq)
+
+    for i, value in enumerate(seq):
+        k = bisect_left(tails, value)
+        if k == len(tails):
+            tails.append(value)
+            tail_idx.append(i)
+        else:
+            tails[k] = value
+            tail_idx[k] = i
+        prev[i] = tail_idx[k - 1] if k else -1
+
+    result = []
+    i = tail_idx[-1] if tail_idx else -1
+    while i != -1:
+        result.append(i)
+        i = prev[i]
+    return result[::-1]
+
+
+def plan_moves(current: Sequence[Hashable], target: Sequence[Hashable]) -> List[Tuple[Hashable, int]]:
+    """
+    Computes the fewest single-item moves that turn `current` into `target`
+    (both are orderings of the same item IDs).
+
+    Items on a longest increasing subsequence (by target rank) stay put;
+    every other item is moved once, in target order, to just after its
+    target predecessor. Returns [(item_id, new_position)] to apply in order,
+    where each move has "remove then insert at position" semantics like
+    playlistItems.update with snippet.position.
+    """
+    rank = {item: i for i, item in enumerate(target)}
+    keep: Set[Hashable] = {
+        current[i] for i in longest_increasing_subsequence([rank[item] for item in current])
+    }
+
+    order = list(current)
+    moves = []
+    for i, item in enumerate(target):
+        if item in keep:
+            continue
+        order.remove(item)
+        position = order.index(target[i - 1]) + 1 if i else 0
+        order.insert(position, item)
+        moves.append((item, position))
+    return moves
+
+
+def target_order(
+    items: Sequence[Dict[str, Any]],
+    keys: Dict[str, Optional[Any]],
+    reverse: bool = False,
+) -> List[str]:
+    """
+    Returns the item IDs of `items` (in current playlist order) sorted by keys[item_id].
+    Items without a key keep their relative order and go to the end.
+    Ties keep the current order, so an already-sorted playlist needs no moves.
+    """
+    keyed = [item for item in items if keys.get(item["item_id"]) is not None]
+    unkeyed = [item for item in items if keys.get(item["item_id"]) is None]
+    keyed.sort(key=lambda item: keys[item["item_id"]], reverse=reverse)
+    return [item["item_id"] for item in keyed + unkeyed]
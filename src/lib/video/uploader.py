@@ -1,10 +1,10 @@
 import asyncio
 import logging
 import socket
+import time
 from pathlib import Path
 from typing import Any, Callable, Dict, Optional
 
-from googleapiclient.discovery import build
 from googleapiclient.errors import HttpError
 from googleapiclient.http import MediaFileUpload
 from tenacity import (
@@ -14,10 +14,19 @@ from tenacity import (
     wait_exponential,
 )
 
+from ..auth.service import service_pool
+from ..core.bandwidth import BandwidthLimiter
 from ..core.config import config
+from ..core.governor import HostGovernor
+from .media import ReadAheadMediaFileUpload
 
 logger = logging.getLogger("youtube_up")
 
+# Consecutive watchdog resets before the upload attempt is abandoned
+MAX_STALL_RESETS = 3
+# Seconds to wait for a reset request to unblock after its sockets are shut down
+STALL_RESET_GRACE = 30
+
 
 def should_retry_exception(exception: BaseException) -> bool:
     """Check if the exception is worth retrying."""
@@ -31,15 +40,49 @@ def should_retry_exception(exception: BaseException) -> bool:
     return False
 
 
+def _reset_connections(http) -> None:
+    """
+    Shuts down the sockets held by an httplib2 connection pool so that a
+    request blocked on a half-open connection raises instead of hanging.
+    """
+    # AuthorizedHttp wraps the underlying httplib2.Http in .http
+    inner = getattr(http, "http", http)
+    for conn in list(getattr(inner, "connections", {}).values()):
+        sock = getattr(conn, "sock", None)
+        if sock is None:
+            continue
+        try:
+            sock.shutdown(socket.SHUT_RDWR)
+        except OSError:
+            pass
+
+
+def _notify_retry(retry_state) -> None:
+    """tenacity before_sleep hook: reports retryable errors to the uploader's listener."""
+    uploader = retry_state.args[0] if retry_state.args else None
+    listener = getattr(uploader, "retry_listener", None)
+    if listener and retry_state.outcome is not None:
+        listener(retry_state.outcome.exception())
+
+
 class VideoUploader:
     def __init__(self, credentials):
         self.credentials = credentials
         # self.service is no longer stored here to ensure thread safety
+        # Optional callback invoked with each retryable exception before backing off
+        self.retry_listener: Optional[Callable[[BaseException], None]] = None
+        # Optional callback invoked with (seconds, bytes) for each acknowledged chunk
+        self.latency_listener: Optional[Callable[[float, int], None]] = None
+        # Optional shared BandwidthLimiter; each chunk acquires its size before sending
+        self.bandwidth_limiter: Optional[BandwidthLimiter] = None
+        # Optional HostGovernor enforcing the budget shared with other processes
+        self.host_governor: Optional[HostGovernor] = None
 
     @retry(
         wait=wait_exponential(multiplier=1, min=2, max=60),
         stop=stop_after_attempt(config.upload.retry_count),
         retry=retry_if_exception(should_retry_exception),
+        before_sleep=_notify_retry,
     )
     async def upload_video(
         self,
@@ -69,31 +112,103 @@ class VideoUploader:
             "recordingDetails": metadata.get("recordingDetails", {}),
         }
 
-        # Wrap MediaFileUpload to allow blocking IO in thread if needed,
-        # but here we initialize it directly as it just prepares the request.
-        media = MediaFileUpload(
-            str(file_path), chunksize=config.upload.chunk_size, resumable=True
-        )
-
-        # Build a fresh service instance for this thread
-        # This is critical for thread safety with httplib2
-        service = build("youtube", "v3", credentials=self.credentials, cache_discovery=False)
-
-        request = service.videos().insert(
-            part=",".join(body.keys()), body=body, media_body=media
-        )
+        # Read ahead upcoming chunks so disk I/O overlaps the network send.
+        # The reader must be closed even when leasing or videos().insert fails,
+        # so everything from its creation on runs inside the try/finally.
+        read_ahead = config.upload.read_ahead_chunks > 0
+        media = None
+        try:
+            if read_ahead:
+                media = ReadAheadMediaFileUpload(
+                    str(file_path),
+                    chunksize=config.upload.chunk_size,
+                    read_ahead=config.upload.read_ahead_chunks,
+                )
+            else:
+                media = MediaFileUpload(
+                    str(file_path), chunksize=config.upload.chunk_size, resumable=True
+                )
 
-        video_id = await self._execute_upload(request, file_path, progress_callback)
+            # Lease a service exclusively for this upload: next_chunk() hops between
+            # executor threads and httplib2 must not be shared concurrently.
+            with service_pool.lease(self.credentials) as service:
+                request = service.videos().insert(
+                    part=",".join(body.keys()), body=body, media_body=media
+                )
+                video_id = await self._execute_upload(request, file_path, progress_callback)
+        finally:
+            if read_ahead and media is not None:
+                media.close()
         return video_id
 
     async def _execute_upload(self, request, file_path, progress_callback):
         """
         Executes the upload in a loop to handle chunks and progress.
         Runs blocking next_chunk() in a separate thread to keep asyncio event loop responsive.
+        A watchdog resets the connection when no bytes are acknowledged within
+        config.upload.stall_timeout seconds, then resumes from the server offset.
+        Bandwidth is charged after each chunk with the bytes the server acknowledged
+        (the resumable_progress delta), not a full chunk_size per call.
+        The same delta and the chunk's round-trip time go to latency_listener;
+        chunks resumed after a stall are not reported.
         """
+        stall_timeout = config.upload.stall_timeout
+        throttled = bool(self.bandwidth_limiter or self.host_governor)
+        tracked = throttled or self.latency_listener is not None
+        acked_before = request.resumable_progress if tracked else 0
+        last_progress = time.monotonic()
+        stall_resets = 0
         response = None
         while response is None:
-            status, response = await asyncio.to_thread(request.next_chunk)
+            started = time.monotonic()
+            chunk = asyncio.ensure_future(asyncio.to_thread(request.next_chunk))
+            done, _ = await asyncio.wait({chunk}, timeout=stall_timeout or None)
+
+            if not done:
+                stall_resets += 1
+                stalled_for = time.monotonic() - last_progress
+                logger.warning(
+                    f"Upload stalled for {file_path.name}: no progress for "
+                    f"{stalled_for:.0f}s. Resetting connection "
+                    f"({stall_resets}/{MAX_STALL_RESETS})..."
+                )
+                _reset_connections(request.http)
+                done, _ = await asyncio.wait({chunk}, timeout=STALL_RESET_GRACE)
+                if not done or stall_resets >= MAX_STALL_RESETS:
+                    # Give up on this session so the worker slot is released
+                    # and the outer retry starts a fresh upload.
+                    raise socket.timeout(
+                        f"Upload stalled for {file_path.name} "
+                        f"({time.monotonic() - last_progress:.0f}s without progress)"
+                    )
+
+            try:
+                status, response = chunk.result()
+            except Exception as e:
+                if stall_resets == 0 or not should_retry_exception(e):
+                    raise
+                # Aborted by the watchdog. next_chunk() has flagged the request as
+                # in error, so the next call queries the session offset and resumes.
+                logger.info(f"Resuming {file_path.name} from last acknowledged offset...")
+                continue
+
+            recovered = bool(stall_resets)
+            if stall_resets:
+                logger.info(
+                    f"Upload of {file_path.name} recovered after stall of "
+                    f"{time.monotonic() - last_progress:.0f}s"
+                )
+                stall_resets = 0
+            last_progress = time.monotonic()
+
+            if tracked:
+                acked = request.resumable.size() if response is not None else status.resumable_progress
+                sent = acked - acked_before
+                acked_before = acked
+                if self.latency_listener and not recovered:
+                    self.latency_listener(last_progress - started, sent)
+                if throttled:
+                    await self._charge_bandwidth(sent)
 
             if status:
                 # progress = int(status.progress() * 100)
@@ -112,10 +227,20 @@ class VideoUploader:
             )
             return None
 
+    async def _charge_bandwidth(self, nbytes: int):
+        """Takes nbytes from the per-process limiter and the host-wide budget."""
+        if nbytes <= 0:
+            return
+        if self.bandwidth_limiter:
+            await self.bandwidth_limiter.acquire(nbytes)
+        if self.host_governor:
+            await self.host_governor.acquire_bandwidth(nbytes)
+
     @retry(
         wait=wait_exponential(multiplier=1, min=2, max=60),
         stop=stop_after_attempt(config.upload.retry_count),
         retry=retry_if_exception(should_retry_exception),
+        before_sleep=_notify_retry,
     )
     async def upload_thumbnail(self, video_id: str, thumbnail_path: Path) -> bool:
         """
@@ -123,15 +248,14 @@ class VideoUploader:
         """
         logger.info(f"Uploading thumbnail for {video_id} from {thumbnail_path.name}...")
         
-        service = build("youtube", "v3", credentials=self.credentials, cache_discovery=False)
-        
         try:
-            await asyncio.to_thread(
-                service.thumbnails().set(
-                    videoId=video_id,
-                    media_body=MediaFileUpload(str(thumbnail_path))
-                ).execute
-            )
+            with service_pool.lease(self.credentials) as service:
+                await asyncio.to_thread(
+                    service.thumbnails().set(
+                        videoId=video_id,
+                        media_body=MediaFileUpload(str(thumbnail_path))
+                    ).execute
+                )
             logger.info(f"Thumbnail uploaded successfully for {video_id}")
             return True
         except Exception as e:
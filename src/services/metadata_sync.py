@@ -0,0 +1,103 @@
+import logging
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+from typing import Any, Dict, Iterable, List, Optional
+
+from ..lib.data.history import HistoryManager
+from ..lib.video.manager import VideoManager
+from ..lib.video.metadata import FileMetadataGenerator
+from ..lib.video.scanner import scan_directory
+from .upload_manager import prepare_folder_map
+
+logger = logging.getLogger("youtube_up")
+
+# テンプレートから生成され、動画の snippet に反映されるフィールド
+TEMPLATE_FIELDS = ("title", "description", "tags")
+
+
+def _scan_folders(folders: Iterable[Path]) -> List[Path]:
+    """各フォルダを scan_directory で走査する。配下のフォルダは親の走査に含まれるので重複して走査しない。"""
+    scanned: List[Path] = []
+    video_files: List[Path] = []
+    for folder in sorted(set(folders)):
+        if any(folder.is_relative_to(parent) for parent in scanned):
+            continue
+        scanned.append(folder)
+        video_files.extend(scan_directory(str(folder)))
+    return video_files
+
+
+class MetadataSyncManager:
+    """
+    テンプレート (title_template / .yt-meta.yaml) の変更をアップロード済み動画へ反映する。
+
+    1. 履歴の success レコードごとに FileMetadataGenerator でメタデータを再生成 (並列)
+    2. 履歴に保存された metadata と比較し、変わったフィールドだけを抽出
+    3. VideoManager で現在の snippet を50件ずつ取得し、実際に値が変わる動画だけ更新
+    4. 反映できた動画の新しい metadata を履歴へ書き戻す
+    """
+
+    def __init__(
+        self,
+        video_manager: VideoManager,
+        history: HistoryManager,
+        metadata_gen: Optional[FileMetadataGenerator] = None,
+    ):
+        self.video_manager = video_manager
+        self.history = history
+        self.metadata_gen = metadata_gen or FileMetadataGenerator()
+
+    def render(self, workers: int = 4) -> Dict[str, Any]:
+        """
+        success レコードのメタデータを再生成し、保存済みの値と比較する。
+        Returns: {
+            "changes": {video_id: 変更フィールド},
+            "rendered": {video_id: (record, 新しい metadata)},
+            "missing_files": [ローカルファイルが無いレコード],
+        }
+        """
+        records = self.history.get_success_records()
+        available = [r for r in records if Path(r["file_path"]).exists()]
+        missing_files = [r for r in records if not Path(r["file_path"]).exists()]
+
+        # index/total はアップロード時と同じく、フォルダを走査した全動画のファイル名順で決める
+        # (アップロード失敗・未アップロードのファイルも番号に含まれる)
+        folder_map = prepare_folder_map(_scan_folders(Path(r["file_path"]).parent for r in available))
+
+        def generate(record):
+            file_path = Path(record["file_path"])
+            idx, tot = folder_map.get(file_path, (0, 0))
+            return record, self.metadata_gen.generate(file_path, idx, tot)
+
+        with ThreadPoolExecutor(max_workers=max(1, workers)) as pool:
+            results = list(pool.map(generate, available))
+
+        changes = {}
+        rendered = {}
+        for record, new_meta in results:
+            stored = record.get("metadata") or {}
+            changed = {
+                field: new_meta[field]
+                for field in TEMPLATE_FIELDS
+                if new_meta.get(field) != stored.get(field)
+            }
+            if changed:
+                changes[record["video_id"]] = changed
+                rendered[record["video_id"]] = (record, {**stored, **new_meta})
+
+        logger.info(
+            f"Re-rendered {len(available)} records: {len(changes)} changed, "
+            f"{len(missing_files)} missing local files"
+        )
+        return {"changes": changes, "rendered": rendered, "missing_files": missing_files}
+
+    def persist(self, rendered: Dict[str, Any], video_ids: List[str]) -> int:
+        """反映済み (または既に一致していた) 動画の metadata を履歴へ書き戻す。"""
+        metadata_by_hash = {
+            rendered[vid][0]["file_hash"]: rendered[vid][1]
+            for vid in video_ids
+            if vid in rendered
+        }
+        if not metadata_by_hash:
+            return 0
+        return self.history.update_metadata_bulk(metadata_by_hash)
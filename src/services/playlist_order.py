@@ -0,0 +1,68 @@
+import asyncio
+import logging
+from collections import defaultdict
+from pathlib import Path
+from typing import Awaitable, Callable, Dict, List, Optional
+
+logger = logging.getLogger("youtube_up")
+
+
+class PlaylistOrderBuffer:
+    """
+    並列アップロードでも、プレイリストへの追加順をファイル順 ({index}) に揃えるためのバッファ。
+
+    プレイリストごとに「次に追加すべきファイル」を管理し、先に完了した動画は
+    手前のファイルが確定するまで保留する。手前のファイルがスキップ・失敗した
+    場合も complete(video_id=None) で確定させることで、後続が詰まらないようにする。
+    追加処理はプレイリスト単位のロック内で順番に実行される。
+    """
+
+    def __init__(
+        self,
+        video_files: List[Path],
+        playlist_for: Callable[[Path], str],
+        insert: Callable[[str, str], Awaitable[None]],
+    ):
+        files_by_playlist: Dict[str, List[Path]] = defaultdict(list)
+        for f in video_files:
+            files_by_playlist[playlist_for(f)].append(f)
+
+        self._playlist_for = playlist_for
+        self._insert = insert  # insert(playlist, video_id)
+        # prepare_folder_map と同じく、フォルダ → ファイル名の順
+        self._position: Dict[Path, int] = {}
+        for files in files_by_playlist.values():
+            for i, f in enumerate(sorted(files, key=lambda x: (str(x.parent), x.name))):
+                self._position[f] = i
+
+        self._next: Dict[str, int] = defaultdict(int)
+        self._ready: Dict[str, Dict[int, Optional[str]]] = defaultdict(dict)
+        self._locks: Dict[str, asyncio.Lock] = defaultdict(asyncio.Lock)
+
+    async def complete(self, file_path: Path, video_id: Optional[str]):
+        """
+        ファイルの処理結果を確定させ、順番が来た動画をプレイリストへ追加する。
+        video_id が None (スキップ・失敗) の場合は順番だけ進める。
+        """
+        playlist = self._playlist_for(file_path)
+        position = self._position.get(file_path)
+        if position is None:
+            # 想定外のファイル: 順序付けせずそのまま追加
+            if video_id:
+                await self._insert(playlist, video_id)
+            return
+
+        async with self._locks[playlist]:
+            self._ready[playlist][position] = video_id
+            if video_id and position != self._next[playlist]:
+                logger.debug(
+                    f"Holding {video_id} for playlist '{playlist}' "
+                    f"(position {position}, waiting for {self._next[playlist]})"
+                )
+
+            ready = self._ready[playlist]
+            while self._next[playlist] in ready:
+                vid = ready.pop(self._next[playlist])
+                self._next[playlist] += 1
+                if vid:
+                    await self._insert(playlist, vid)
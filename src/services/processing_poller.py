@@ -0,0 +1,119 @@
+import logging
+import time
+from typing import Any, Callable, Dict, List, Optional
+
+from ..lib.core.config import config
+from ..lib.data.history import HistoryManager
+from ..lib.video.manager import VideoManager
+
+logger = logging.getLogger("youtube_up")
+
+PROCESSING_FIELDS = (
+    "items(id,status(uploadStatus,failureReason,rejectionReason),"
+    "processingDetails(processingStatus,processingFailureReason))"
+)
+
+# これ以上変化しない状態
+_FINAL_PROCESSING_STATUSES = {"succeeded", "failed", "terminated"}
+_FINAL_UPLOAD_STATUSES = {"processed", "failed", "rejected", "deleted"}
+_FAILED_STATUSES = {"failed", "terminated", "rejected", "deleted"}
+
+
+def processing_state(resource: Dict[str, Any]) -> Dict[str, Any]:
+    """videos.list (part=processingDetails,status) の結果を履歴に書き込む形にする。"""
+    status = resource.get("status", {})
+    details = resource.get("processingDetails", {})
+    upload_status = status.get("uploadStatus")
+    processing_status = details.get("processingStatus")
+    return {
+        "upload_status": upload_status,
+        "processing_status": processing_status,
+        "failure_reason": (
+            details.get("processingFailureReason")
+            or status.get("failureReason")
+            or status.get("rejectionReason")
+        ),
+        "done": processing_status in _FINAL_PROCESSING_STATUSES or upload_status in _FINAL_UPLOAD_STATUSES,
+    }
+
+
+# videos.list が正常に応答したのに返ってこなかった動画 (削除済み)
+DELETED_STATE = {"upload_status": "deleted", "processing_status": None, "failure_reason": None, "done": True}
+
+
+def is_failed(state: Dict[str, Any]) -> bool:
+    return state.get("upload_status") in _FAILED_STATUSES or state.get("processing_status") in _FAILED_STATUSES
+
+
+class ProcessingPoller:
+    """
+    アップロード直後の動画が YouTube 側で処理完了・失敗・拒否されたかを確認し、
+    結果を履歴 (processing_status テーブル) に書き込む。
+
+    確認は動画ごとではなく、未確定の動画をまとめて videos.list に50件ずつ渡す
+    (50本あたり1ユニット)。wait() は未確定の動画が無くなるかタイムアウトするまで、
+    間隔を倍々に延ばしながら (processing_poll_interval → processing_poll_max_interval)
+    確定していない動画だけを再確認する。
+    正常な応答に含まれなかった動画は削除済みとして確定させ、呼び出しが失敗した
+    チャンクの動画だけを未確定のまま残す。
+    """
+
+    def __init__(
+        self,
+        video_manager: VideoManager,
+        history: HistoryManager,
+        sleep: Callable[[float], None] = time.sleep,
+    ):
+        self.video_manager = video_manager
+        self.history = history
+        self._sleep = sleep
+
+    def poll(self, video_ids: List[str]) -> Dict[str, Dict[str, Any]]:
+        """1回分の確認。{video_id: state} を返し、履歴にも保存する。"""
+        if not video_ids:
+            return {}
+        videos, failed = self.video_manager.fetch_videos(
+            video_ids, part="processingDetails,status", fields=PROCESSING_FIELDS
+        )
+        failed_ids = set(failed)
+        states = {
+            vid: processing_state(videos[vid]) if vid in videos else dict(DELETED_STATE)
+            for vid in video_ids
+            if vid not in failed_ids
+        }
+        self.history.update_processing_states(states)
+        return states
+
+    def wait(
+        self,
+        video_ids: List[str],
+        timeout: Optional[float] = None,
+        on_poll: Optional[Callable[[Dict[str, Dict[str, Any]], int], None]] = None,
+    ) -> Dict[str, Dict[str, Any]]:
+        """
+        全動画の処理結果が確定するか timeout 秒経つまで確認を繰り返す。
+        on_poll(states, pending_count) は確認のたびに呼ばれる。
+        Returns: 最後に確認できた {video_id: state}。
+        """
+        timeout = config.upload.processing_poll_timeout if timeout is None else timeout
+        interval = config.upload.processing_poll_interval
+        deadline = time.monotonic() + timeout
+
+        states: Dict[str, Dict[str, Any]] = {}
+        pending = list(video_ids)
+        while pending:
+            states.update(self.poll(pending))
+            pending = [vid for vid in pending if not states.get(vid, {}).get("done")]
+            if on_poll:
+                on_poll(states, len(pending))
+
+            remaining = deadline - time.monotonic()
+            if not pending or remaining <= 0:
+                break
+            logger.debug(f"{len(pending)} videos still processing; next check in {interval}s")
+            self._sleep(min(interval, remaining))
+            interval = min(interval * 2, config.upload.processing_poll_max_interval)
+
+        if pending:
+            logger.info(f"Stopped waiting with {len(pending)} videos still processing")
+        return states
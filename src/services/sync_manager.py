@@ -1,17 +1,32 @@
 import logging
-from typing import Any, Dict, List, Tuple
+from collections import defaultdict
+from pathlib import Path
+from typing import Any, Dict, List, Optional, Tuple
 
 from googleapiclient.discovery import Resource
 from googleapiclient.errors import HttpError
 
 from ..lib.data.history import HistoryManager
+from ..lib.data.quota import MAX_IDS_PER_LIST
+from ..lib.data.remote_catalog import RemoteCatalog
+from ..lib.video.enrich import VideoEnricher
+from ..lib.video.scanner import calculate_hash, scan_directory
 
 logger = logging.getLogger("youtube_up")
 
 class SyncManager:
-    def __init__(self, service: Resource, history_manager: HistoryManager):
+    def __init__(
+        self,
+        service: Resource,
+        history_manager: HistoryManager,
+        catalog: Optional[RemoteCatalog] = None,
+        credentials=None,
+    ):
         self.service = service
         self.history = history_manager
+        self.catalog = catalog
+        # あればミラー更新時の公開状態の取得を VideoEnricher で並列化する
+        self.credentials = credentials
 
     def fetch_all_remote_videos(self) -> List[Dict[str, Any]]:
         """
@@ -22,7 +37,8 @@ class SyncManager:
             # 1. Get Uploads Playlist ID
             channels_response = self.service.channels().list(
                 mine=True,
-                part="contentDetails"
+                part="contentDetails",
+                fields="items/contentDetails/relatedPlaylists/uploads",
             ).execute()
 
             if not channels_response.get("items"):
@@ -40,7 +56,8 @@ class SyncManager:
                     playlistId=uploads_playlist_id,
                     part="snippet,contentDetails",
                     maxResults=50,
-                    pageToken=next_page_token
+                    pageToken=next_page_token,
+                    fields="nextPageToken,items(snippet/title,contentDetails/videoId)",
                 )
                 pl_response = pl_request.execute()
 
@@ -56,74 +73,173 @@ class SyncManager:
             logger.error(f"Failed to fetch remote videos: {e}")
             raise
 
-    def compare(self) -> Tuple[List[Dict], List[Dict], List[Dict]]:
+    def fetch_remote_titles(self, full_refresh: bool = False) -> Dict[str, str]:
+        """
+        Returns {video_id: title} for every uploaded video.
+        RemoteCatalog があればミラーを差分更新して使い、無ければ全件をページングで取得する。
+        """
+        if self.catalog:
+            if self.credentials:
+                with VideoEnricher(self.credentials, ("status",), fields="items(id,status/privacyStatus)") as enricher:
+                    self.catalog.refresh(self.service, full=full_refresh, enricher=enricher)
+            else:
+                self.catalog.refresh(self.service, full=full_refresh)
+            return {v["id"]: v["title"] for v in self.catalog.videos()}
+        return {v["contentDetails"]["videoId"]: v["snippet"]["title"] for v in self.fetch_all_remote_videos()}
+
+    def compare(self, full_refresh: bool = False) -> Tuple[List[Dict], List[Dict], List[Dict]]:
         """
         Compare local history with remote videos.
         Returns:
             (in_sync, missing_in_local, missing_in_remote)
             Each list contains dicts with video details.
         """
-        remote_videos = self.fetch_all_remote_videos()
-        # Map remote video_id -> video_object
-        remote_map = {v["contentDetails"]["videoId"]: v for v in remote_videos}
-        
-        local_records = self.history.get_all_records()
-        # Filter only successful uploads that have a video_id
-        local_map = {r["video_id"]: r for r in local_records if r.get("status") == "success" and r.get("video_id")}
-
-        remote_ids = set(remote_map.keys())
-        local_ids = set(local_map.keys())
-
-        # 1. In Sync (Both exist)
-        common_ids = remote_ids.intersection(local_ids)
+        # Map remote video_id -> title
+        remote_map = self.fetch_remote_titles(full_refresh)
+
+        # Stream (video_id, file_path) of successful uploads and split them
+        # into in-sync / local-only in one pass
         in_sync = []
-        for vid in common_ids:
-            in_sync.append({
-                "video_id": vid,
-                "remote_title": remote_map[vid]["snippet"]["title"],
-                "local_path": local_map[vid].get("file_path", "N/A"),
-                "status": "OK"
-            })
+        missing_in_remote = []
+        local_ids = set()
+        for vid, file_path in self.history.iter_success_video_paths():
+            if vid in local_ids:
+                continue
+            local_ids.add(vid)
+            if vid in remote_map:
+                # 1. In Sync (Both exist)
+                in_sync.append({
+                    "video_id": vid,
+                    "remote_title": remote_map[vid],
+                    "local_path": file_path or "N/A",
+                    "status": "OK"
+                })
+            else:
+                # 3. Missing in Remote (Exists in Local only)
+                missing_in_remote.append({
+                    "video_id": vid,
+                    "remote_title": "N/A",
+                    "local_path": file_path or "N/A",
+                    "status": "MISSING_REMOTE"
+                })
 
         # 2. Missing in Local (Exists in Remote only)
-        missing_local_ids = remote_ids - local_ids
-        missing_in_local = []
-        for vid in missing_local_ids:
-            missing_in_local.append({
+        missing_in_local = [
+            {
                 "video_id": vid,
-                "remote_title": remote_map[vid]["snippet"]["title"],
+                "remote_title": remote_map[vid],
                 "local_path": "N/A",
                 "status": "MISSING_LOCAL"
-            })
-
-        # 3. Missing in Remote (Exists in Local only)
-        missing_remote_ids = local_ids - remote_ids
-        missing_in_remote = []
-        for vid in missing_remote_ids:
-            missing_in_remote.append({
-                "video_id": vid,
-                "remote_title": "N/A",
-                "local_path": local_map[vid].get("file_path", "N/A"),
-                "status": "MISSING_REMOTE"
-            })
+            }
+            for vid in remote_map.keys() - local_ids
+        ]
 
         return in_sync, missing_in_local, missing_in_remote
 
     def fix_missing_remote(self, missing_remote_items: list) -> tuple:
         """
         ローカルにだけあるレコード（リモートで削除済み）を履歴から削除する。
-        Returns: (deleted_count, failed_count)
+        1トランザクションでまとめて削除する。
+        Returns: (deleted_count, failed_count) — いずれも video ID 単位
         """
-        deleted = 0
-        failed = 0
-
-        for item in missing_remote_items:
-            video_id = item["video_id"]
-            if self.history.delete_record_by_video_id(video_id):
-                logger.info(f"Deleted local record for {video_id}")
-                deleted += 1
-            else:
-                logger.warning(f"Failed to delete local record for {video_id}")
-                failed += 1
+        video_ids = [item["video_id"] for item in missing_remote_items]
+        if not video_ids:
+            return 0, 0
+
+        # 同じ video_id のレコードが複数あっても1件と数える
+        deleted_ids = self.history.delete_records_by_video_ids(video_ids)
+        failed = len(set(video_ids) - deleted_ids)
+        if failed:
+            logger.warning(f"Failed to delete {failed} local records")
+        return len(deleted_ids), failed
+
+    def fetch_file_details(self, video_ids: List[str]) -> Dict[str, Dict[str, Any]]:
+        """
+        videos.list(part=fileDetails) を50件ずつ呼び、
+        {video_id: {"fileName": 元のファイル名, "fileSize": バイト数}} を返す。
+        取得に失敗したチャンクの動画は結果に含めない (突き合わせでは unmatched になる)。
+        """
+        details = {}
+        for i in range(0, len(video_ids), MAX_IDS_PER_LIST):
+            chunk = video_ids[i:i + MAX_IDS_PER_LIST]
+            try:
+                response = self.service.videos().list(
+                    id=",".join(chunk),
+                    part="fileDetails",
+                    maxResults=MAX_IDS_PER_LIST,
+                    fields="items(id,fileDetails(fileName,fileSize))",
+                ).execute()
+            except HttpError as e:
+                logger.error(f"Failed to fetch file details for {len(chunk)} videos: {e}")
+                continue
+            for item in response.get("items", []):
+                file_details = item.get("fileDetails", {})
+                details[item["id"]] = {
+                    "fileName": file_details.get("fileName"),
+                    "fileSize": int(file_details["fileSize"]) if file_details.get("fileSize") else None,
+                }
+        return details
+
+    def reconcile_missing_local(self, missing_in_local: List[Dict], directory: str) -> Tuple[List[Dict], List[Dict]]:
+        """
+        リモートにだけある動画を、元ファイルの情報 (fileDetails) でローカルファイルと突き合わせる。
 
-        return deleted, failed
+        1. 履歴に無いローカル動画をサイズ → パスの索引にする (stat のみ)
+        2. 同じサイズの候補を元ファイル名で絞り込む (fileName が取れない動画だけサイズ一致で採用)
+        3. 採用した候補だけハッシュを計算し、既に別の動画として記録済みでないか確認する
+        Returns: (matches, unmatched)
+            matches は {"video_id", "remote_title", "remote_file_name", "file_path", "file_hash", "file_size"}。
+        """
+        by_size: Dict[int, List[Path]] = defaultdict(list)
+        for path in scan_directory(directory):
+            if not self.history.is_uploaded_by_path(str(path)):
+                by_size[path.stat().st_size].append(path)
+
+        details = self.fetch_file_details([item["video_id"] for item in missing_in_local])
+
+        matches = []
+        unmatched = []
+        claimed = set()
+        for item in missing_in_local:
+            info = details.get(item["video_id"], {})
+            candidates = [p for p in by_size.get(info.get("fileSize"), []) if p not in claimed]
+            if info.get("fileName"):
+                candidates = [p for p in candidates if p.name == info["fileName"]]
+            if len(candidates) != 1:
+                unmatched.append(item)
+                continue
+
+            path = candidates[0]
+            file_hash = calculate_hash(path)
+            if not file_hash or self.history.is_uploaded(file_hash):
+                unmatched.append(item)
+                continue
+
+            claimed.add(path)
+            matches.append({
+                "video_id": item["video_id"],
+                "remote_title": item["remote_title"],
+                "remote_file_name": info.get("fileName"),
+                "file_path": str(path),
+                "file_hash": file_hash,
+                "file_size": info["fileSize"],
+            })
+
+        logger.info(f"Reconciled {len(matches)}/{len(missing_in_local)} remote-only videos to local files")
+        return matches, unmatched
+
+    def apply_reconciled(self, matches: List[Dict]) -> int:
+        """
+        突き合わせ結果を success レコードとして履歴へ書き込む。
+        reconciled として記録し、今日のアップロード件数や処理状況の確認には含めない。
+        """
+        for match in matches:
+            self.history.add_record(
+                file_path=match["file_path"],
+                file_hash=match["file_hash"],
+                video_id=match["video_id"],
+                metadata={"title": match["remote_title"]},
+                file_size=match["file_size"],
+                reconciled=True,
+            )
+        return len(matches)
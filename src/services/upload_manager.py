@@ -1,7 +1,8 @@
 import asyncio
 import logging
+import time
 from collections import defaultdict
-from datetime import datetime
+from contextlib import nullcontext
 from pathlib import Path
 from typing import Any, Dict, List, Optional, Tuple
 
@@ -17,45 +18,43 @@ from rich.progress import (
     TimeRemainingColumn,
 )
 
+from ..lib.auth.service import service_pool
+from ..lib.core.bandwidth import BandwidthLimiter
+from ..lib.core.concurrency import AdaptiveConcurrencyController
 from ..lib.core.config import config
+from ..lib.core.governor import HostGovernor
 from ..lib.data.history import HistoryManager
+from ..lib.data.playlist_index import PlaylistIndex
+from ..lib.data.quota import COST_VIDEO_UPLOAD, estimate_used_units_today
+from ..lib.data.remote_catalog import RemoteCatalog
+from ..lib.video.manager import VideoManager
 from ..lib.video.metadata import FileMetadataGenerator
 from ..lib.video.playlist import PlaylistManager
 from ..lib.video.scanner import calculate_hash, scan_directory
 from ..lib.video.uploader import VideoUploader
+from .playlist_order import PlaylistOrderBuffer
+from .processing_poller import ProcessingPoller, is_failed
 
 logger = logging.getLogger("youtube_up")
 console = Console()
 
-def check_quota_limit(
-    dry_run: bool,
-    video_files: List[Path],
-    history: HistoryManager,
-) -> bool:
+def check_quota_limit(dry_run: bool, video_files: List[Path]) -> bool:
     """
     Check if there is enough quota to upload videos today.
+    使用量は quota ledger に記録された本日の全 API 呼び出しから求める。
     Returns True if we can proceed, False if we should stop.
     """
     if dry_run:
         return True
 
-    COST_PER_UPLOAD = 1600
     quota_limit = config.upload.daily_quota_limit
-    now = datetime.now()
-    today_start = datetime(now.year, now.month, now.day).timestamp()
-
-    all_records = history.get_all_records(limit=0)
-    today_uploads = [
-        r for r in all_records
-        if r.get("status") == "success" and r.get("timestamp", 0) >= today_start
-    ]
-    used_units = len(today_uploads) * COST_PER_UPLOAD
+    used_units = estimate_used_units_today()
     remaining_units = max(0, quota_limit - used_units)
-    max_uploadable = remaining_units // COST_PER_UPLOAD
+    max_uploadable = remaining_units // COST_VIDEO_UPLOAD
 
-    if remaining_units < COST_PER_UPLOAD:
+    if remaining_units < COST_VIDEO_UPLOAD:
         console.print(
-            f"[bold red]Quota不足: 本日の推定使用量 {used_units:,}/{quota_limit:,} ユニット。"
+            f"[bold red]Quota不足: 本日の使用量 {used_units:,}/{quota_limit:,} ユニット。"
             f" 残り {remaining_units:,} ユニットでは1件もアップロードできません。[/]"
         )
         console.print("[dim]明日以降に再実行するか、settings.yaml の daily_quota_limit を調整してください。[/]")
@@ -69,7 +68,7 @@ def check_quota_limit(
     else:
         console.print(
             f"[dim]Quota残量: {remaining_units:,}/{quota_limit:,} ユニット "
-            f"(本日 {len(today_uploads)} 件アップロード済み)[/]"
+            f"(本日 {used_units:,} ユニット使用済み)[/]"
         )
     return True
 
@@ -101,6 +100,28 @@ async def check_duplicate(
         
     return file_hash, file_size
 
+async def add_to_playlist(
+    playlist_manager: PlaylistManager,
+    target_playlist: str,
+    video_id: str,
+    progress,
+):
+    """Add an uploaded video to its playlist (created on demand). Failures are only reported."""
+    try:
+        pl_id = await asyncio.to_thread(
+            playlist_manager.get_or_create_playlist, 
+            target_playlist, 
+            config.upload.privacy_status
+        )
+        if pl_id:
+            await asyncio.to_thread(
+                playlist_manager.add_video_to_playlist, pl_id, video_id
+            )
+            progress.console.print(f"[dim]Added to playlist: {target_playlist}[/]")
+    except Exception as e:
+        logger.error(f"Failed to add to playlist {target_playlist}: {e}")
+        progress.console.print(f"[red]Warning: Failed to add to playlist: {e}[/]")
+
 async def post_upload_sync(
     file_path: Path,
     file_hash: str,
@@ -111,7 +132,8 @@ async def post_upload_sync(
     playlist_manager: Optional[PlaylistManager],
     uploader: VideoUploader,
     history: HistoryManager,
-    progress
+    progress,
+    catalog: Optional[RemoteCatalog] = None,
 ):
     """
     Handle post-upload actions (history logging, playlist adding, thumbnail upload).
@@ -120,23 +142,19 @@ async def post_upload_sync(
         str(file_path), file_hash, video_id, metadata, playlist_name=target_playlist, file_size=file_size
     )
     progress.console.print(f"[bold green]Uploaded {file_path.name} -> {video_id}[/]")
-    
-    # プレイリストへの追加
-    if playlist_manager:
+
+    # アップロード済み動画のミラーにもその場で反映する (TTL 内の sync で未登録扱いにしない)
+    if catalog:
         try:
-            pl_id = await asyncio.to_thread(
-                playlist_manager.get_or_create_playlist, 
-                target_playlist, 
-                config.upload.privacy_status
+            catalog.add(
+                video_id, metadata.get("title"), metadata.get("privacy_status", config.upload.privacy_status)
             )
-            if pl_id:
-                await asyncio.to_thread(
-                    playlist_manager.add_video_to_playlist, pl_id, video_id
-                )
-                progress.console.print(f"[dim]Added to playlist: {target_playlist}[/]")
         except Exception as e:
-            logger.error(f"Failed to add to playlist {target_playlist}: {e}")
-            progress.console.print(f"[red]Warning: Failed to add to playlist: {e}[/]")
+            logger.warning(f"Failed to add {video_id} to the remote catalog: {e}")
+    
+    # プレイリストへの追加 (順序を揃える場合は呼び出し側の PlaylistOrderBuffer が行う)
+    if playlist_manager:
+        await add_to_playlist(playlist_manager, target_playlist, video_id, progress)
             
     # サムネイルのアップロード
     thumbnail_path = None
@@ -237,19 +255,27 @@ async def process_video_files(
     force: bool = False,
     simple_check: bool = False,
     privacy_status: str = None,
+    min_workers: Optional[int] = None,
+    max_workers: Optional[int] = None,
 ) -> bool:
     """
     Process a list of video files: Deduplicate, Metadata, Upload.
+    Concurrency starts at `workers` and adapts between min_workers and max_workers.
     """
     if not video_files:
         console.print("[yellow]No files to process.[/]")
         return False
 
-    if not check_quota_limit(dry_run, video_files, history):
+    if not check_quota_limit(dry_run, video_files):
         return False
 
     folder_map = prepare_folder_map(video_files)
-    playlist_manager = PlaylistManager(uploader.credentials) if uploader and not dry_run else None
+    playlist_manager = (
+        PlaylistManager(uploader.credentials, index=PlaylistIndex(history.db_path))
+        if uploader and not dry_run else None
+    )
+    catalog = RemoteCatalog(history.db_path) if uploader and not dry_run else None
+    governor = HostGovernor(config.governor) if config.governor.enabled and not dry_run else None
 
     # Setup Progress Dashboard
     with Progress(
@@ -261,23 +287,52 @@ async def process_video_files(
         console=console,
     ) as progress:
         overall_task = progress.add_task("[bold green]Overall Progress", total=len(video_files))
-        sem = asyncio.Semaphore(workers)
+        sem = AdaptiveConcurrencyController(
+            workers,
+            min_limit=min_workers or config.upload.min_workers,
+            max_limit=max_workers or workers,
+        )
+        if uploader:
+            uploader.retry_listener = sem.record_error
+            uploader.latency_listener = sem.record_latency
+            uploader.bandwidth_limiter = BandwidthLimiter(config.bandwidth)
+            uploader.host_governor = governor
         stop_event = asyncio.Event()
 
+        # 並列に完了した動画も、プレイリストにはファイル順で追加する
+        order_buffer = None
+        if playlist_manager:
+            order_buffer = PlaylistOrderBuffer(
+                video_files,
+                playlist_for=lambda f: playlist_name or f.parent.name,
+                insert=lambda pl, vid: add_to_playlist(playlist_manager, pl, vid, progress),
+            )
+
         async def process_file(file_path: Path):
+            video_id = None
+            try:
+                video_id = await upload_file(file_path)
+            finally:
+                # スキップ・失敗したファイルも順番を確定させ、後続の追加を進める
+                if order_buffer:
+                    await order_buffer.complete(file_path, video_id)
+
+        async def upload_file(file_path: Path) -> Optional[str]:
+            """Processes one file. Returns the new video ID on a successful upload."""
             if stop_event.is_set():
                 progress.advance(overall_task)
-                return
+                return None
 
             async with sem:
                 if stop_event.is_set():
                     progress.advance(overall_task)
-                    return
+                    return None
 
                 task_id = progress.add_task(f"Processing {file_path.name}", total=None)
                 file_hash = "unknown"
                 file_size = None
                 target_playlist = playlist_name or file_path.parent.name
+                uploaded_id = None
 
                 try:
                     # Deduplication
@@ -288,7 +343,7 @@ async def process_video_files(
                         # It is a duplicate
                         progress.update(task_id, visible=False)
                         progress.advance(overall_task)
-                        return
+                        return None
 
                     # Metadata
                     idx, tot = folder_map.get(file_path, (0, 0))
@@ -300,7 +355,7 @@ async def process_video_files(
                         preview_metadata(file_path, metadata, target_playlist, progress)
                         progress.update(task_id, visible=False)
                         progress.advance(overall_task)
-                        return
+                        return None
 
                     # Upload
                     progress.update(task_id, description=f"[red]Uploading {file_path.name}...", total=file_size)
@@ -308,12 +363,16 @@ async def process_video_files(
                     def update_prog(p, total):
                         progress.update(task_id, completed=p)
 
-                    video_id = await uploader.upload_video(file_path, metadata, progress_callback=update_prog)
+                    async with governor.slot() if governor else nullcontext():
+                        video_id = await uploader.upload_video(file_path, metadata, progress_callback=update_prog)
 
                     if video_id:
+                        uploaded_id = video_id
+                        sem.record_success(file_size or 0)
                         await post_upload_sync(
                             file_path, file_hash, file_size, video_id, metadata, 
-                            target_playlist, playlist_manager, uploader, history, progress
+                            target_playlist, None if order_buffer else playlist_manager,
+                            uploader, history, progress, catalog=catalog,
                         )
 
                 except Exception as e:
@@ -324,11 +383,14 @@ async def process_video_files(
                 finally:
                     progress.update(task_id, visible=False)
                     progress.advance(overall_task)
+                return uploaded_id
 
         # Execute
         tasks = [process_file(f) for f in video_files]
         await asyncio.gather(*tasks)
-        
+
+        stats = service_pool.stats()
+        logger.debug(f"API services built: {stats['builds']}, reused: {stats['reuses']}")
         return stop_event.is_set()
 
 
@@ -342,9 +404,13 @@ async def orchestrate_upload(
     playlist: str = None,
     simple_check: bool = False,
     privacy_status: str = None,
+    min_workers: Optional[int] = None,
+    max_workers: Optional[int] = None,
+    wait_processing: bool = False,
 ):
     """
     Core async logic for processing video files.
+    wait_processing=True なら、最後にこのランでアップロードした動画の処理完了を待つ。
     """
     console.print(f"[bold]Scanning {directory}...[/]")
     video_files = list(scan_directory(directory))
@@ -353,6 +419,37 @@ async def orchestrate_upload(
     if not video_files:
         return
 
+    started_at = time.time()
     await process_video_files(
-        video_files, uploader, history, metadata_gen, dry_run, workers, playlist, simple_check=simple_check, privacy_status=privacy_status
+        video_files, uploader, history, metadata_gen, dry_run, workers, playlist, simple_check=simple_check, privacy_status=privacy_status,
+        min_workers=min_workers, max_workers=max_workers,
+    )
+
+    if wait_processing and uploader and not dry_run:
+        # アップロードは全て終わっているので、ここでイベントループを塞いでも問題ない
+        wait_for_processing(uploader.credentials, history, since=started_at)
+
+
+def wait_for_processing(credentials, history: HistoryManager, since: float):
+    """since 以降にアップロードした動画の処理結果を確定するまで確認し、結果を表示する。"""
+    video_ids = history.get_unprocessed_video_ids(since=since)
+    if not video_ids:
+        return
+
+    console.print(f"[bold]Waiting for YouTube to process {len(video_ids)} videos...[/]")
+    poller = ProcessingPoller(VideoManager(credentials), history)
+    states = poller.wait(
+        video_ids,
+        on_poll=lambda _, pending: console.print(f"[dim]  {pending} still processing[/]") if pending else None,
+    )
+
+    failed = {vid: s for vid, s in states.items() if is_failed(s)}
+    pending = [vid for vid in video_ids if not states.get(vid, {}).get("done")]
+    succeeded = len(video_ids) - len(failed) - len(pending)
+    console.print(
+        f"[bold]Processing:[/] [green]{succeeded} done[/], [red]{len(failed)} failed[/], "
+        f"[yellow]{len(pending)} still processing[/]"
     )
+    for vid, state in failed.items():
+        reason = state.get("failure_reason") or state.get("processing_status") or state.get("upload_status")
+        console.print(f"  [red]✖ {vid}: {reason}[/]")
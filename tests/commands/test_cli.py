@@ -33,7 +33,8 @@ def mock_dependencies():
          \
          patch("src.services.upload_manager.calculate_hash", return_value="dummy_hash") as m_hash_manager, \
          patch("src.commands.reupload.calculate_hash", return_value="dummy_hash") as m_hash_reupload, \
-         patch("src.services.upload_manager.scan_directory") as mock_scan:
+         patch("src.services.upload_manager.scan_directory") as mock_scan, \
+         patch("src.services.upload_manager.RemoteCatalog"):
 
         # Setup shared mock objects
         mock_auth_obj = MagicMock()
@@ -213,6 +214,7 @@ def test_auth_status_command():
         assert result.exit_code == 0
         assert "Active Profile: default" in result.stdout
         assert "Connected to channel: My Channel" in result.stdout
+        assert mock_service.return_value.channels().list.call_args.kwargs["fields"] == "items/snippet(title,customUrl)"
 
 
 def test_auth_login_command():
@@ -358,3 +360,37 @@ def test_upload_auth_error(mock_dependencies):
     result = runner.invoke(app, ["upload", "/tmp/videos"])
     assert result.exit_code == 1
     assert "Auth Failed" in result.stdout
+
+
+def test_quota_command_reads_ledger(isolated_quota_ledger):
+    isolated_quota_ledger.record("youtube.videos.insert", 1600)
+    isolated_quota_ledger.record("youtube.playlistItems.insert", 50)
+    isolated_quota_ledger.record("youtube.videos.list", 1)
+
+    with patch("src.commands.quota.HistoryManager") as mock_hist_cls:
+        mock_hist_cls.return_value.get_upload_stats.return_value = (1, 2048)
+        result = runner.invoke(app, ["quota", "--limit", "10000"])
+
+    assert result.exit_code == 0
+    assert "1,651" in result.stdout
+    assert "8,349" in result.stdout
+    assert "playlistItems.insert" in result.stdout
+    mock_hist_cls.return_value.get_all_records.assert_not_called()
+    mock_hist_cls.return_value.close.assert_called_once()
+
+
+def test_upload_stops_when_ledger_shows_quota_used(mock_dependencies, isolated_quota_ledger):
+    path1 = MagicMock()
+    path1.__str__.return_value = "/tmp/videos/v1.mp4"
+    path1.name = "v1.mp4"
+    path1.parent = Path("/tmp/videos")
+    mock_dependencies["scan"].return_value = [path1]
+    # アップロード以外の呼び出しでも残量が減る
+    for _ in range(170):
+        isolated_quota_ledger.record("youtube.playlistItems.insert", 50)
+
+    with patch("src.services.upload_manager.config.upload.daily_quota_limit", 10000):
+        result = runner.invoke(app, ["upload", "/tmp/videos"])
+
+    assert "Quota不足" in result.stdout
+    mock_dependencies["uploader"].upload_video.assert_not_called()
@@ -247,7 +247,7 @@ class TestPlaylistCommand(unittest.TestCase):
         mock_pl = MockPlManager.return_value
         mock_pl.get_all_playlists_map.return_value = {}
         mock_pl.get_or_create_playlist.return_value = "PLC"
-        mock_pl.add_video_to_playlist.return_value = True
+        mock_pl.add_videos_to_playlists.return_value = {("PLC", "VID1"): True}
 
         mock_hist = MockHistoryMgr.return_value
         mock_hist.get_record_by_video_id.return_value = {"playlist_name": "HistoryPlaylist"}
@@ -259,7 +259,7 @@ class TestPlaylistCommand(unittest.TestCase):
         self.assertIn("Assigned Video 1 -> HistoryPlaylist", result.output)
         
         mock_pl.get_or_create_playlist.assert_called_once_with("HistoryPlaylist")
-        mock_pl.add_video_to_playlist.assert_called_once_with("PLC", "VID1")
+        mock_pl.add_videos_to_playlists.assert_called_once_with([("PLC", "VID1")])
 
     @patch("src.commands.playlist.get_credentials")
     @patch("src.commands.playlist.PlaylistManager")
@@ -299,7 +299,7 @@ class TestPlaylistCommand(unittest.TestCase):
         mock_pl = MockPlManager.return_value
         mock_pl.get_all_playlists_map.return_value = {}
         mock_pl.get_or_create_playlist.return_value = "PL_DIR"
-        mock_pl.add_video_to_playlist.return_value = True
+        mock_pl.add_videos_to_playlists.return_value = {("PL_DIR", "VID2"): True}
 
         mock_hist = MockHistoryMgr.return_value
         # No playlist_name, but has file_path
@@ -358,7 +358,7 @@ class TestPlaylistCommand(unittest.TestCase):
         mock_pl.get_all_playlists_map.return_value = {}
         mock_pl.get_or_create_playlist.return_value = "PL1"
         # simulate failure to add
-        mock_pl.add_video_to_playlist.return_value = False
+        mock_pl.add_videos_to_playlists.return_value = {("PL1", "VID1"): False}
 
         mock_hist = MockHistoryMgr.return_value
         mock_hist.get_record_by_video_id.return_value = {"playlist_name": "MyList"}
@@ -390,5 +390,143 @@ class TestPlaylistCommand(unittest.TestCase):
         self.assertEqual(result.exit_code, 0)
         self.assertIn("Failed to get/create playlist MyList for Vid 1", result.output)
 
+    def _sort_items(self):
+        return [
+            {"video_id": "v1", "item_id": "i1", "title": "C", "position": 0},
+            {"video_id": "v2", "item_id": "i2", "title": "A", "position": 1},
+            {"video_id": "v3", "item_id": "i3", "title": "B", "position": 2},
+        ]
+
+    @patch("src.commands.common.estimate_remaining_units", return_value=10000)
+    @patch("src.commands.playlist.HistoryManager")
+    @patch("src.commands.playlist.get_credentials")
+    @patch("src.commands.playlist.PlaylistManager")
+    def test_sort_by_title_applies_minimal_moves(self, MockPlManager, mock_get_credentials, _hist, _remaining):
+        mock_get_credentials.return_value = MagicMock()
+        mock_pl = MockPlManager.return_value
+        mock_pl.find_playlist_id.return_value = "PL1"
+        mock_pl.list_playlist_items.return_value = self._sort_items()
+        mock_pl.apply_moves.return_value = 1
+
+        result = runner.invoke(app, ["playlist", "sort", "MyList", "--by", "title", "-y"])
+
+        self.assertEqual(result.exit_code, 0, result.output)
+        self.assertIn("1 moves for 3 videos (~50 units", result.output)
+        # A, B はそのまま、C を末尾へ移動するだけ
+        self.assertEqual(mock_pl.apply_moves.call_args[0][2], [("i1", 2)])
+
+    @patch("src.commands.playlist.get_credentials")
+    @patch("src.commands.playlist.PlaylistManager")
+    def test_sort_dry_run(self, MockPlManager, mock_get_credentials):
+        mock_get_credentials.return_value = MagicMock()
+        mock_pl = MockPlManager.return_value
+        mock_pl.find_playlist_id.return_value = "PL1"
+        mock_pl.list_playlist_items.return_value = self._sort_items()
+
+        result = runner.invoke(app, ["playlist", "sort", "MyList", "--dry-run"])
+
+        self.assertEqual(result.exit_code, 0, result.output)
+        self.assertIn("Would move 'C' to #3", result.output)
+        mock_pl.apply_moves.assert_not_called()
+
+    @patch("src.commands.playlist.HistoryManager")
+    @patch("src.commands.playlist.get_credentials")
+    @patch("src.commands.playlist.PlaylistManager")
+    def test_sort_by_index_uses_history_file_order(self, MockPlManager, mock_get_credentials, MockHistory):
+        mock_get_credentials.return_value = MagicMock()
+        mock_pl = MockPlManager.return_value
+        mock_pl.find_playlist_id.return_value = "PL1"
+        mock_pl.list_playlist_items.return_value = self._sort_items()
+        paths = {"v1": "/videos/a/01.mp4", "v2": "/videos/a/02.mp4", "v3": "/videos/a/03.mp4"}
+        MockHistory.return_value.get_record_by_video_id.side_effect = lambda vid: {"file_path": paths[vid]}
+
+        result = runner.invoke(app, ["playlist", "sort", "MyList", "--by", "index", "--dry-run"])
+
+        self.assertEqual(result.exit_code, 0, result.output)
+        self.assertIn("already sorted by index", result.output)
+
+    @patch("src.commands.playlist.VideoManager")
+    @patch("src.commands.playlist.get_credentials")
+    @patch("src.commands.playlist.PlaylistManager")
+    def test_sort_by_date_requests_recording_details(self, MockPlManager, mock_get_credentials, MockVideoManager):
+        mock_get_credentials.return_value = MagicMock()
+        mock_pl = MockPlManager.return_value
+        mock_pl.find_playlist_id.return_value = "PL1"
+        mock_pl.list_playlist_items.return_value = self._sort_items()
+        MockVideoManager.return_value.get_videos.return_value = {
+            "v1": {"recordingDetails": {"recordingDate": "2024-01-01T00:00:00Z"}},
+            "v3": {"recordingDetails": {"recordingDate": "2023-01-01T00:00:00Z"}},
+        }
+
+        result = runner.invoke(app, ["playlist", "sort", "MyList", "--by", "date", "--dry-run"])
+
+        self.assertEqual(result.exit_code, 0, result.output)
+        self.assertEqual(MockVideoManager.return_value.get_videos.call_args[1]["part"], "recordingDetails")
+        self.assertIn("1 videos have no 'date' key", result.output)
+
+    @patch("src.commands.common.estimate_remaining_units", return_value=10)
+    @patch("src.commands.playlist.HistoryManager")
+    @patch("src.commands.playlist.get_credentials")
+    @patch("src.commands.playlist.PlaylistManager")
+    def test_sort_aborts_when_quota_insufficient(self, MockPlManager, mock_get_credentials, _hist, _remaining):
+        mock_get_credentials.return_value = MagicMock()
+        mock_pl = MockPlManager.return_value
+        mock_pl.find_playlist_id.return_value = "PL1"
+        mock_pl.list_playlist_items.return_value = self._sort_items()
+
+        result = runner.invoke(app, ["playlist", "sort", "MyList", "-y"])
+
+        self.assertEqual(result.exit_code, 1)
+        self.assertIn("Quota不足", result.output)
+        mock_pl.apply_moves.assert_not_called()
+
+    @patch("src.commands.playlist.get_credentials")
+    @patch("src.commands.playlist.PlaylistManager")
+    def test_dedupe_dry_run_reports(self, MockPlManager, mock_get_credentials):
+        mock_get_credentials.return_value = MagicMock()
+        mock_pl = MockPlManager.return_value
+        mock_pl.get_playlist_titles.return_value = {"PL1": "MyList"}
+        mock_pl.find_duplicate_items.return_value = {"PL1": {"v1": ["i2", "i3"]}}
+
+        result = runner.invoke(app, ["playlist", "dedupe", "--dry-run"])
+
+        self.assertEqual(result.exit_code, 0, result.output)
+        self.assertIn("MyList", result.output)
+        self.assertIn("delete 2 duplicate items in 1 playlists (~100 units)", result.output)
+        self.assertIsNone(mock_pl.find_duplicate_items.call_args[0][0])
+        mock_pl.delete_playlist_items.assert_not_called()
+
+    @patch("src.commands.common.estimate_remaining_units", return_value=10000)
+    @patch("src.commands.playlist.HistoryManager")
+    @patch("src.commands.playlist.get_credentials")
+    @patch("src.commands.playlist.PlaylistManager")
+    def test_dedupe_single_playlist_deletes_extras(self, MockPlManager, mock_get_credentials, _hist, _remaining):
+        mock_get_credentials.return_value = MagicMock()
+        mock_pl = MockPlManager.return_value
+        mock_pl.get_playlist_titles.return_value = {"PL1": "MyList"}
+        mock_pl.find_playlist_id.return_value = "PL1"
+        mock_pl.find_duplicate_items.return_value = {"PL1": {"v1": ["i2"], "v2": ["i5"]}}
+        mock_pl.delete_playlist_items.return_value = {"i2": True, "i5": True}
+
+        result = runner.invoke(app, ["playlist", "dedupe", "MyList", "-y"])
+
+        self.assertEqual(result.exit_code, 0, result.output)
+        self.assertEqual(mock_pl.find_duplicate_items.call_args[0][0], ["PL1"])
+        self.assertEqual(mock_pl.delete_playlist_items.call_args[0][0], ["i2", "i5"])
+        self.assertIn("2 removed, 0 failed", result.output)
+
+    @patch("src.commands.playlist.get_credentials")
+    @patch("src.commands.playlist.PlaylistManager")
+    def test_dedupe_nothing_found(self, MockPlManager, mock_get_credentials):
+        mock_get_credentials.return_value = MagicMock()
+        mock_pl = MockPlManager.return_value
+        mock_pl.get_playlist_titles.return_value = {}
+        mock_pl.find_duplicate_items.return_value = {}
+
+        result = runner.invoke(app, ["playlist", "dedupe"])
+
+        self.assertEqual(result.exit_code, 0)
+        self.assertIn("No duplicate videos found", result.output)
+
 if __name__ == "__main__":
     unittest.main()
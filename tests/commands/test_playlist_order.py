@@ -0,0 +1,101 @@
+import asyncio
+import random
+from pathlib import Path
+from unittest.mock import MagicMock, patch
+
+import pytest
+
+from src.services.playlist_order import PlaylistOrderBuffer
+from src.services.upload_manager import process_video_files
+
+
+def _buffer(files, inserted):
+    async def insert(playlist, video_id):
+        await asyncio.sleep(0)
+        inserted.append((playlist, video_id))
+
+    return PlaylistOrderBuffer(files, playlist_for=lambda f: f.parent.name, insert=insert)
+
+
+@pytest.mark.asyncio
+async def test_holds_until_earlier_files_complete():
+    files = [Path("/v/A/1.mp4"), Path("/v/A/2.mp4"), Path("/v/A/3.mp4"), Path("/v/B/1.mp4")]
+    inserted = []
+    buffer = _buffer(files, inserted)
+
+    await buffer.complete(files[2], "vid3")
+    await buffer.complete(files[3], "vidB1")  # 別プレイリストは待たない
+    assert inserted == [("B", "vidB1")]
+
+    await buffer.complete(files[1], "vid2")
+    assert inserted == [("B", "vidB1")]
+
+    await buffer.complete(files[0], "vid1")
+    assert inserted == [("B", "vidB1"), ("A", "vid1"), ("A", "vid2"), ("A", "vid3")]
+
+
+@pytest.mark.asyncio
+async def test_skipped_files_do_not_block():
+    files = [Path("/v/A/1.mp4"), Path("/v/A/2.mp4"), Path("/v/A/3.mp4")]
+    inserted = []
+    buffer = _buffer(files, inserted)
+
+    await buffer.complete(files[2], "vid3")
+    await buffer.complete(files[0], None)  # 重複・失敗
+    await buffer.complete(files[1], None)
+
+    assert inserted == [("A", "vid3")]
+
+
+@pytest.mark.asyncio
+async def test_concurrent_completion_keeps_file_order():
+    files = [Path(f"/v/A/{i:02d}.mp4") for i in range(20)]
+    inserted = []
+    buffer = _buffer(files, inserted)
+
+    async def finish(f):
+        await asyncio.sleep(random.random() / 100)
+        await buffer.complete(f, f"vid{f.stem}")
+
+    await asyncio.gather(*(finish(f) for f in reversed(files)))
+
+    assert [vid for _, vid in inserted] == [f"vid{f.stem}" for f in files]
+
+
+@pytest.mark.asyncio
+async def test_process_video_files_adds_to_playlist_in_file_order(tmp_path):
+    folder = tmp_path / "Trip"
+    folder.mkdir()
+    files = []
+    for i in range(4):
+        f = folder / f"{i}.mp4"
+        f.write_bytes(b"x" * (i + 1))
+        files.append(f)
+
+    uploader = MagicMock()
+
+    async def upload_video(file_path, metadata, progress_callback=None):
+        # 後ろのファイルほど早く終わる
+        await asyncio.sleep((4 - int(file_path.stem)) / 100)
+        return f"vid{file_path.stem}"
+
+    uploader.upload_video.side_effect = upload_video
+    uploader.upload_thumbnail = MagicMock()
+    history = MagicMock()
+    history.is_uploaded.return_value = False
+    history.get_all_records.return_value = []
+    metadata_gen = MagicMock()
+    metadata_gen.generate.return_value = {"title": "t", "description": "d", "tags": []}
+
+    with patch("src.services.upload_manager.PlaylistManager") as MockPlaylistManager, \
+         patch("src.services.upload_manager.PlaylistIndex"), \
+         patch("src.services.upload_manager.RemoteCatalog") as MockCatalog, \
+         patch("src.services.upload_manager.calculate_hash", side_effect=lambda p: f"hash_{p.stem}"):
+        pl_manager = MockPlaylistManager.return_value
+        pl_manager.get_or_create_playlist.return_value = "PL1"
+        await process_video_files(files, uploader, history, metadata_gen, dry_run=False, workers=4)
+
+    added = [c.args[1] for c in pl_manager.add_video_to_playlist.call_args_list]
+    assert added == ["vid0", "vid1", "vid2", "vid3"]
+    # アップロードした動画はミラーにも追加する
+    assert sorted(c.args[0] for c in MockCatalog.return_value.add.call_args_list) == added
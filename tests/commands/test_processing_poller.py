@@ -0,0 +1,126 @@
+from unittest.mock import MagicMock
+
+from src.services.processing_poller import (
+    PROCESSING_FIELDS,
+    ProcessingPoller,
+    is_failed,
+    processing_state,
+)
+
+
+def _video(vid, upload_status, processing_status=None, **reasons):
+    status = {"uploadStatus": upload_status}
+    details = {}
+    if processing_status:
+        details["processingStatus"] = processing_status
+    if "processingFailureReason" in reasons:
+        details["processingFailureReason"] = reasons.pop("processingFailureReason")
+    status.update(reasons)
+    return {"id": vid, "status": status, "processingDetails": details}
+
+
+def test_processing_state():
+    assert processing_state(_video("v", "processed", "succeeded")) == {
+        "upload_status": "processed", "processing_status": "succeeded", "failure_reason": None, "done": True,
+    }
+    assert processing_state(_video("v", "uploaded", "processing"))["done"] is False
+
+    rejected = processing_state(_video("v", "rejected", rejectionReason="duplicate"))
+    assert rejected["done"] and rejected["failure_reason"] == "duplicate"
+    assert is_failed(rejected)
+
+    failed = processing_state(_video("v", "uploaded", "failed", processingFailureReason="transcodeFailed"))
+    assert failed["done"] and failed["failure_reason"] == "transcodeFailed"
+    assert is_failed(failed)
+
+
+def test_poll_batches_ids_and_writes_history():
+    manager = MagicMock()
+    manager.fetch_videos.return_value = ({
+        "v1": _video("v1", "processed", "succeeded"),
+        "v2": _video("v2", "uploaded", "processing"),
+    }, [])
+    history = MagicMock()
+    poller = ProcessingPoller(manager, history)
+
+    states = poller.poll(["v1", "v2", "gone"])
+
+    manager.fetch_videos.assert_called_once_with(
+        ["v1", "v2", "gone"], part="processingDetails,status", fields=PROCESSING_FIELDS
+    )
+    assert set(states) == {"v1", "v2", "gone"}
+    # 正常な応答に含まれない動画は削除済みとして確定する
+    assert states["gone"]["upload_status"] == "deleted" and states["gone"]["done"]
+    assert is_failed(states["gone"])
+    history.update_processing_states.assert_called_once_with(states)
+
+
+def test_poll_leaves_failed_chunk_pending():
+    manager = MagicMock()
+    manager.fetch_videos.return_value = ({"v1": _video("v1", "processed", "succeeded")}, ["v2"])
+    history = MagicMock()
+
+    states = ProcessingPoller(manager, history).poll(["v1", "v2"])
+
+    assert set(states) == {"v1"}
+    history.update_processing_states.assert_called_once_with(states)
+
+
+def test_poll_empty_makes_no_calls():
+    manager = MagicMock()
+    assert ProcessingPoller(manager, MagicMock()).poll([]) == {}
+    manager.fetch_videos.assert_not_called()
+
+
+def test_wait_rechecks_pending_with_backoff(monkeypatch):
+    monkeypatch.setattr("src.services.processing_poller.config.upload.processing_poll_interval", 10)
+    monkeypatch.setattr("src.services.processing_poller.config.upload.processing_poll_max_interval", 25)
+
+    manager = MagicMock()
+    manager.fetch_videos.side_effect = [
+        ({"v1": _video("v1", "processed", "succeeded"), "v2": _video("v2", "uploaded", "processing")}, []),
+        ({}, ["v2"]),  # 一時的なエラーでも未確定のまま再確認する
+        ({"v2": _video("v2", "uploaded", "processing")}, []),
+        ({"v2": _video("v2", "processed", "succeeded")}, []),
+    ]
+    sleeps = []
+    poller = ProcessingPoller(manager, MagicMock(), sleep=sleeps.append)
+
+    states = poller.wait(["v1", "v2"], timeout=3600)
+
+    assert sleeps == [10, 20, 25]
+    # 確定した動画は再確認しない
+    assert manager.fetch_videos.call_args_list[1].args[0] == ["v2"]
+    assert states["v2"]["processing_status"] == "succeeded"
+
+
+def test_wait_stops_at_timeout():
+    manager = MagicMock()
+    manager.fetch_videos.return_value = ({"v1": _video("v1", "uploaded", "processing")}, [])
+    sleeps = []
+    poller = ProcessingPoller(manager, MagicMock(), sleep=sleeps.append)
+
+    states = poller.wait(["v1"], timeout=0)
+
+    assert sleeps == []
+    assert manager.fetch_videos.call_count == 1
+    assert states["v1"]["done"] is False
+
+
+def test_wait_for_processing_only_checks_this_run(monkeypatch):
+    from src.services import upload_manager
+
+    history = MagicMock()
+    history.get_unprocessed_video_ids.return_value = ["v1", "v2"]
+    poller = MagicMock()
+    poller.wait.return_value = {
+        "v1": processing_state(_video("v1", "processed", "succeeded")),
+        "v2": processing_state(_video("v2", "rejected", rejectionReason="duplicate")),
+    }
+    monkeypatch.setattr(upload_manager, "VideoManager", MagicMock())
+    monkeypatch.setattr(upload_manager, "ProcessingPoller", MagicMock(return_value=poller))
+
+    upload_manager.wait_for_processing(MagicMock(), history, since=123.0)
+
+    history.get_unprocessed_video_ids.assert_called_once_with(since=123.0)
+    assert poller.wait.call_args.args[0] == ["v1", "v2"]
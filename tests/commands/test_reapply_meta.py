@@ -0,0 +1,110 @@
+from pathlib import Path
+from unittest.mock import MagicMock, patch
+
+import pytest
+from typer.testing import CliRunner
+
+from src.lib.data.history import HistoryManager
+from src.main import app
+from src.services.metadata_sync import MetadataSyncManager
+
+runner = CliRunner()
+
+
+@pytest.fixture
+def history(tmp_path: Path):
+    manager = HistoryManager(db_path=str(tmp_path / "history.db"))
+    yield manager
+    manager.close()
+
+
+@pytest.fixture
+def uploaded(tmp_path: Path, history: HistoryManager):
+    """フォルダ内に2本アップロード済み + ファイルが消えた1本"""
+    folder = tmp_path / "Trip"
+    folder.mkdir()
+    for name, vid in [("a.mp4", "vidA"), ("b.mp4", "vidB")]:
+        (folder / name).write_bytes(b"x")
+        history.add_record(
+            str(folder / name), f"hash_{vid}", vid,
+            {"title": f"Old {name}", "description": "D", "tags": ["t"], "privacy_status": "unlisted"},
+        )
+    history.add_record(str(folder / "gone.mp4"), "hash_gone", "vidGone", {"title": "Gone"})
+    history.add_failure(str(folder / "c.mp4"), "hash_fail", "error")
+    return folder
+
+
+def _generator():
+    gen = MagicMock()
+
+    def generate(file_path, index, total):
+        # a.mp4 だけタイトルが変わる
+        title = "New a.mp4" if file_path.name == "a.mp4" else "Old b.mp4"
+        return {"title": title, "description": "D", "tags": ["t"], "recordingDetails": {}, "index": (index, total)}
+
+    gen.generate.side_effect = generate
+    return gen
+
+
+def test_render_diffs_against_stored_metadata(uploaded, history):
+    gen = _generator()
+    sync = MetadataSyncManager(MagicMock(), history, gen)
+
+    rendered = sync.render(workers=2)
+
+    assert rendered["changes"] == {"vidA": {"title": "New a.mp4"}}
+    assert [r["video_id"] for r in rendered["missing_files"]] == ["vidGone"]
+    # index/total はフォルダ内のファイル名順
+    record, new_meta = rendered["rendered"]["vidA"]
+    assert new_meta["index"] == (1, 2)
+    assert new_meta["privacy_status"] == "unlisted"  # 保存済みのキーは保持
+
+    assert sync.persist(rendered["rendered"], ["vidA"]) == 1
+    assert history.get_record("hash_vidA")["metadata"]["title"] == "New a.mp4"
+    assert history.get_record("hash_vidB")["metadata"]["title"] == "Old b.mp4"
+
+
+def test_render_numbers_files_like_the_upload_scan(uploaded, history):
+    # 未アップロードのファイルもアップロード時と同じく番号に含める
+    (uploaded / "0.mp4").write_bytes(b"x")
+    gen = _generator()
+    sync = MetadataSyncManager(MagicMock(), history, gen)
+
+    rendered = sync.render()
+
+    assert rendered["rendered"]["vidA"][1]["index"] == (2, 3)
+
+
+@patch("src.commands.common.estimate_remaining_units", return_value=10000)
+@patch("src.commands.video.get_credentials")
+@patch("src.commands.video.VideoManager")
+def test_reapply_meta_command(MockVideoManager, mock_get_credentials, mock_remaining, uploaded, history):
+    manager = MockVideoManager.return_value
+    manager.plan_metadata_updates.return_value = ({"vidA": {"title": "New a.mp4"}}, [], [])
+    manager.apply_metadata_updates.return_value = {"vidA": True}
+
+    with patch("src.commands.video.HistoryManager", return_value=history), \
+         patch("src.services.metadata_sync.FileMetadataGenerator", return_value=_generator()):
+        result = runner.invoke(app, ["video", "reapply-meta", "-c", "2"])
+
+    assert result.exit_code == 0, result.output
+    assert "1 to update, 0 already applied, 0 not found (~51 units)" in result.output
+    assert "1 updated, 0 failed" in result.output
+    manager.plan_metadata_updates.assert_called_once_with({"vidA": {"title": "New a.mp4"}}, concurrency=2)
+    assert history.get_record("hash_vidA")["metadata"]["title"] == "New a.mp4"
+
+
+@patch("src.commands.video.get_credentials")
+@patch("src.commands.video.VideoManager")
+def test_reapply_meta_dry_run(MockVideoManager, mock_get_credentials, uploaded, history):
+    manager = MockVideoManager.return_value
+    manager.plan_metadata_updates.return_value = ({"vidA": {"title": "New a.mp4"}}, [], [])
+
+    with patch("src.commands.video.HistoryManager", return_value=history), \
+         patch("src.services.metadata_sync.FileMetadataGenerator", return_value=_generator()):
+        result = runner.invoke(app, ["video", "reapply-meta", "--dry-run"])
+
+    assert result.exit_code == 0, result.output
+    assert "Would update vidA: title" in result.output
+    manager.apply_metadata_updates.assert_not_called()
+    assert history.get_record("hash_vidA")["metadata"]["title"] == "Old a.mp4"
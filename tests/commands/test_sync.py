@@ -1,3 +1,5 @@
+from pathlib import Path
+
 import pytest
 from unittest.mock import MagicMock, patch
 from typer.testing import CliRunner
@@ -7,9 +9,11 @@ runner = CliRunner()
 
 @pytest.fixture
 def mock_dependencies():
-    with patch("src.commands.sync.get_authenticated_service") as m_auth, \
+    with patch("src.commands.sync.get_credentials"), \
+         patch("src.commands.sync.get_service") as m_auth, \
          patch("src.commands.sync.HistoryManager") as m_hist_cls, \
-         patch("src.services.sync_manager.HistoryManager") as m_sm_hist_cls:
+         patch("src.services.sync_manager.HistoryManager") as m_sm_hist_cls, \
+         patch("src.commands.sync.RemoteCatalog", return_value=None):
         
         mock_service = MagicMock()
         m_auth.return_value = mock_service
@@ -24,7 +28,7 @@ def mock_dependencies():
         }
 
 def test_sync_dry_run_no_auth():
-    with patch("src.commands.sync.get_authenticated_service", side_effect=Exception("No Auth")):
+    with patch("src.commands.sync.get_credentials", side_effect=Exception("No Auth")):
         result = runner.invoke(app, ["sync"])
         assert result.exit_code == 1
         assert "Auth Error" in result.stdout
@@ -50,9 +54,7 @@ def test_sync_perfect_match(mock_dependencies):
     }
     
     # Mock Local: 1 record, ID "vid1"
-    mock_dependencies["history"].get_all_records.return_value = [
-        {"video_id": "vid1", "status": "success", "file_path": "/path/to/vid1.mp4"}
-    ]
+    mock_dependencies["history"].iter_success_video_paths.return_value = [("vid1", "/path/to/vid1.mp4")]
     
     result = runner.invoke(app, ["sync"])
     assert result.exit_code == 0
@@ -77,7 +79,7 @@ def test_sync_missing_local(mock_dependencies):
         ]
     }
     
-    mock_dependencies["history"].get_all_records.return_value = []
+    mock_dependencies["history"].iter_success_video_paths.return_value = []
     
     with patch("src.commands.sync.Table") as MockTable:
         mock_table_instance = MockTable.return_value
@@ -105,9 +107,7 @@ def test_sync_missing_remote(mock_dependencies):
         "items": []
     }
     
-    mock_dependencies["history"].get_all_records.return_value = [
-        {"video_id": "vid1", "status": "success", "file_path": "/path/to/vid1.mp4"}
-    ]
+    mock_dependencies["history"].iter_success_video_paths.return_value = [("vid1", "/path/to/vid1.mp4")]
     
     with patch("src.commands.sync.Table") as MockTable:
         mock_table_instance = MockTable.return_value
@@ -134,13 +134,237 @@ def test_sync_fix(mock_dependencies):
     }
     
     # ローカルには vid1 がある
-    mock_dependencies["history"].get_all_records.return_value = [
-        {"video_id": "vid1", "status": "success", "file_path": "/path/to/vid1.mp4"}
-    ]
-    mock_dependencies["history"].delete_record_by_video_id.return_value = True
+    mock_dependencies["history"].iter_success_video_paths.return_value = [("vid1", "/path/to/vid1.mp4")]
+    mock_dependencies["history"].delete_records_by_video_ids.return_value = {"vid1"}
     
     with patch("src.commands.sync.Table"):
         result = runner.invoke(app, ["sync", "--fix", "-y"])
         assert result.exit_code == 0
         assert "Fix complete" in result.stdout
-        mock_dependencies["history"].delete_record_by_video_id.assert_called_with("vid1")
+        mock_dependencies["history"].delete_records_by_video_ids.assert_called_with(["vid1"])
+
+
+def test_fix_missing_remote_counts_videos_not_rows(tmp_path):
+    """同じ video_id のレコードが複数あっても、見つからなかった動画だけを失敗と数える"""
+    from src.lib.data.history import HistoryManager
+    from src.services.sync_manager import SyncManager
+
+    history = HistoryManager(db_path=str(tmp_path / "history.db"))
+    history.add_record("/v/a.mp4", "hash-a", "vidA", {})
+    history.add_record("/v/a-copy.mp4", "hash-a2", "vidA", {})
+    try:
+        deleted, failed = SyncManager(MagicMock(), history).fix_missing_remote(
+            [{"video_id": "vidA"}, {"video_id": "vidB"}]
+        )
+    finally:
+        history.close()
+
+    assert (deleted, failed) == (1, 1)
+
+
+def test_sync_fix_forces_full_refresh(mock_dependencies):
+    """--fix は TTL 内でもミラーを取り直してから削除対象を決める"""
+    with patch("src.commands.sync.SyncManager") as MockSyncManager:
+        manager = MockSyncManager.return_value
+        manager.compare.return_value = ([], [], [])
+
+        result = runner.invoke(app, ["sync", "--fix", "-y"])
+
+    assert result.exit_code == 0, result.output
+    manager.compare.assert_called_once_with(full_refresh=True)
+
+
+def test_sync_fix_keeps_videos_uploaded_within_ttl(tmp_path):
+    """TTL 内にアップロードした動画はミラーに追加済みなので削除対象にならない"""
+    from src.lib.data.remote_catalog import RemoteCatalog
+    from src.services.sync_manager import SyncManager
+
+    service = MagicMock()
+    service.channels().list().execute.return_value = {
+        "items": [{"contentDetails": {"relatedPlaylists": {"uploads": "PL_UPLOADS"}}}]
+    }
+    service.playlistItems().list().execute.return_value = {
+        "items": [{"snippet": {"title": "Video 1"}, "contentDetails": {"videoId": "vid1"}}]
+    }
+    service.videos().list().execute.return_value = {
+        "items": [{"id": "vid1", "status": {"privacyStatus": "public"}}]
+    }
+    catalog = RemoteCatalog(db_path=str(tmp_path / "history.db"), channel="default")
+    catalog.refresh(service)
+    catalog.add("new1", "New Upload", "private")  # post_upload_sync からの追加
+
+    history = MagicMock()
+    history.iter_success_video_paths.return_value = [("vid1", "/v/1.mp4"), ("new1", "/v/new1.mp4")]
+    _, _, missing_remote = SyncManager(service, history, catalog=catalog).compare()
+    catalog.close()
+
+    assert missing_remote == []
+
+
+def test_sync_manager_uses_catalog(tmp_path):
+    """RemoteCatalog があればミラーを差分更新して比較する"""
+    from src.lib.data.remote_catalog import RemoteCatalog
+    from src.services.sync_manager import SyncManager
+
+    service = MagicMock()
+    service.channels().list().execute.return_value = {
+        "items": [{"contentDetails": {"relatedPlaylists": {"uploads": "PL_UPLOADS"}}}]
+    }
+    service.playlistItems().list().execute.return_value = {
+        "items": [{"snippet": {"title": "Video 1"}, "contentDetails": {"videoId": "vid1"}}]
+    }
+    service.videos().list().execute.return_value = {
+        "items": [{"id": "vid1", "status": {"privacyStatus": "public"}}]
+    }
+    history = MagicMock()
+    history.iter_success_video_paths.return_value = [("vid1", "/path/to/vid1.mp4")]
+    catalog = RemoteCatalog(db_path=str(tmp_path / "history.db"), channel="default")
+
+    manager = SyncManager(service, history, catalog=catalog)
+    in_sync, missing_local, missing_remote = manager.compare()
+    # TTL 内の2回目はミラーだけで比較する
+    calls = service.playlistItems().list().execute.call_count
+    manager.compare()
+    catalog.close()
+
+    assert [item["remote_title"] for item in in_sync] == ["Video 1"]
+    assert missing_local == [] and missing_remote == []
+    assert service.playlistItems().list().execute.call_count == calls
+
+
+def test_sync_manager_refreshes_catalog_with_enricher():
+    """credentials があれば公開状態は VideoEnricher で並列に取得する"""
+    from src.services.sync_manager import SyncManager
+
+    catalog = MagicMock()
+    catalog.videos.return_value = [{"id": "vid1", "title": "Video 1"}]
+    creds = MagicMock()
+    with patch("src.services.sync_manager.VideoEnricher") as MockEnricher:
+        titles = SyncManager(MagicMock(), MagicMock(), catalog=catalog, credentials=creds) \
+            .fetch_remote_titles(full_refresh=True)
+
+    enricher = MockEnricher.return_value.__enter__.return_value
+    assert titles == {"vid1": "Video 1"}
+    assert MockEnricher.call_args[0] == (creds, ("status",))
+    assert catalog.refresh.call_args[1] == {"full": True, "enricher": enricher}
+
+
+def _file_details_service(details):
+    service = MagicMock()
+
+    def list_videos(id, part, maxResults, fields):
+        request = MagicMock()
+        request.execute.return_value = {
+            "items": [
+                {"id": vid, "fileDetails": {"fileName": details[vid][0], "fileSize": str(details[vid][1])}}
+                for vid in id.split(",") if vid in details
+            ]
+        }
+        return request
+
+    service.videos().list.side_effect = list_videos
+    return service
+
+
+def test_reconcile_missing_local_matches_size_then_name(tmp_path):
+    """fileDetails のサイズ → ファイル名で候補を絞り、候補だけハッシュする"""
+    from src.services.sync_manager import SyncManager
+
+    (tmp_path / "a.mp4").write_bytes(b"x" * 10)
+    (tmp_path / "b.mp4").write_bytes(b"y" * 10)  # a.mp4 と同じサイズ
+    (tmp_path / "c.mp4").write_bytes(b"z" * 20)
+    (tmp_path / "d.mp4").write_bytes(b"w" * 30)
+    service = _file_details_service({
+        "vidA": ("b.mp4", 10),
+        "vidC": ("renamed.mp4", 20),  # サイズが一意でもファイル名が違えば一致しない
+        "vidD": ("", 30),  # fileName が無ければサイズだけで一致
+        "vidX": ("other.mp4", 99),
+    })
+    history = MagicMock()
+    history.is_uploaded_by_path.return_value = False
+    history.is_uploaded.return_value = False
+    missing_local = [
+        {"video_id": vid, "remote_title": f"Title {vid}", "local_path": "N/A", "status": "MISSING_LOCAL"}
+        for vid in ("vidA", "vidC", "vidD", "vidX")
+    ]
+
+    with patch("src.services.sync_manager.calculate_hash", side_effect=lambda p: f"hash-{p.name}") as mock_hash:
+        matches, unmatched = SyncManager(service, history).reconcile_missing_local(missing_local, str(tmp_path))
+
+    assert {m["video_id"]: Path(m["file_path"]).name for m in matches} == {"vidA": "b.mp4", "vidD": "d.mp4"}
+    assert [item["video_id"] for item in unmatched] == ["vidC", "vidX"]
+    assert sorted(c.args[0].name for c in mock_hash.call_args_list) == ["b.mp4", "d.mp4"]
+    assert matches[0]["remote_file_name"] == "b.mp4"
+
+    SyncManager(service, history).apply_reconciled(matches)
+    history.add_record.assert_any_call(
+        file_path=str(tmp_path / "b.mp4"), file_hash="hash-b.mp4", video_id="vidA",
+        metadata={"title": "Title vidA"}, file_size=10, reconciled=True,
+    )
+
+
+def test_reconcile_skips_hash_already_recorded(tmp_path):
+    from src.services.sync_manager import SyncManager
+
+    (tmp_path / "a.mp4").write_bytes(b"x" * 10)
+    history = MagicMock()
+    history.is_uploaded_by_path.return_value = False
+    history.is_uploaded.return_value = True  # 同じ内容が別の動画として記録済み
+    missing_local = [{"video_id": "vidA", "remote_title": "A", "local_path": "N/A", "status": "MISSING_LOCAL"}]
+
+    matches, unmatched = SyncManager(_file_details_service({"vidA": ("a.mp4", 10)}), history) \
+        .reconcile_missing_local(missing_local, str(tmp_path))
+
+    assert matches == []
+    assert len(unmatched) == 1
+
+
+def test_fetch_file_details_skips_failed_chunk():
+    import httplib2
+    from googleapiclient.errors import HttpError
+
+    from src.services.sync_manager import SyncManager
+
+    service = MagicMock()
+    service.videos().list().execute.side_effect = [
+        HttpError(httplib2.Response({"status": "500"}), b"Error"),
+        {"items": [{"id": "v50", "fileDetails": {"fileName": "a.mp4", "fileSize": "10"}}]},
+    ]
+
+    details = SyncManager(service, MagicMock()).fetch_file_details([f"v{i}" for i in range(51)])
+
+    assert details == {"v50": {"fileName": "a.mp4", "fileSize": 10}}
+
+
+def test_sync_reconcile_error_exits(mock_dependencies):
+    with patch("src.commands.sync.SyncManager") as MockSyncManager:
+        manager = MockSyncManager.return_value
+        missing = [{"video_id": "vid1", "remote_title": "Video 1", "local_path": "N/A", "status": "MISSING_LOCAL"}]
+        manager.compare.return_value = ([], missing, [])
+        manager.reconcile_missing_local.side_effect = OSError("Permission denied")
+
+        result = runner.invoke(app, ["sync", "--reconcile", "/videos", "-y"])
+
+    assert result.exit_code == 1
+    assert "Error matching local files" in result.stdout
+    manager.apply_reconciled.assert_not_called()
+
+
+def test_sync_reconcile_option(mock_dependencies):
+    with patch("src.commands.sync.SyncManager") as MockSyncManager:
+        manager = MockSyncManager.return_value
+        missing = [{"video_id": "vid1", "remote_title": "Video 1", "local_path": "N/A", "status": "MISSING_LOCAL"}]
+        manager.compare.return_value = ([], missing, [])
+        manager.reconcile_missing_local.return_value = (
+            [{"video_id": "vid1", "remote_title": "Video 1", "file_path": "/videos/v1.mp4",
+              "file_hash": "h1", "file_size": 10}],
+            [],
+        )
+        manager.apply_reconciled.return_value = 1
+
+        result = runner.invoke(app, ["sync", "--reconcile", "/videos", "-y"])
+
+    assert result.exit_code == 0, result.output
+    manager.reconcile_missing_local.assert_called_once_with(missing, "/videos")
+    manager.apply_reconciled.assert_called_once()
+    assert "1 records added" in result.stdout
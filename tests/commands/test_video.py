@@ -1,3 +1,4 @@
+import json
 import unittest
 from unittest.mock import MagicMock, patch
 from typer.testing import CliRunner
@@ -6,6 +7,16 @@ from src.main import app
 runner = CliRunner()
 
 class TestVideoCommand(unittest.TestCase):
+
+    def setUp(self):
+        # Quota 推定は履歴 DB を読むので、テストでは十分な残量を返す
+        patchers = [
+            patch("src.commands.video.HistoryManager"),
+            patch("src.commands.common.estimate_remaining_units", return_value=10000),
+        ]
+        self.mock_remaining = [p.start() for p in patchers][1]
+        for p in patchers:
+            self.addCleanup(p.stop)
     
     @patch("src.commands.video.get_credentials")
     @patch("src.commands.video.VideoManager")
@@ -16,7 +27,8 @@ class TestVideoCommand(unittest.TestCase):
         mock_get_credentials.return_value = mock_creds
         
         mock_idx_mgr = MockVideoManager.return_value
-        mock_idx_mgr.update_privacy_status.return_value = True
+        mock_idx_mgr.get_privacy_statuses.return_value = {"vid1": "private", "vid2": "private"}
+        mock_idx_mgr.update_privacy_status_bulk.return_value = {"vid1": True, "vid2": True}
         
         mock_pl_mgr = MockPlaylistManager.return_value
         mock_pl_mgr.get_video_ids_from_playlist.return_value = ["vid1", "vid2"]
@@ -32,7 +44,7 @@ class TestVideoCommand(unittest.TestCase):
         self.assertIn("vid1", result.stdout)
         
         mock_pl_mgr.get_video_ids_from_playlist.assert_called_with("MyPlaylist")
-        self.assertEqual(mock_idx_mgr.update_privacy_status.call_count, 2)
+        mock_idx_mgr.update_privacy_status_bulk.assert_called_once_with(["vid1", "vid2"], "unlisted", concurrency=None)
 
     @patch("src.commands.video.get_credentials")
     @patch("src.commands.video.VideoManager")
@@ -103,7 +115,7 @@ class TestVideoCommand(unittest.TestCase):
         """video list の正常系テスト"""
         mock_get_credentials.return_value = MagicMock()
         mock_mgr = MockVideoManager.return_value
-        mock_mgr.get_all_uploaded_videos.return_value = [
+        mock_mgr.iter_uploaded_videos.return_value = [
             {"id": "vid1", "title": "Video One", "privacy": "private"},
             {"id": "vid2", "title": "Video Two", "privacy": "public"},
         ]
@@ -112,7 +124,41 @@ class TestVideoCommand(unittest.TestCase):
         self.assertEqual(result.exit_code, 0)
         self.assertIn("Video One", result.output)
         self.assertIn("Video Two", result.output)
-        mock_mgr.get_all_uploaded_videos.assert_called_once()
+        mock_mgr.iter_uploaded_videos.assert_called_once()
+        self.assertIn("2 videos", result.output)
+
+    @patch("src.commands.video.get_credentials")
+    @patch("src.commands.video.VideoManager")
+    def test_list_videos_ndjson(self, MockVideoManager, mock_get_credentials):
+        mock_get_credentials.return_value = MagicMock()
+        mock_mgr = MockVideoManager.return_value
+        mock_mgr.iter_uploaded_videos.return_value = iter([
+            {"id": "vid1", "title": "ビデオ", "privacy": "private"},
+            {"id": "vid2", "title": "Video Two", "privacy": "public"},
+        ])
+
+        result = runner.invoke(app, ["video", "list", "--format", "ndjson"])
+
+        self.assertEqual(result.exit_code, 0)
+        lines = result.stdout.strip().splitlines()
+        self.assertEqual([json.loads(line)["id"] for line in lines], ["vid1", "vid2"])
+        self.assertEqual(json.loads(lines[0])["title"], "ビデオ")
+
+    @patch("src.commands.video.get_credentials")
+    @patch("src.commands.video.VideoManager")
+    def test_list_videos_prints_each_page(self, MockVideoManager, mock_get_credentials):
+        mock_get_credentials.return_value = MagicMock()
+        mock_mgr = MockVideoManager.return_value
+        mock_mgr.iter_uploaded_videos.return_value = iter(
+            {"id": f"vid{i:08d}", "title": f"Video {i}", "privacy": "private"} for i in range(120)
+        )
+
+        result = runner.invoke(app, ["video", "list"])
+
+        self.assertEqual(result.exit_code, 0)
+        self.assertIn("Video 119", result.output)
+        self.assertEqual(result.output.count("Video ID"), 1)  # ヘッダは最初のチャンクだけ
+        self.assertIn("120 videos", result.output)
 
     @patch("src.commands.video.get_credentials")
     @patch("src.commands.video.VideoManager")
@@ -120,15 +166,15 @@ class TestVideoCommand(unittest.TestCase):
         """video list --status フィルタテスト"""
         mock_get_credentials.return_value = MagicMock()
         mock_mgr = MockVideoManager.return_value
-        mock_mgr.get_all_uploaded_videos.return_value = [
-            {"id": "vid1", "title": "Private Video", "privacy": "private"},
+        mock_mgr.iter_uploaded_videos.return_value = iter([
             {"id": "vid2", "title": "Public Video", "privacy": "public"},
-        ]
+        ])
 
-        result = runner.invoke(app, ["video", "list", "--status", "public"])
+        result = runner.invoke(app, ["video", "list", "--status", "public", "--limit", "10"])
         self.assertEqual(result.exit_code, 0)
         self.assertIn("Public Video", result.output)
-        # private のものは表示されないはず（フィルタ済み）
+        # フィルタと件数制限は取得側に渡す
+        mock_mgr.iter_uploaded_videos.assert_called_once_with(full_refresh=False, privacy="public", limit=10)
 
     @patch("src.commands.video.get_credentials")
     @patch("src.commands.video.VideoManager")
@@ -136,7 +182,7 @@ class TestVideoCommand(unittest.TestCase):
         """動画0件の場合のテスト"""
         mock_get_credentials.return_value = MagicMock()
         mock_mgr = MockVideoManager.return_value
-        mock_mgr.get_all_uploaded_videos.return_value = []
+        mock_mgr.iter_uploaded_videos.return_value = []
 
         result = runner.invoke(app, ["video", "list"])
         self.assertEqual(result.exit_code, 0)
@@ -147,7 +193,7 @@ class TestVideoCommand(unittest.TestCase):
     def test_list_videos_unlisted_display(self, MockVideoManager, mock_get_credentials):
         mock_get_credentials.return_value = MagicMock()
         mock_mgr = MockVideoManager.return_value
-        mock_mgr.get_all_uploaded_videos.return_value = [
+        mock_mgr.iter_uploaded_videos.return_value = [
             {"id": "vid_unlisted", "title": "Unlisted Video", "privacy": "unlisted"}
         ]
         
@@ -162,7 +208,8 @@ class TestVideoCommand(unittest.TestCase):
         mock_get_credentials.return_value = MagicMock()
         
         mock_idx_mgr = MockVideoManager.return_value
-        mock_idx_mgr.update_privacy_status.return_value = True
+        mock_idx_mgr.get_privacy_statuses.return_value = {"vid1": "private"}
+        mock_idx_mgr.update_privacy_status_bulk.return_value = {"vid1": True}
         
         mock_pl_mgr = MockPlaylistManager.return_value
         mock_pl_mgr.get_video_ids_from_playlist.return_value = ["vid1"]
@@ -172,7 +219,7 @@ class TestVideoCommand(unittest.TestCase):
         
         self.assertEqual(result.exit_code, 0)
         self.assertIn("Warning: 'target' argument is ignored", result.output)
-        mock_idx_mgr.update_privacy_status.assert_called_with("vid1", "unlisted")
+        mock_idx_mgr.update_privacy_status_bulk.assert_called_with(["vid1"], "unlisted", concurrency=None)
 
     @patch("src.commands.video.get_credentials", side_effect=Exception("API Error"))
     def test_auth_error_video_manager(self, mock_get_credentials):
@@ -196,9 +243,7 @@ class TestVideoCommand(unittest.TestCase):
     def test_list_videos_status_not_found(self, MockVideoManager, mock_get_credentials):
         mock_get_credentials.return_value = MagicMock()
         mock_mgr = MockVideoManager.return_value
-        mock_mgr.get_all_uploaded_videos.return_value = [
-            {"id": "vid1", "title": "Vid", "privacy": "private"}
-        ]
+        mock_mgr.iter_uploaded_videos.return_value = iter([])
         
         result = runner.invoke(app, ["video", "list", "--status", "public"])
         self.assertEqual(result.exit_code, 0)
@@ -225,8 +270,9 @@ class TestVideoCommand(unittest.TestCase):
         mock_get_credentials.return_value = MagicMock()
         
         mock_idx_mgr = MockVideoManager.return_value
+        mock_idx_mgr.get_privacy_statuses.return_value = {"vid1": "private", "vid2": "private"}
         # Fail on second video
-        mock_idx_mgr.update_privacy_status.side_effect = [True, False]
+        mock_idx_mgr.update_privacy_status_bulk.return_value = {"vid1": True, "vid2": False}
         
         mock_pl_mgr = MockPlaylistManager.return_value
         mock_pl_mgr.get_video_ids_from_playlist.return_value = ["vid1", "vid2"]
@@ -237,6 +283,114 @@ class TestVideoCommand(unittest.TestCase):
         self.assertEqual(result.exit_code, 1)
         self.assertIn("1 success, 1 failed", result.output)
 
+    @patch("src.commands.video.get_credentials")
+    @patch("src.commands.video.VideoManager")
+    @patch("src.commands.video.PlaylistManager")
+    def test_update_privacy_bulk_skips_unchanged(self, MockPlaylistManager, MockVideoManager, mock_get_credentials):
+        mock_get_credentials.return_value = MagicMock()
+
+        mock_idx_mgr = MockVideoManager.return_value
+        mock_idx_mgr.get_privacy_statuses.return_value = {"vid1": "unlisted", "vid2": "private"}
+        mock_idx_mgr.update_privacy_status_bulk.return_value = {"vid2": True}
+
+        mock_pl_mgr = MockPlaylistManager.return_value
+        mock_pl_mgr.get_video_ids_from_playlist.return_value = ["vid1", "vid2"]
+
+        result = runner.invoke(
+            app, ["video", "update-privacy", "all", "unlisted", "--playlist", "MyList", "-c", "4"]
+        )
+
+        self.assertEqual(result.exit_code, 0)
+        self.assertIn("Skipping 1 videos already unlisted", result.output)
+        self.assertIn("1 success, 0 failed, 1 skipped", result.output)
+        mock_idx_mgr.get_privacy_statuses.assert_called_once_with(["vid1", "vid2"], concurrency=4)
+        mock_idx_mgr.update_privacy_status_bulk.assert_called_once_with(["vid2"], "unlisted", concurrency=4)
+
+    @patch("src.commands.video.get_credentials")
+    @patch("src.commands.video.VideoManager")
+    @patch("src.commands.video.PlaylistManager")
+    def test_update_privacy_bulk_all_unchanged(self, MockPlaylistManager, MockVideoManager, mock_get_credentials):
+        mock_get_credentials.return_value = MagicMock()
+
+        mock_idx_mgr = MockVideoManager.return_value
+        mock_idx_mgr.get_privacy_statuses.return_value = {"vid1": "public"}
+        MockPlaylistManager.return_value.get_video_ids_from_playlist.return_value = ["vid1"]
+
+        result = runner.invoke(app, ["video", "update-privacy", "all", "public", "--playlist", "MyList"])
+
+        self.assertEqual(result.exit_code, 0)
+        self.assertIn("already public", result.output)
+        mock_idx_mgr.update_privacy_status_bulk.assert_not_called()
+
+    @patch("src.commands.video.get_credentials")
+    @patch("src.commands.video.VideoManager")
+    @patch("src.commands.video.PlaylistManager")
+    def test_update_privacy_bulk_quota_exceeded(self, MockPlaylistManager, MockVideoManager, mock_get_credentials):
+        mock_get_credentials.return_value = MagicMock()
+        self.mock_remaining.return_value = 75  # 1件分 (50) しか残っていない
+
+        mock_idx_mgr = MockVideoManager.return_value
+        mock_idx_mgr.get_privacy_statuses.return_value = {"vid1": "private", "vid2": "private"}
+        MockPlaylistManager.return_value.get_video_ids_from_playlist.return_value = ["vid1", "vid2"]
+
+        result = runner.invoke(app, ["video", "update-privacy", "all", "public", "--playlist", "MyList"])
+
+        self.assertEqual(result.exit_code, 1)
+        self.assertIn("Quota不足", result.output)
+        mock_idx_mgr.update_privacy_status_bulk.assert_not_called()
+
+    @patch("src.commands.video.get_credentials")
+    @patch("src.commands.video.VideoManager")
+    @patch("src.commands.video.PlaylistManager")
+    def test_update_privacy_bulk_dedupes_playlist_ids(self, MockPlaylistManager, MockVideoManager, mock_get_credentials):
+        mock_get_credentials.return_value = MagicMock()
+
+        mock_idx_mgr = MockVideoManager.return_value
+        mock_idx_mgr.get_privacy_statuses.return_value = {"vid1": "private", "vid2": "private"}
+        mock_idx_mgr.update_privacy_status_bulk.return_value = {"vid2": True, "vid1": True}
+        MockPlaylistManager.return_value.get_video_ids_from_playlist.return_value = ["vid2", "vid1", "vid2"]
+
+        result = runner.invoke(app, ["video", "update-privacy", "all", "public", "--playlist", "MyList"])
+
+        self.assertEqual(result.exit_code, 0)
+        self.assertIn("2 success, 0 failed, 0 skipped", result.output)
+        mock_idx_mgr.get_privacy_statuses.assert_called_once_with(["vid2", "vid1"], concurrency=None)
+        mock_idx_mgr.update_privacy_status_bulk.assert_called_once_with(["vid2", "vid1"], "public", concurrency=None)
+
+    @patch("src.commands.video.get_credentials")
+    @patch("src.commands.video.VideoManager")
+    @patch("src.commands.video.PlaylistManager")
+    def test_update_privacy_bulk_skips_not_found(self, MockPlaylistManager, MockVideoManager, mock_get_credentials):
+        mock_get_credentials.return_value = MagicMock()
+
+        mock_idx_mgr = MockVideoManager.return_value
+        mock_idx_mgr.get_privacy_statuses.return_value = {"vid1": "private"}
+        mock_idx_mgr.update_privacy_status_bulk.return_value = {"vid1": True}
+        MockPlaylistManager.return_value.get_video_ids_from_playlist.return_value = ["vid1", "gone"]
+
+        result = runner.invoke(app, ["video", "update-privacy", "all", "public", "--playlist", "MyList"])
+
+        self.assertEqual(result.exit_code, 1)
+        self.assertIn("Not found gone", result.output)
+        self.assertIn("1 success, 1 failed, 0 skipped", result.output)
+        mock_idx_mgr.update_privacy_status_bulk.assert_called_once_with(["vid1"], "public", concurrency=None)
+
+    @patch("src.commands.video.get_credentials")
+    @patch("src.commands.video.VideoManager")
+    @patch("src.commands.video.PlaylistManager")
+    def test_update_privacy_bulk_all_not_found(self, MockPlaylistManager, MockVideoManager, mock_get_credentials):
+        mock_get_credentials.return_value = MagicMock()
+
+        mock_idx_mgr = MockVideoManager.return_value
+        mock_idx_mgr.get_privacy_statuses.return_value = {}
+        MockPlaylistManager.return_value.get_video_ids_from_playlist.return_value = ["gone"]
+
+        result = runner.invoke(app, ["video", "update-privacy", "all", "public", "--playlist", "MyList"])
+
+        self.assertEqual(result.exit_code, 1)
+        self.assertIn("Not found gone", result.output)
+        mock_idx_mgr.update_privacy_status_bulk.assert_not_called()
+
     @patch("src.commands.video.get_credentials")
     @patch("src.commands.video.VideoManager")
     def test_update_privacy_single_fail(self, MockVideoManager, mock_get_credentials):
@@ -256,7 +410,8 @@ class TestVideoCommand(unittest.TestCase):
         mock_get_credentials.return_value = MagicMock()
         
         mock_idx_mgr = MockVideoManager.return_value
-        mock_idx_mgr.update_metadata.return_value = True
+        mock_idx_mgr.plan_metadata_updates.return_value = ({"vid1": {"title": "New Title"}}, [], [])
+        mock_idx_mgr.apply_metadata_updates.return_value = {"vid1": True}
         
         mock_pl_mgr = MockPlaylistManager.return_value
         mock_pl_mgr.get_video_ids_from_playlist.return_value = ["vid1"]
@@ -289,7 +444,8 @@ class TestVideoCommand(unittest.TestCase):
         mock_get_credentials.return_value = MagicMock()
         
         mock_idx_mgr = MockVideoManager.return_value
-        mock_idx_mgr.update_metadata.side_effect = [False] # fail
+        mock_idx_mgr.plan_metadata_updates.return_value = ({"vid1": {"title": "New Title"}}, [], [])
+        mock_idx_mgr.apply_metadata_updates.return_value = {"vid1": False}  # fail
         
         mock_pl_mgr = MockPlaylistManager.return_value
         mock_pl_mgr.get_video_ids_from_playlist.return_value = ["vid1"]
@@ -299,6 +455,67 @@ class TestVideoCommand(unittest.TestCase):
         self.assertEqual(result.exit_code, 1)
         self.assertIn("0 success, 1 failed", result.output)
 
+    @patch("src.commands.video.get_credentials")
+    @patch("src.commands.video.VideoManager")
+    @patch("src.commands.video.PlaylistManager")
+    def test_update_meta_bulk_only_changed(self, MockPlaylistManager, MockVideoManager, mock_get_credentials):
+        mock_get_credentials.return_value = MagicMock()
+
+        mock_idx_mgr = MockVideoManager.return_value
+        mock_idx_mgr.metadata_fields.return_value = {"tags": ["a", "b"]}
+        mock_idx_mgr.plan_metadata_updates.return_value = ({"vid2": {"tags": ["a", "b"]}}, ["vid3"], [])
+        mock_idx_mgr.apply_metadata_updates.return_value = {"vid2": True}
+        MockPlaylistManager.return_value.get_video_ids_from_playlist.return_value = ["vid1", "vid2", "vid3"]
+
+        result = runner.invoke(
+            app, ["video", "update-meta", "all", "--tags", "a,b", "--playlist", "MyList", "-c", "2"]
+        )
+
+        self.assertEqual(result.exit_code, 1)  # vid3 が見つからない
+        self.assertIn("1 to update, 1 unchanged, 1 not found (~51 units)", result.output)
+        self.assertIn("1 success, 1 failed, 1 unchanged", result.output)
+        mock_idx_mgr.plan_metadata_updates.assert_called_once_with(
+            {vid: {"tags": ["a", "b"]} for vid in ["vid1", "vid2", "vid3"]}, concurrency=2
+        )
+        mock_idx_mgr.apply_metadata_updates.assert_called_once_with(
+            {"vid2": {"tags": ["a", "b"]}}, concurrency=2
+        )
+
+    @patch("src.commands.video.get_credentials")
+    @patch("src.commands.video.VideoManager")
+    @patch("src.commands.video.PlaylistManager")
+    def test_update_meta_bulk_dry_run(self, MockPlaylistManager, MockVideoManager, mock_get_credentials):
+        mock_get_credentials.return_value = MagicMock()
+
+        mock_idx_mgr = MockVideoManager.return_value
+        mock_idx_mgr.plan_metadata_updates.return_value = ({"vid1": {"title": "T"}}, [], [])
+        MockPlaylistManager.return_value.get_video_ids_from_playlist.return_value = ["vid1", "vid2"]
+
+        result = runner.invoke(
+            app, ["video", "update-meta", "all", "--title", "T", "--playlist", "MyList", "--dry-run"]
+        )
+
+        self.assertEqual(result.exit_code, 0)
+        self.assertIn("Would update vid1", result.output)
+        mock_idx_mgr.apply_metadata_updates.assert_not_called()
+
+    @patch("src.commands.video.get_credentials")
+    @patch("src.commands.video.VideoManager")
+    @patch("src.commands.video.PlaylistManager")
+    def test_update_meta_bulk_labels_fetch_errors(self, MockPlaylistManager, MockVideoManager, mock_get_credentials):
+        mock_get_credentials.return_value = MagicMock()
+
+        mock_idx_mgr = MockVideoManager.return_value
+        mock_idx_mgr.plan_metadata_updates.return_value = ({}, [], ["vid1", "vid2"])
+        MockPlaylistManager.return_value.get_video_ids_from_playlist.return_value = ["vid1", "vid2"]
+
+        result = runner.invoke(app, ["video", "update-meta", "all", "--title", "T", "--playlist", "MyList"])
+
+        self.assertEqual(result.exit_code, 1)
+        self.assertIn("Fetch error vid1", result.output)
+        self.assertNotIn("Not found", result.output)
+        self.assertIn("0 unchanged, 0 not found, 2 fetch errors", result.output)
+
     @patch("src.commands.video.get_credentials")
     @patch("src.commands.video.VideoManager")
     def test_update_meta_single_fail(self, MockVideoManager, mock_get_credentials):
@@ -334,6 +551,20 @@ class TestVideoCommand(unittest.TestCase):
         self.assertNotEqual(result.exit_code, 0)
         self.assertIn("Aborted", result.output)
 
+    @patch("src.commands.video.get_credentials")
+    @patch("src.commands.video.VideoManager")
+    def test_delete_videos_bulk(self, MockVideoManager, mock_get_credentials):
+        mock_get_credentials.return_value = MagicMock()
+        mock_idx_mgr = MockVideoManager.return_value
+        mock_idx_mgr.delete_videos.return_value = {"VID1": True, "VID2": False}
+
+        result = runner.invoke(app, ["video", "delete-video", "VID1", "VID2", "-y"])
+
+        self.assertEqual(result.exit_code, 1)
+        mock_idx_mgr.delete_videos.assert_called_once_with(["VID1", "VID2"])
+        mock_idx_mgr.delete_video.assert_not_called()
+        self.assertIn("1 success, 1 failed", result.output)
+
     @patch("src.commands.video.get_credentials")
     @patch("src.commands.video.VideoManager")
     def test_delete_video_fail(self, MockVideoManager, mock_get_credentials):
@@ -348,3 +579,44 @@ class TestVideoCommand(unittest.TestCase):
 
 if __name__ == "__main__":
     unittest.main()
+
+
+class TestVideoProcessingCommand(unittest.TestCase):
+
+    @patch("src.commands.video.HistoryManager")
+    @patch("src.commands.video.get_credentials")
+    @patch("src.commands.video.ProcessingPoller")
+    def test_processing_polls_pending_and_reports_failures(self, MockPoller, mock_get_credentials, MockHistory):
+        history = MockHistory.return_value
+        history.get_unprocessed_video_ids.return_value = ["vid1", "vid2"]
+        history.get_processing_states.return_value = [
+            {
+                "video_id": "vid1", "file_path": "/videos/a.mp4", "upload_status": "processed",
+                "processing_status": "succeeded", "failure_reason": None, "done": 1,
+            },
+            {
+                "video_id": "vid2", "file_path": "/videos/b.mp4", "upload_status": "rejected",
+                "processing_status": None, "failure_reason": "duplicate", "done": 1,
+            },
+        ]
+
+        result = runner.invoke(app, ["video", "processing", "--since", "2"])
+
+        self.assertEqual(result.exit_code, 1)
+        MockPoller.return_value.poll.assert_called_once_with(["vid1", "vid2"])
+        MockPoller.return_value.wait.assert_not_called()
+        self.assertIn("a.mp4", result.stdout)
+        self.assertIn("duplicate", result.stdout)
+
+    @patch("src.commands.video.HistoryManager")
+    @patch("src.commands.video.ProcessingPoller")
+    def test_processing_nothing_recent(self, MockPoller, MockHistory):
+        history = MockHistory.return_value
+        history.get_unprocessed_video_ids.return_value = []
+        history.get_processing_states.return_value = []
+
+        result = runner.invoke(app, ["video", "processing"])
+
+        self.assertEqual(result.exit_code, 0)
+        MockPoller.assert_not_called()
+        self.assertIn("No recent uploads found", result.stdout)
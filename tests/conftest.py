@@ -1,3 +1,14 @@
 # テスト共通フィクスチャ
-# 現在、グローバルなフィクスチャは未使用
-# 必要に応じてここに追加してください
+import pytest
+
+from src.lib.data import quota_ledger
+from src.lib.data.quota_ledger import QuotaLedger
+
+
+@pytest.fixture(autouse=True)
+def isolated_quota_ledger(tmp_path, monkeypatch):
+    """API 呼び出しの記録先を一時 DB にし、作業ディレクトリの履歴 DB を汚さない。"""
+    ledger = QuotaLedger(db_path=str(tmp_path / "quota_ledger.db"), profile="default", project="test-project")
+    monkeypatch.setattr(quota_ledger, "_ledger", ledger)
+    yield ledger
+    ledger.close()
@@ -53,7 +53,7 @@ def test_authenticate_new_profile(mock_flow, temp_tokens_dir):
     # Mock pickle.dump to avoid pickling the mock
     with patch("src.lib.auth.auth.config.auth.client_secrets_file", "dummy_secrets.json"), \
          patch("src.lib.auth.auth.os.path.exists", return_value=True), \
-         patch("src.lib.auth.auth.build"), \
+         patch("src.lib.auth.auth.build_service"), \
          patch("src.lib.auth.auth.pickle.dump"):
         
         authenticate_new_profile("test_user")
@@ -80,7 +80,7 @@ def test_logout(temp_tokens_dir):
     assert logout("non_existent") is False
 
 
-@patch("src.lib.auth.auth.build")
+@patch("src.lib.auth.auth.build_service")
 def test_get_authenticated_service(mock_build, temp_tokens_dir):
     # Create a dummy token for current profile
     token_path = temp_tokens_dir / "default.pickle"
@@ -97,7 +97,8 @@ def test_get_authenticated_service(mock_build, temp_tokens_dir):
              service = get_authenticated_service()
 
     assert service is not None
-    mock_build.assert_called_once()
+    # 台帳に記録する service を使う
+    mock_build.assert_called_once_with(mock_creds)
 
 
 def test_logout_active_profile(temp_tokens_dir):
@@ -109,7 +110,7 @@ def test_logout_active_profile(temp_tokens_dir):
     assert not token_path.exists()
 
 
-@patch("src.lib.auth.auth.build")
+@patch("src.lib.auth.auth.build_service")
 def test_get_authenticated_service_refresh_error(mock_build, temp_tokens_dir):
     token_path = temp_tokens_dir / "default.pickle"
     
@@ -140,7 +141,7 @@ def test_get_authenticated_service_refresh_error(mock_build, temp_tokens_dir):
         get_authenticated_service()
 
 
-@patch("src.lib.auth.auth.build")
+@patch("src.lib.auth.auth.build_service")
 def test_get_authenticated_service_missing_secrets(mock_build, temp_tokens_dir):
     # No token file
     # Missing secrets file
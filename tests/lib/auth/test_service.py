@@ -0,0 +1,143 @@
+import threading
+from unittest.mock import MagicMock, patch
+
+import pytest
+
+from src.lib.auth.service import LedgerHttpRequest, ServicePool
+
+
+@pytest.fixture
+def mock_build():
+    with patch("src.lib.auth.service.build") as mock:
+        mock.side_effect = lambda *args, **kwargs: MagicMock()
+        yield mock
+
+
+def test_get_builds_once_per_thread(mock_build):
+    pool = ServicePool()
+    creds = MagicMock()
+
+    first = pool.get(creds)
+    assert pool.get(creds) is first
+    mock_build.assert_called_once_with(
+        "youtube", "v3", credentials=creds, requestBuilder=LedgerHttpRequest, cache_discovery=False
+    )
+    assert pool.stats() == {"builds": 1, "reuses": 1}
+
+    other = []
+    t = threading.Thread(target=lambda: other.append(pool.get(creds)))
+    t.start()
+    t.join()
+    # Another thread gets its own service (httplib2 is not thread-safe)
+    assert other[0] is not first
+    assert pool.stats()["builds"] == 2
+
+
+def test_get_separates_credentials(mock_build):
+    pool = ServicePool()
+    assert pool.get(MagicMock()) is not pool.get(MagicMock())
+
+
+def test_lease_is_exclusive_and_reused(mock_build):
+    pool = ServicePool()
+    creds = MagicMock()
+
+    with pool.lease(creds) as a:
+        with pool.lease(creds) as b:
+            assert a is not b
+    with pool.lease(creds) as c:
+        assert c in (a, b)
+    assert pool.stats() == {"builds": 2, "reuses": 1}
+
+
+def test_lease_discards_service_on_error(mock_build):
+    pool = ServicePool()
+    creds = MagicMock()
+
+    with pytest.raises(RuntimeError):
+        with pool.lease(creds) as broken:
+            raise RuntimeError("connection reset")
+    with pool.lease(creds) as fresh:
+        assert fresh is not broken
+    assert pool.stats()["builds"] == 2
+
+
+def test_clear(mock_build):
+    pool = ServicePool()
+    creds = MagicMock()
+    first = pool.get(creds)
+    pool.clear()
+    assert pool.get(creds) is not first
+    assert pool.stats() == {"builds": 1, "reuses": 0}
+
+
+def _request(responses, method_id, media_body=None):
+    from googleapiclient.http import HttpMockSequence
+
+    return LedgerHttpRequest(
+        HttpMockSequence(responses),
+        lambda resp, content: content,
+        "https://youtube.googleapis.com/youtube/v3/videos",
+        method="POST" if media_body else "GET",
+        methodId=method_id,
+        resumable=media_body,
+    )
+
+
+def test_ledger_request_records_each_execute(isolated_quota_ledger):
+    request = _request([({"status": "200"}, b"{}"), ({"status": "200"}, b"{}")], "youtube.videos.list")
+    request.execute()
+    request.execute()
+
+    assert isolated_quota_ledger.usage_by_method(0) == [("youtube.videos.list", 2, 2)]
+
+
+def test_ledger_request_records_failed_calls(isolated_quota_ledger):
+    from googleapiclient.errors import HttpError
+
+    request = _request([({"status": "403"}, b"quotaExceeded")], "youtube.playlistItems.insert")
+    with pytest.raises(HttpError):
+        request.execute()
+
+    assert isolated_quota_ledger.used_units(0) == 50
+
+
+def test_ledger_request_records_resumable_upload_once(isolated_quota_ledger):
+    from googleapiclient.http import MediaInMemoryUpload
+
+    media = MediaInMemoryUpload(b"x" * 10, mimetype="video/mp4", chunksize=256 * 1024, resumable=True)
+    request = _request(
+        [
+            ({"status": "200", "location": "https://upload.example/session"}, b""),
+            ({"status": "200"}, b'{"id": "vid1"}'),
+        ],
+        "youtube.videos.insert",
+        media_body=media,
+    )
+    request.execute()
+
+    assert isolated_quota_ledger.usage_by_method(0) == [("youtube.videos.insert", 1, 1600)]
+
+
+def test_ledger_request_records_retried_session_start_once(isolated_quota_ledger):
+    from googleapiclient.errors import HttpError
+    from googleapiclient.http import MediaInMemoryUpload
+
+    media = MediaInMemoryUpload(b"x" * 10, mimetype="video/mp4", chunksize=256 * 1024, resumable=True)
+    request = _request(
+        [
+            ({"status": "503"}, b"backendError"),
+            ({"status": "200", "location": "https://upload.example/session"}, b""),
+            ({"status": "200"}, b'{"id": "vid1"}'),
+        ],
+        "youtube.videos.insert",
+        media_body=media,
+    )
+    with pytest.raises(HttpError):
+        request.next_chunk()
+    assert request.resumable_uri is None
+
+    _, response = request.next_chunk()
+
+    assert response == b'{"id": "vid1"}'
+    assert isolated_quota_ledger.usage_by_method(0) == [("youtube.videos.insert", 1, 1600)]
@@ -0,0 +1,75 @@
+import asyncio
+from datetime import datetime
+from unittest.mock import patch
+
+import pytest
+
+from src.lib.core.bandwidth import BandwidthLimiter
+from src.lib.core.config import BandwidthConfig
+
+
+def _config(default_mbps=0, schedule=None):
+    return BandwidthConfig(default_mbps=default_mbps, schedule=schedule or [])
+
+
+def _at(hour, minute=0):
+    return lambda: datetime(2024, 1, 1, hour, minute)
+
+
+def test_schedule_business_hours():
+    cfg = _config(schedule=[{"start": "09:00", "end": "18:00", "mbps": 20}])
+    assert BandwidthLimiter(cfg, clock=_at(10)).current_mbps() == 20
+    assert BandwidthLimiter(cfg, clock=_at(18)).current_mbps() == 0
+    assert BandwidthLimiter(cfg, clock=_at(3)).current_mbps() == 0
+
+
+def test_schedule_overnight_range():
+    cfg = _config(default_mbps=50, schedule=[{"start": "22:00", "end": "06:00", "mbps": 5}])
+    assert BandwidthLimiter(cfg, clock=_at(23)).current_mbps() == 5
+    assert BandwidthLimiter(cfg, clock=_at(2)).current_mbps() == 5
+    assert BandwidthLimiter(cfg, clock=_at(12)).current_mbps() == 50
+
+
+def test_schedule_change_applies_live():
+    now = [datetime(2024, 1, 1, 8, 59)]
+    cfg = _config(schedule=[{"start": "09:00", "end": "18:00", "mbps": 8}])
+    limiter = BandwidthLimiter(cfg, clock=lambda: now[0])
+    assert limiter._current_rate() == 0
+    now[0] = datetime(2024, 1, 1, 9, 0)
+    assert limiter._current_rate() == 1_000_000
+
+
+@pytest.mark.asyncio
+async def test_unlimited_does_not_wait():
+    limiter = BandwidthLimiter(_config())
+    with patch("src.lib.core.bandwidth.asyncio.sleep") as mock_sleep:
+        await limiter.acquire(10 * 1024 * 1024)
+        await limiter.acquire(10 * 1024 * 1024)
+    mock_sleep.assert_not_called()
+
+
+@pytest.mark.asyncio
+async def test_limited_rate_throttles():
+    # 8 Mbps = 1,000,000 bytes/s; the second 100 KB chunk pays the first one's debt
+    limiter = BandwidthLimiter(_config(default_mbps=8))
+    loop = asyncio.get_running_loop()
+    started = loop.time()
+    await limiter.acquire(100_000)
+    await limiter.acquire(100_000)
+    assert loop.time() - started >= 0.09
+
+
+@pytest.mark.asyncio
+async def test_waiters_served_in_order():
+    limiter = BandwidthLimiter(_config(default_mbps=80))
+    order = []
+
+    async def worker(name):
+        for _ in range(2):
+            await limiter.acquire(50_000)
+            order.append(name)
+            await asyncio.sleep(0)  # the chunk is sent
+
+    await asyncio.gather(worker("big"), worker("small"))
+    # Chunks are interleaved instead of one file draining the bucket
+    assert order == ["big", "small", "big", "small"]
@@ -0,0 +1,110 @@
+import asyncio
+from unittest.mock import patch
+
+import pytest
+
+from src.lib.core.concurrency import AdaptiveConcurrencyController
+
+
+def test_initial_limit_clamped_to_bounds():
+    assert AdaptiveConcurrencyController(10, min_limit=1, max_limit=4).limit == 4
+    assert AdaptiveConcurrencyController(1, min_limit=2, max_limit=4).limit == 2
+    # Without an explicit max, --workers is the ceiling (static behavior)
+    ctrl = AdaptiveConcurrencyController(3, min_limit=3)
+    assert ctrl.limit == 3
+    assert not ctrl.adaptive
+
+
+def test_additive_increase_while_throughput_improves():
+    ctrl = AdaptiveConcurrencyController(1, min_limit=1, max_limit=3)
+    with patch("src.lib.core.concurrency.time.monotonic", side_effect=[0, 10, 10, 20, 20]):
+        ctrl._reset_window()
+        ctrl.record_success(100)  # 10 B/s -> probe up
+        assert ctrl.limit == 2
+        ctrl.record_success(150)
+        ctrl.record_success(150)  # 30 B/s -> still improving
+    assert ctrl.limit == 3
+
+
+def test_step_back_when_extra_slot_brings_no_gain():
+    ctrl = AdaptiveConcurrencyController(1, min_limit=1, max_limit=4)
+    with patch("src.lib.core.concurrency.time.monotonic", side_effect=[0, 10, 10, 20, 20]):
+        ctrl._reset_window()
+        ctrl.record_success(100)
+        assert ctrl.limit == 2
+        ctrl.record_success(50)
+        ctrl.record_success(50)  # same 10 B/s with 2 slots
+    assert ctrl.limit == 1
+
+
+def test_step_back_when_chunk_latency_rises():
+    ctrl = AdaptiveConcurrencyController(1, min_limit=1, max_limit=4)
+    with patch("src.lib.core.concurrency.time.monotonic", side_effect=[0, 10, 10, 20, 20, 30, 30]):
+        ctrl._reset_window()
+        ctrl.record_latency(1.0, 100)  # baseline 0.01 s/B
+        ctrl.record_success(100)
+        assert ctrl.limit == 2
+        ctrl.record_latency(1.5, 100)  # 1.5x: below latency_factor
+        ctrl.record_success(150)
+        ctrl.record_success(150)
+        assert ctrl.limit == 3
+        for _ in range(3):
+            ctrl.record_latency(4.0, 100)  # 4x baseline even though throughput still grows
+        for _ in range(3):
+            ctrl.record_success(300)
+    assert ctrl.limit == 2
+
+
+def test_latency_is_compared_per_byte():
+    ctrl = AdaptiveConcurrencyController(1, min_limit=1, max_limit=3)
+    with patch("src.lib.core.concurrency.time.monotonic", side_effect=[0, 10, 10, 20, 20]):
+        ctrl._reset_window()
+        ctrl.record_latency(1.0, 100)
+        ctrl.record_success(100)
+        ctrl.record_latency(0.1, 5)  # short last chunk: same rate
+        ctrl.record_latency(1.0, 100)
+        ctrl.record_success(150)
+        ctrl.record_success(150)
+    assert ctrl.limit == 3
+
+
+def test_multiplicative_decrease_on_error():
+    ctrl = AdaptiveConcurrencyController(8, min_limit=1, max_limit=8)
+    ctrl.record_error(Exception("429"))
+    assert ctrl.limit == 4
+    # A burst from the same overload only cuts once per window
+    ctrl.record_error(Exception("429"))
+    assert ctrl.limit == 4
+    ctrl.record_success(100)
+    ctrl.record_error(Exception("503"))
+    assert ctrl.limit == 2
+
+
+def test_decrease_respects_min_limit():
+    ctrl = AdaptiveConcurrencyController(2, min_limit=2, max_limit=6)
+    ctrl.record_error(Exception("500"))
+    assert ctrl.limit == 2
+
+
+def test_static_bounds_never_change():
+    ctrl = AdaptiveConcurrencyController(2, min_limit=2, max_limit=2)
+    ctrl.record_error(Exception("500"))
+    ctrl.record_success(100)
+    ctrl.record_success(100)
+    assert ctrl.limit == 2
+
+
+@pytest.mark.asyncio
+async def test_limits_active_tasks():
+    ctrl = AdaptiveConcurrencyController(2, min_limit=1, max_limit=2)
+    peak = 0
+
+    async def worker():
+        nonlocal peak
+        async with ctrl:
+            peak = max(peak, ctrl.active)
+            await asyncio.sleep(0.01)
+
+    await asyncio.gather(*(worker() for _ in range(6)))
+    assert peak == 2
+    assert ctrl.active == 0
@@ -0,0 +1,100 @@
+import asyncio
+import sqlite3
+import time
+from unittest.mock import patch
+
+import pytest
+
+from src.lib.core.config import GovernorConfig
+from src.lib.core.governor import HostGovernor
+
+
+@pytest.fixture
+def governor_config(tmp_path):
+    return GovernorConfig(
+        enabled=True,
+        db_path=str(tmp_path / "gov" / "governor.db"),
+        max_uploads=2,
+        total_mbps=0,
+    )
+
+
+def _slot_count(db_path):
+    conn = sqlite3.connect(db_path)
+    try:
+        return conn.execute("SELECT COUNT(*) FROM upload_slots").fetchone()[0]
+    finally:
+        conn.close()
+
+
+def test_slots_shared_between_instances(governor_config):
+    # Two governors on the same file behave like two yt-up processes
+    a = HostGovernor(governor_config)
+    b = HostGovernor(governor_config)
+
+    assert a._try_acquire_slot("t1") == 0
+    assert b._try_acquire_slot("t2") == 0
+    assert a._try_acquire_slot("t3") == 2
+
+    b._release_slot("t2")
+    assert a._try_acquire_slot("t3") == 0
+
+
+def test_stale_slots_reclaimed(governor_config):
+    gov = HostGovernor(governor_config)
+    gov._try_acquire_slot("t1")
+    gov._try_acquire_slot("t2")
+
+    # The owning process died
+    with patch("src.lib.core.governor._pid_alive", return_value=False):
+        assert gov._try_acquire_slot("t3") == 0
+    assert _slot_count(gov.db_path) == 1
+
+
+def test_expired_lease_reclaimed(governor_config):
+    gov = HostGovernor(governor_config)
+    gov._try_acquire_slot("t1")
+    gov._try_acquire_slot("t2")
+
+    with patch("src.lib.core.governor.time.time", return_value=time.time() + 10_000):
+        assert gov._try_acquire_slot("t3") == 0
+
+
+@pytest.mark.asyncio
+async def test_slot_context_limits_concurrency(governor_config):
+    gov = HostGovernor(governor_config)
+    active = 0
+    peak = 0
+
+    async def worker():
+        nonlocal active, peak
+        async with gov.slot():
+            active += 1
+            peak = max(peak, active)
+            await asyncio.sleep(0.05)
+            active -= 1
+
+    with patch("src.lib.core.governor._POLL_INTERVAL", 0.01):
+        await asyncio.gather(*(worker() for _ in range(4)))
+
+    assert peak == 2
+    assert _slot_count(gov.db_path) == 0
+
+
+@pytest.mark.asyncio
+async def test_bandwidth_unlimited_skips_db(governor_config):
+    gov = HostGovernor(governor_config)
+    with patch.object(gov, "_try_take_tokens") as mock_take:
+        await gov.acquire_bandwidth(1024)
+    mock_take.assert_not_called()
+
+
+def test_bandwidth_bucket_shared(governor_config):
+    governor_config.total_mbps = 8  # 1,000,000 bytes/s
+    a = HostGovernor(governor_config)
+    b = HostGovernor(governor_config)
+    rate = 1_000_000
+
+    assert a._try_take_tokens(500_000, rate) == 0
+    # The other process sees the debt and has to wait
+    assert b._try_take_tokens(500_000, rate) > 0
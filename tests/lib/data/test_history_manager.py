@@ -1,5 +1,6 @@
 import json
 import os
+import sqlite3
 import tempfile
 from pathlib import Path
 from typing import Generator
@@ -164,6 +165,40 @@ def test_delete_by_path_and_video(history: HistoryManager):
     assert history.get_record("h2") is None
 
 
+def test_delete_records_by_video_ids(history: HistoryManager):
+    for i in range(3):
+        history.add_record(f"/tmp/b{i}.mp4", f"bh{i}", f"bv{i}", {})
+
+    history.add_record("/tmp/b0-copy.mp4", "bh0-copy", "bv0", {})  # 同じ動画のレコードが2件
+
+    assert history.delete_records_by_video_ids(["bv0", "bv2", "missing"]) == {"bv0", "bv2"}
+    assert history.get_upload_count() == 1
+    assert history.get_record("bh1") is not None
+    assert history.delete_records_by_video_ids([]) == set()
+
+
+def test_get_success_records_and_update_metadata_bulk(history: HistoryManager):
+    history.add_record("/tmp/s1.mp4", "sh1", "sv1", {"title": "Old"})
+    history.add_record("/tmp/s2.mp4", "sh2", "sv2", {"title": "Keep"})
+    history.add_failure("/tmp/f.mp4", "fh", "error")
+
+    assert {r["video_id"] for r in history.get_success_records()} == {"sv1", "sv2"}
+
+    assert history.update_metadata_bulk({"sh1": {"title": "New"}}) == 1
+    assert history.get_record("sh1")["metadata"] == {"title": "New"}
+    assert history.get_record("sh2")["metadata"] == {"title": "Keep"}
+
+
+def test_iter_success_video_paths(history: HistoryManager):
+    for i in range(5):
+        history.add_record(f"/tmp/p{i}.mp4", f"ph{i}", f"pv{i}", {"title": "x"})
+    history.add_failure("/tmp/f.mp4", "fh", "error")
+
+    pairs = list(history.iter_success_video_paths(batch_size=2))
+
+    assert sorted(pairs) == [(f"pv{i}", f"/tmp/p{i}.mp4") for i in range(5)]
+
+
 # === Export / Import テスト ===
 
 def test_export_records_json(history: HistoryManager):
@@ -300,3 +335,85 @@ def test_migrate_from_tinydb(tmp_path):
         assert record2["error"] == "Quota Exceeded"
     finally:
         hm.close()
+
+
+# === 処理状況 ===
+
+def test_unprocessed_video_ids_excludes_done_and_old(history: HistoryManager):
+    history.add_record("/tmp/a.mp4", "hash_a", "vidA", {})
+    history.add_record("/tmp/b.mp4", "hash_b", "vidB", {})
+    history.add_record("/tmp/c.mp4", "hash_c", "vidC", {})
+    history.add_failure("/tmp/d.mp4", "hash_d", "error")
+    history.conn.execute("UPDATE uploads SET timestamp = 100 WHERE video_id = 'vidC'")
+    history.conn.commit()
+
+    history.update_processing_states({
+        "vidA": {"upload_status": "processed", "processing_status": "succeeded", "done": True},
+        "vidB": {"upload_status": "uploaded", "processing_status": "processing", "done": False},
+    })
+
+    assert history.get_unprocessed_video_ids(since=1000) == ["vidB"]
+    assert set(history.get_unprocessed_video_ids()) == {"vidB", "vidC"}
+
+
+def test_get_processing_states(history: HistoryManager):
+    history.add_record("/tmp/a.mp4", "hash_a", "vidA", {})
+    history.add_record("/tmp/b.mp4", "hash_b", "vidB", {})
+    history.update_processing_states({
+        "vidA": {
+            "upload_status": "rejected", "processing_status": None,
+            "failure_reason": "duplicate", "done": True,
+        },
+    })
+
+    rows = {r["video_id"]: r for r in history.get_processing_states()}
+    assert rows["vidA"]["upload_status"] == "rejected"
+    assert rows["vidA"]["failure_reason"] == "duplicate"
+    assert rows["vidA"]["done"] == 1
+    assert rows["vidA"]["file_path"] == "/tmp/a.mp4"
+    assert rows["vidB"]["upload_status"] is None
+    assert rows["vidB"]["done"] == 0
+
+
+def test_get_upload_stats(history: HistoryManager):
+    history.add_record("/tmp/a.mp4", "hash_a", "vidA", {}, file_size=100)
+    history.add_record("/tmp/b.mp4", "hash_b", "vidB", {}, file_size=200)
+    history.add_failure("/tmp/c.mp4", "hash_c", "error", file_size=400)
+    history.conn.execute("UPDATE uploads SET timestamp = 100 WHERE video_id = 'vidB'")
+    history.conn.commit()
+
+    assert history.get_upload_stats(since=1000) == (1, 100)
+    assert history.get_upload_stats() == (2, 300)
+
+
+def test_reconciled_records_are_not_counted_as_uploads(history: HistoryManager):
+    history.add_record("/tmp/a.mp4", "hash_a", "vidA", {}, file_size=100)
+    history.add_record("/tmp/b.mp4", "hash_b", "vidB", {}, file_size=200, reconciled=True)
+
+    assert history.get_upload_stats() == (1, 100)
+    assert history.get_unprocessed_video_ids() == ["vidA"]
+    assert [r["video_id"] for r in history.get_processing_states()] == ["vidA"]
+    # sync の比較や重複判定には含まれる
+    assert history.is_uploaded("hash_b")
+    assert dict(history.iter_success_video_paths())["vidB"] == "/tmp/b.mp4"
+
+
+def test_old_db_gets_reconciled_column(tmp_path):
+    db_path = str(tmp_path / "old.db")
+    conn = sqlite3.connect(db_path)
+    conn.execute(
+        "CREATE TABLE uploads (id INTEGER PRIMARY KEY AUTOINCREMENT, file_path TEXT NOT NULL, "
+        "file_hash TEXT NOT NULL, video_id TEXT, metadata TEXT DEFAULT '{}', timestamp REAL DEFAULT 0, "
+        "status TEXT DEFAULT 'success', error TEXT, playlist_name TEXT, file_size INTEGER DEFAULT 0)"
+    )
+    conn.execute("INSERT INTO uploads (file_path, file_hash, video_id, timestamp) VALUES ('/a.mp4', 'h', 'vidA', 1)")
+    conn.commit()
+    conn.close()
+
+    hm = HistoryManager(db_path=db_path)
+    try:
+        assert hm.get_upload_stats() == (1, 0)
+        hm.add_record("/b.mp4", "h2", "vidB", {}, reconciled=True)
+        assert hm.get_upload_stats() == (1, 0)
+    finally:
+        hm.close()
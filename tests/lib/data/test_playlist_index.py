@@ -0,0 +1,89 @@
+import time
+from pathlib import Path
+
+import pytest
+
+from src.lib.data.playlist_index import PlaylistIndex
+
+
+@pytest.fixture
+def index(tmp_path: Path):
+    idx = PlaylistIndex(db_path=str(tmp_path / "history.db"), channel="default")
+    yield idx
+    idx.close()
+
+
+def _page(token, next_token, etag, ids):
+    return {"page_token": token, "next_page_token": next_token, "etag": etag, "playlist_ids": ids}
+
+
+def test_replace_and_read(index: PlaylistIndex):
+    assert not index.is_fresh(3600)
+    assert index.playlists() == {}
+
+    pages = [_page(None, "T2", "e1", ["PL1"]), _page("T2", None, "e2", ["PL2"])]
+    index.replace(pages, {"PL1": "Trip", "PL2": "Food"})
+
+    assert index.is_fresh(3600)
+    assert not index.is_fresh(0)
+    assert index.playlists() == {"PL1": "Trip", "PL2": "Food"}
+    assert index.pages() == pages
+
+
+def test_upsert_updates_in_place(index: PlaylistIndex):
+    index.replace([_page(None, None, "e1", ["PL1"])], {"PL1": "Trip"})
+
+    index.upsert("PL1", "Trip 2024")
+    index.upsert("PL9", "New")
+
+    assert index.playlists() == {"PL1": "Trip 2024", "PL9": "New"}
+
+
+def test_playlists_keeps_duplicate_titles(index: PlaylistIndex):
+    index.replace([_page(None, None, "e1", ["PL1", "PL2"])], {"PL1": "Trip", "PL2": "Trip"})
+
+    assert index.playlists() == {"PL1": "Trip", "PL2": "Trip"}
+
+
+def test_ttl(index: PlaylistIndex):
+    index.replace([], {})
+    index._connection().execute(
+        "UPDATE playlist_index_state SET refreshed_at = ?", (time.time() - 100,)
+    )
+    assert index.is_fresh(3600)
+    assert not index.is_fresh(50)
+
+
+def test_channels_are_separate(tmp_path: Path):
+    db_path = str(tmp_path / "history.db")
+    a = PlaylistIndex(db_path=db_path, channel="a")
+    b = PlaylistIndex(db_path=db_path, channel="b")
+    a.replace([], {"PL1": "Trip"})
+
+    assert b.playlists() == {}
+    assert not b.is_fresh(3600)
+    a.close()
+    b.close()
+
+
+def test_playlist_items_positions(index: PlaylistIndex):
+    index.replace_items("PL1", [
+        {"video_id": "v1", "item_id": "i1", "position": 0},
+        {"video_id": "v2", "item_id": "i2", "position": 1},
+        {"video_id": "v3", "item_id": "i3", "position": 2},
+    ])
+    assert index.items_loaded("PL1", 3600)
+    assert not index.items_loaded("PL2", 3600)
+    assert index.find_item("PL1", "v2") == "i2"
+    assert index.find_item("PL1", "v9") is None
+
+    index.remove_item("i1")
+    index.add_item("PL1", "v4", "i4", 0)
+    rows = index._connection().execute(
+        "SELECT video_id, position FROM playlist_items WHERE playlist_id = 'PL1' ORDER BY position"
+    ).fetchall()
+    assert rows == [("v4", 0), ("v2", 1), ("v3", 2)]
+
+    # 丸ごと置き換え
+    index.replace_items("PL1", [])
+    assert index.find_item("PL1", "v2") is None
@@ -0,0 +1,61 @@
+import time
+from pathlib import Path
+from typing import Generator
+from unittest.mock import patch
+
+import pytest
+
+from src.lib.data.quota import (
+    COST_LIST,
+    COST_VIDEO_UPLOAD,
+    COST_WRITE,
+    cost_of,
+    estimate_remaining_units,
+    estimate_used_units_today,
+    list_calls_for,
+)
+from src.lib.data.quota_ledger import QuotaLedger
+
+
+@pytest.fixture
+def ledger(tmp_path: Path) -> Generator[QuotaLedger, None, None]:
+    ledger = QuotaLedger(db_path=str(tmp_path / "history.db"), profile="default", project="proj")
+    yield ledger
+    ledger.close()
+
+
+def test_list_calls_for():
+    assert list_calls_for(0) == 0
+    assert list_calls_for(50) == 1
+    assert list_calls_for(51) == 2
+
+
+def test_cost_of():
+    assert cost_of("youtube.videos.insert") == COST_VIDEO_UPLOAD
+    assert cost_of("youtube.playlistItems.list") == COST_LIST
+    assert cost_of("youtube.thumbnails.set") == COST_WRITE
+    assert cost_of("youtube.playlistItems.insert") == COST_WRITE
+
+
+def test_estimate_used_units_today(ledger: QuotaLedger):
+    ledger.record("youtube.videos.insert", COST_VIDEO_UPLOAD)
+    ledger.record("youtube.playlistItems.insert", 50)
+    ledger.record("youtube.videos.list", 1)
+    # 昨日の呼び出しは数えない
+    ledger.record("youtube.videos.insert", COST_VIDEO_UPLOAD, timestamp=time.time() - 2 * 86400)
+
+    assert estimate_used_units_today(ledger) == COST_VIDEO_UPLOAD + 51
+
+
+def test_estimate_used_units_today_defaults_to_process_ledger(isolated_quota_ledger: QuotaLedger):
+    isolated_quota_ledger.record("youtube.videos.update", 50)
+    assert estimate_used_units_today() == 50
+
+
+def test_estimate_remaining_units(ledger: QuotaLedger):
+    ledger.record("youtube.videos.insert", COST_VIDEO_UPLOAD)
+    with patch("src.lib.data.quota.config") as mock_config:
+        mock_config.upload.daily_quota_limit = 2000
+        assert estimate_remaining_units(ledger) == 400
+        mock_config.upload.daily_quota_limit = 1000
+        assert estimate_remaining_units(ledger) == 0
@@ -0,0 +1,71 @@
+import json
+import time
+from pathlib import Path
+from unittest.mock import patch
+
+import pytest
+
+from src.lib.data.quota_ledger import QuotaLedger
+
+
+@pytest.fixture
+def ledger(tmp_path: Path):
+    ledger = QuotaLedger(db_path=str(tmp_path / "history.db"), profile="main", project="proj-a")
+    yield ledger
+    ledger.close()
+
+
+def test_record_and_aggregate(ledger: QuotaLedger):
+    ledger.record("youtube.videos.insert", 1600)
+    ledger.record("youtube.playlistItems.insert", 50)
+    ledger.record("youtube.playlistItems.insert", 50)
+    ledger.record("youtube.videos.list", 1)
+    ledger.record("youtube.videos.list", 1, timestamp=100)  # 古い呼び出し
+
+    since = time.time() - 60
+    assert ledger.used_units(since) == 1701
+    assert ledger.usage_by_method(since) == [
+        ("youtube.videos.insert", 1, 1600),
+        ("youtube.playlistItems.insert", 2, 100),
+        ("youtube.videos.list", 1, 1),
+    ]
+    assert ledger.used_units(0) == 1702
+
+
+def test_aggregates_per_project(tmp_path: Path):
+    db_path = str(tmp_path / "history.db")
+    a = QuotaLedger(db_path=db_path, profile="main", project="proj-a")
+    b = QuotaLedger(db_path=db_path, profile="sub", project="proj-b")
+    c = QuotaLedger(db_path=db_path, profile="sub", project="proj-a")
+    a.record("youtube.videos.insert", 1600)
+    b.record("youtube.videos.insert", 1600)
+    c.record("youtube.videos.update", 50)
+
+    # クォータはプロジェクト単位: 別プロファイルでも同じプロジェクトなら合算する
+    assert a.used_units(0) == 1650
+    assert b.used_units(0) == 1600
+    for ledger in (a, b, c):
+        ledger.close()
+
+
+def test_project_from_client_secrets(tmp_path: Path):
+    secrets = tmp_path / "client_secrets.json"
+    secrets.write_text(json.dumps({"installed": {"client_id": "x", "project_id": "my-project"}}))
+    ledger = QuotaLedger(db_path=str(tmp_path / "history.db"), profile="main")
+
+    with patch("src.lib.data.quota_ledger.config") as mock_config:
+        mock_config.auth.client_secrets_file = str(secrets)
+        assert ledger.project == "my-project"
+
+
+def test_project_missing_client_secrets(tmp_path: Path):
+    ledger = QuotaLedger(db_path=str(tmp_path / "history.db"), profile="main")
+    with patch("src.lib.data.quota_ledger.config") as mock_config:
+        mock_config.auth.client_secrets_file = str(tmp_path / "missing.json")
+        assert ledger.project == ""
+
+
+def test_record_failure_does_not_raise(ledger: QuotaLedger):
+    ledger.record("youtube.videos.list", 1)
+    ledger._conn.close()
+    ledger.record("youtube.videos.list", 1)  # closed connection: logged, not raised
@@ -0,0 +1,188 @@
+from pathlib import Path
+from unittest.mock import MagicMock, patch
+
+import pytest
+
+from src.lib.data.remote_catalog import RemoteCatalog
+
+
+@pytest.fixture
+def catalog(tmp_path: Path):
+    cat = RemoteCatalog(db_path=str(tmp_path / "history.db"), channel="default")
+    yield cat
+    cat.close()
+
+
+def _item(vid):
+    return {"snippet": {"title": f"Title {vid}"}, "contentDetails": {"videoId": vid}}
+
+
+def _service(video_ids, page_size=2):
+    """uploads プレイリストを新しい順に video_ids で返すフェイク service。"""
+    service = MagicMock()
+    service.channels().list().execute.return_value = {
+        "items": [{"contentDetails": {"relatedPlaylists": {"uploads": "UU1"}}}]
+    }
+
+    def list_items(playlistId, part, maxResults, pageToken=None, fields=None):
+        start = int(pageToken or 0)
+        page = video_ids[start:start + page_size]
+        response = {"items": [_item(v) for v in page]}
+        if start + page_size < len(video_ids):
+            response["nextPageToken"] = str(start + page_size)
+        request = MagicMock()
+        request.execute.return_value = response
+        return request
+
+    def list_videos(id, part, fields=None):
+        request = MagicMock()
+        request.execute.return_value = {
+            "items": [{"id": v, "status": {"privacyStatus": "private"}} for v in id.split(",")]
+        }
+        return request
+
+    service.playlistItems().list.side_effect = list_items
+    service.videos().list.side_effect = list_videos
+    return service
+
+
+def test_first_refresh_is_full(catalog: RemoteCatalog):
+    service = _service(["v3", "v2", "v1"])
+
+    assert catalog.refresh(service) == 3
+
+    assert [v["id"] for v in catalog.videos()] == ["v3", "v2", "v1"]
+    assert catalog.videos()[0] == {"id": "v3", "title": "Title v3", "privacy": "private"}
+
+
+def test_incremental_refresh_stops_at_known_video(catalog: RemoteCatalog):
+    catalog.refresh(_service(["v3", "v2", "v1"]))
+    service = _service(["v6", "v5", "v4", "v3", "v2", "v1"])
+
+    with patch("src.lib.data.remote_catalog.config") as mock_config:
+        mock_config.api.remote_catalog_ttl = 0
+        mock_config.api.remote_catalog_full_refresh = 86400
+        assert catalog.refresh(service) == 3
+
+    # 2ページ目 (v4, v3) で既知の v3 に到達して打ち切る
+    assert service.playlistItems().list.call_count == 2
+    assert [v["id"] for v in catalog.videos()] == ["v6", "v5", "v4", "v3", "v2", "v1"]
+
+
+def test_refresh_skipped_within_ttl(catalog: RemoteCatalog):
+    catalog.refresh(_service(["v1"]))
+    service = _service(["v2", "v1"])
+
+    assert catalog.refresh(service) == 0
+
+    service.playlistItems().list.assert_not_called()
+    assert [v["id"] for v in catalog.videos()] == ["v1"]
+
+
+def test_full_refresh_drops_deleted_videos(catalog: RemoteCatalog):
+    catalog.refresh(_service(["v3", "v2", "v1"]))
+
+    assert catalog.refresh(_service(["v4", "v3", "v1"]), full=True) == 3
+
+    assert [v["id"] for v in catalog.videos()] == ["v4", "v3", "v1"]
+
+
+def test_local_updates(catalog: RemoteCatalog):
+    catalog.refresh(_service(["v2", "v1"]))
+
+    catalog.update_privacy(["v1"], "public")
+    catalog.update_titles({"v2": "Renamed"})
+    catalog.remove(["v9"])
+
+    assert catalog.videos() == [
+        {"id": "v2", "title": "Renamed", "privacy": "private"},
+        {"id": "v1", "title": "Title v1", "privacy": "public"},
+    ]
+
+    catalog.remove(["v2"])
+    assert catalog.video_ids() == {"v1"}
+
+
+def test_refresh_streams_ids_to_enricher(catalog: RemoteCatalog):
+    service = _service(["v3", "v2", "v1"])
+    enricher = MagicMock()
+    added = []
+    enricher.add.side_effect = lambda ids: added.append(list(ids))
+    enricher.results.return_value = {
+        v: {"id": v, "status": {"privacyStatus": "unlisted"}} for v in ("v3", "v2", "v1")
+    }
+
+    catalog.refresh(service, enricher=enricher)
+
+    # ページごとに渡される
+    assert added == [["v3", "v2"], ["v1"]]
+    service.videos().list.assert_not_called()
+    assert {v["privacy"] for v in catalog.videos()} == {"unlisted"}
+
+
+def test_iter_videos_filters_and_limits_in_sql(catalog: RemoteCatalog):
+    catalog.refresh(_service(["v4", "v3", "v2", "v1"]))
+    catalog.update_privacy(["v3", "v1"], "public")
+
+    assert [v["id"] for v in catalog.iter_videos(privacy="public")] == ["v3", "v1"]
+    assert [v["id"] for v in catalog.iter_videos(limit=3, batch_size=2)] == ["v4", "v3", "v2"]
+    assert list(catalog.iter_videos(privacy="unlisted")) == []
+
+
+def test_add_puts_video_first(catalog: RemoteCatalog):
+    catalog.refresh(_service(["v2", "v1"]))
+    catalog.add("v3", "Uploaded", "private")
+
+    assert catalog.videos()[0] == {"id": "v3", "title": "Uploaded", "privacy": "private"}
+    # 自分で追加した動画では打ち切らず、その前に Web からアップロードされた動画も取り込む
+    with patch("src.lib.data.remote_catalog.config") as mock_config:
+        mock_config.api.remote_catalog_ttl = 0
+        mock_config.api.remote_catalog_full_refresh = 86400
+        assert catalog.refresh(_service(["v3", "web", "v2", "v1"])) == 2
+        assert [v["id"] for v in catalog.videos()] == ["v3", "web", "v2", "v1"]
+        # 一覧で確認された後は通常どおり打ち切りの目印になる
+        assert catalog.refresh(_service(["v3", "web", "v2", "v1"])) == 0
+
+
+def test_old_mirror_gets_local_only_column(tmp_path: Path):
+    import sqlite3
+
+    db_path = str(tmp_path / "history.db")
+    conn = sqlite3.connect(db_path)
+    conn.execute(
+        "CREATE TABLE remote_videos (channel TEXT NOT NULL, video_id TEXT NOT NULL, title TEXT, "
+        "privacy TEXT, published_at TEXT, seq INTEGER NOT NULL, PRIMARY KEY (channel, video_id))"
+    )
+    conn.execute("INSERT INTO remote_videos VALUES ('default', 'v1', 'T', 'public', NULL, 0)")
+    conn.commit()
+    conn.close()
+
+    catalog = RemoteCatalog(db_path=db_path, channel="default")
+    catalog.add("v2", "New", "private")
+
+    assert catalog.video_ids(confirmed_only=True) == {"v1"}
+    catalog.close()
+
+
+def test_full_refresh_due(catalog: RemoteCatalog):
+    assert catalog.full_refresh_due()
+
+    catalog.refresh(_service(["v1"]))
+    assert not catalog.full_refresh_due()
+    assert catalog.full_refresh_due(full=True)
+    with patch("src.lib.data.remote_catalog.config") as mock_config:
+        mock_config.api.remote_catalog_ttl = 0
+        mock_config.api.remote_catalog_full_refresh = 0
+        assert catalog.full_refresh_due()
+
+
+def test_replace_counts_as_full_refresh(catalog: RemoteCatalog):
+    catalog.refresh(_service(["v2", "v1"]))
+
+    catalog.replace("UU1", [
+        {"id": "v3", "title": "T3", "privacy": "public"},
+        {"id": "v1", "title": "T1", "privacy": "private"},
+    ])
+
+    assert [v["id"] for v in catalog.videos()] == ["v3", "v1"]
+    assert not catalog.full_refresh_due()
@@ -0,0 +1,150 @@
+from unittest.mock import MagicMock, patch
+
+import httplib2
+import pytest
+from googleapiclient.errors import HttpError
+
+from src.lib.video.batch import BatchExecutor
+
+
+def _http_error(status, content=b"Error"):
+    return HttpError(httplib2.Response({"status": str(status)}), content)
+
+
+class FakeBatch:
+    """Mimics BatchHttpRequest: calls the callback per added request on execute()."""
+
+    def __init__(self, callback, outcomes):
+        self.callback = callback
+        self.outcomes = outcomes
+        self.requests = []
+
+    def add(self, request, request_id):
+        self.requests.append((request_id, request))
+
+    def execute(self):
+        for request_id, request in self.requests:
+            result = self.outcomes(request)
+            if isinstance(result, Exception):
+                self.callback(request_id, None, result)
+            else:
+                self.callback(request_id, result, None)
+
+
+@pytest.fixture
+def service():
+    with patch("src.lib.video.batch.get_service") as mock_get_service:
+        svc = MagicMock()
+        mock_get_service.return_value = svc
+        yield svc
+
+
+def _install_batches(service, outcomes):
+    batches = []
+
+    def new_batch(callback):
+        batch = FakeBatch(callback, outcomes)
+        batches.append(batch)
+        return batch
+
+    service.new_batch_http_request.side_effect = new_batch
+    return batches
+
+
+def test_batch_mode_groups_requests(service):
+    batches = _install_batches(service, lambda request: {"id": request})
+    ops = [(f"vid{i}", lambda svc, i=i: f"req{i}") for i in range(120)]
+
+    outcomes = BatchExecutor(MagicMock(), mode="batch", batch_size=50).execute(ops)
+
+    assert sorted(len(b.requests) for b in batches) == [20, 50, 50]
+    assert list(outcomes) == [f"vid{i}" for i in range(120)]
+    assert outcomes["vid7"] == {"ok": True, "response": {"id": "req7"}, "error": None}
+
+
+@patch("src.lib.video.batch.time.sleep")
+def test_batch_mode_retries_retryable_items(mock_sleep, service):
+    attempts = {}
+
+    def outcomes(request):
+        attempts[request] = attempts.get(request, 0) + 1
+        if request == "flaky" and attempts[request] == 1:
+            return _http_error(503)
+        if request == "bad":
+            return _http_error(404)
+        return {}
+
+    batches = _install_batches(service, outcomes)
+    ops = [(key, lambda svc, key=key: key) for key in ["ok", "flaky", "bad"]]
+
+    results = BatchExecutor(MagicMock(), mode="batch", retry_count=2).execute(ops)
+
+    assert results["ok"]["ok"] and results["flaky"]["ok"]
+    assert not results["bad"]["ok"]
+    assert isinstance(results["bad"]["error"], HttpError)
+    # Only the retryable item goes into the second batch
+    assert [r for _, r in batches[1].requests] == ["flaky"]
+    mock_sleep.assert_called_once()
+
+
+def test_batch_mode_records_each_call(service):
+    _install_batches(service, lambda request: {})
+    ops = [(f"vid{i}", lambda svc, i=i: f"req{i}") for i in range(3)]
+
+    with patch("src.lib.video.batch.record_call") as mock_record:
+        BatchExecutor(MagicMock(), mode="batch").execute(ops)
+
+    assert [c.args[0] for c in mock_record.call_args_list] == ["req0", "req1", "req2"]
+
+
+def test_batch_level_failure_marks_all_items(service):
+    batch = MagicMock()
+    batch.execute.side_effect = _http_error(400)
+    service.new_batch_http_request.return_value = batch
+
+    results = BatchExecutor(MagicMock(), mode="batch", retry_count=0).execute(
+        [("a", lambda svc: "req_a"), ("b", lambda svc: "req_b")]
+    )
+
+    assert not results["a"]["ok"] and not results["b"]["ok"]
+
+
+def test_batch_failure_after_partial_send_records_answered_calls(service):
+    class PartialBatch(FakeBatch):
+        def execute(self):
+            # 1件目の応答の後で接続が切れる
+            self.callback(self.requests[0][0], {}, None)
+            raise ConnectionResetError("reset")
+
+    service.new_batch_http_request.side_effect = lambda callback: PartialBatch(callback, None)
+    ops = [(f"vid{i}", lambda svc, i=i: f"req{i}") for i in range(3)]
+
+    with patch("src.lib.video.batch.record_call") as mock_record:
+        results = BatchExecutor(MagicMock(), mode="batch", retry_count=0).execute(ops)
+
+    assert [c.args[0] for c in mock_record.call_args_list] == ["req0"]
+    assert results["vid0"]["ok"]
+    assert not results["vid1"]["ok"] and not results["vid2"]["ok"]
+
+
+def test_concurrent_mode(service):
+    def factory(key):
+        request = MagicMock()
+        if key == "bad":
+            request.execute.side_effect = _http_error(403)
+        else:
+            request.execute.return_value = {"id": key}
+        return lambda svc: request
+
+    ops = [(key, factory(key)) for key in ["a", "b", "bad"]]
+    results = BatchExecutor(MagicMock(), mode="concurrent", max_workers=2, retry_count=0).execute(ops)
+
+    assert results["a"]["response"] == {"id": "a"}
+    assert results["b"]["ok"]
+    assert not results["bad"]["ok"]
+    service.new_batch_http_request.assert_not_called()
+
+
+def test_invalid_mode():
+    with pytest.raises(ValueError):
+        BatchExecutor(MagicMock(), mode="serial")
@@ -0,0 +1,55 @@
+import threading
+from unittest.mock import MagicMock, patch
+
+import httplib2
+from googleapiclient.errors import HttpError
+
+from src.lib.video.enrich import VideoEnricher
+
+
+def _service(calls, fail_ids=()):
+    service = MagicMock()
+
+    def list_videos(id, part, maxResults, fields):
+        ids = id.split(",")
+        calls.append((ids, part, fields, threading.current_thread().name))
+        request = MagicMock()
+        if set(fail_ids) & set(ids):
+            request.execute.side_effect = HttpError(httplib2.Response({"status": "400"}), b"Bad")
+        else:
+            request.execute.return_value = {
+                "items": [{"id": v, "status": {"privacyStatus": "public"}} for v in ids]
+            }
+        return request
+
+    service.videos().list.side_effect = list_videos
+    return service
+
+
+@patch("src.lib.video.enrich.get_service")
+def test_full_chunks_start_before_results(mock_get_service):
+    calls = []
+    mock_get_service.return_value = _service(calls)
+
+    with VideoEnricher(MagicMock(), parts=("status", "fileDetails"), max_workers=2) as enricher:
+        enricher.add(f"v{i}" for i in range(30))
+        enricher.add(f"v{i}" for i in range(30, 120))
+        enricher._futures[0].result()  # 最初の50件は results() を待たずに送信済み
+        videos = enricher.results()
+
+    assert len(videos) == 120
+    assert [len(ids) for ids, *_ in sorted(calls, key=lambda c: int(c[0][0][1:]))] == [50, 50, 20]
+    assert calls[0][1] == "status,fileDetails"
+
+
+@patch("src.lib.video.enrich.get_service")
+def test_failed_chunk_is_skipped(mock_get_service):
+    calls = []
+    mock_get_service.return_value = _service(calls, fail_ids={"v60"})
+
+    with VideoEnricher(MagicMock(), fields="items(id,status)") as enricher:
+        enricher.add(f"v{i}" for i in range(100))
+        videos = enricher.results()
+
+    assert set(videos) == {f"v{i}" for i in range(50)}
+    assert all(fields == "items(id,status)" for _, _, fields, _ in calls)
@@ -8,7 +8,7 @@ class TestVideoManager(unittest.TestCase):
         self.mock_credentials = MagicMock()
         self.manager = VideoManager(self.mock_credentials)
 
-    @patch("src.lib.video.manager.build")
+    @patch("src.lib.video.manager.get_service")
     def test_update_privacy_status_success(self, mock_build):
         # Setup mocks
         mock_service = MagicMock()
@@ -37,13 +37,13 @@ class TestVideoManager(unittest.TestCase):
         )
         mock_update.execute.assert_called_once()
 
-    @patch("src.lib.video.manager.build")
+    @patch("src.lib.video.manager.get_service")
     def test_update_privacy_status_invalid_status(self, mock_build):
         result = self.manager.update_privacy_status("test_video_id", "invalid_status")
         self.assertFalse(result)
         mock_build.assert_not_called()
 
-    @patch("src.lib.video.manager.build")
+    @patch("src.lib.video.manager.get_service")
     def test_update_privacy_status_api_error(self, mock_build):
         # Setup mocks
         mock_service = MagicMock()
@@ -58,7 +58,7 @@ class TestVideoManager(unittest.TestCase):
         # Verify
         self.assertFalse(result)
 
-    @patch("src.lib.video.manager.build")
+    @patch("src.lib.video.manager.get_service")
     def test_update_metadata_success(self, mock_build):
         # Setup mocks
         mock_service = MagicMock()
@@ -110,7 +110,7 @@ class TestVideoManager(unittest.TestCase):
             }
         )
 
-    @patch("src.lib.video.manager.build")
+    @patch("src.lib.video.manager.get_service")
     @patch("src.lib.video.manager.MediaFileUpload")
     def test_update_thumbnail_success(self, mock_media_file, mock_build):
         # Setup mocks
@@ -135,7 +135,7 @@ class TestVideoManager(unittest.TestCase):
             media_body=mock_media_file.return_value
         )
 
-    @patch("src.lib.video.manager.build")
+    @patch("src.lib.video.manager.get_service")
     def test_delete_video_success(self, mock_build):
         # Setup mocks
         mock_service = MagicMock()
@@ -154,7 +154,7 @@ class TestVideoManager(unittest.TestCase):
         self.assertTrue(result)
         mock_videos.delete.assert_called_with(id="vid123")
 
-    @patch("src.lib.video.manager.build")
+    @patch("src.lib.video.manager.get_service")
     def test_update_metadata_not_found(self, mock_build):
         mock_service = MagicMock()
         mock_build.return_value = mock_service
@@ -163,7 +163,7 @@ class TestVideoManager(unittest.TestCase):
         result = self.manager.update_metadata("vid123", title="New")
         self.assertFalse(result)
 
-    @patch("src.lib.video.manager.build")
+    @patch("src.lib.video.manager.get_service")
     def test_update_metadata_http_error(self, mock_build):
         mock_service = MagicMock()
         mock_build.return_value = mock_service
@@ -174,7 +174,7 @@ class TestVideoManager(unittest.TestCase):
         result = self.manager.update_metadata("vid123", title="New")
         self.assertFalse(result)
 
-    @patch("src.lib.video.manager.build")
+    @patch("src.lib.video.manager.get_service")
     @patch("src.lib.video.manager.MediaFileUpload")
     def test_update_thumbnail_http_error(self, mock_media_file, mock_build):
         mock_service = MagicMock()
@@ -186,7 +186,7 @@ class TestVideoManager(unittest.TestCase):
         result = self.manager.update_thumbnail("vid123", "dummy_path.jpg")
         self.assertFalse(result)
 
-    @patch("src.lib.video.manager.build")
+    @patch("src.lib.video.manager.get_service")
     def test_delete_video_http_error(self, mock_build):
         mock_service = MagicMock()
         mock_build.return_value = mock_service
@@ -197,10 +197,136 @@ class TestVideoManager(unittest.TestCase):
         result = self.manager.delete_video("vid123")
         self.assertFalse(result)
 
-    @patch("src.lib.video.manager.build")
-    def test_get_all_uploaded_videos_success(self, mock_build):
+    @patch("src.lib.video.manager.BatchExecutor")
+    def test_update_privacy_status_bulk(self, mock_executor):
+        mock_executor.return_value.execute.return_value = {
+            "vid1": {"ok": True, "response": {}, "error": None},
+            "vid2": {"ok": False, "response": None, "error": Exception("boom")},
+        }
+
+        results = self.manager.update_privacy_status_bulk(["vid1", "vid2"], "private")
+
+        self.assertEqual(results, {"vid1": True, "vid2": False})
+        operations = mock_executor.return_value.execute.call_args[0][0]
+        self.assertEqual([key for key, _ in operations], ["vid1", "vid2"])
+        service = MagicMock()
+        operations[1][1](service)
+        service.videos().update.assert_called_with(
+            part="status", body={"id": "vid2", "status": {"privacyStatus": "private"}}
+        )
+
+    @patch("src.lib.video.manager.BatchExecutor")
+    def test_get_privacy_statuses_chunks_ids(self, mock_executor):
+        video_ids = [f"v{i}" for i in range(120)]
+        mock_executor.return_value.execute.return_value = {
+            0: {"ok": True, "response": {"items": [{"id": "v0", "status": {"privacyStatus": "public"}}]}, "error": None},
+            50: {"ok": True, "response": {"items": [{"id": "v60", "status": {"privacyStatus": "private"}}]}, "error": None},
+            100: {"ok": False, "response": None, "error": Exception("boom")},
+        }
+
+        statuses = self.manager.get_privacy_statuses(video_ids, concurrency=2)
+
+        self.assertEqual(statuses, {"v0": "public", "v60": "private"})
+        mock_executor.assert_called_once_with(self.mock_credentials, max_workers=2)
+        operations = mock_executor.return_value.execute.call_args[0][0]
+        self.assertEqual([key for key, _ in operations], [0, 50, 100])
+        service = MagicMock()
+        operations[2][1](service)
+        service.videos().list.assert_called_with(
+            id=",".join(video_ids[100:]), part="status", maxResults=50,
+            fields="items(id,status/privacyStatus)",
+        )
+
+    @patch("src.lib.video.manager.BatchExecutor")
+    def test_update_privacy_status_bulk_invalid_status(self, mock_executor):
+        results = self.manager.update_privacy_status_bulk(["vid1"], "secret")
+        self.assertEqual(results, {"vid1": False})
+        mock_executor.assert_not_called()
+
+    def test_diff_snippet(self):
+        snippet = {"title": "T", "description": "D", "tags": ["a"], "categoryId": "22", "channelId": "C"}
+        self.assertIsNone(VideoManager.diff_snippet(snippet, {"title": "T", "tags": ["a"]}))
+        self.assertEqual(
+            VideoManager.diff_snippet(snippet, {"tags": ["a", "b"]}),
+            {"title": "T", "description": "D", "tags": ["a", "b"], "categoryId": "22"},
+        )
+
+    @patch("src.lib.video.manager.get_service")
+    def test_update_metadata_unchanged_skips_update(self, mock_build):
         mock_service = MagicMock()
         mock_build.return_value = mock_service
+        mock_service.videos().list().execute.return_value = {
+            "items": [{"snippet": {"title": "Same", "description": "", "categoryId": "22"}}]
+        }
+
+        self.assertTrue(self.manager.update_metadata("vid1", title="Same"))
+        mock_service.videos().update.assert_not_called()
+
+    @patch("src.lib.video.manager.BatchExecutor")
+    def test_plan_metadata_updates(self, mock_executor):
+        mock_executor.return_value.execute.return_value = {
+            0: {"ok": True, "response": {"items": [
+                {"id": "v1", "snippet": {"title": "Old", "description": "", "categoryId": "22"}},
+                {"id": "v2", "snippet": {"title": "New", "description": "", "categoryId": "22"}},
+            ]}, "error": None},
+        }
+
+        updates, missing, errors = self.manager.plan_metadata_updates(
+            {"v1": {"title": "New"}, "v2": {"title": "New"}, "v3": {"title": "New"}}
+        )
+
+        self.assertEqual(list(updates), ["v1"])
+        self.assertEqual(updates["v1"]["title"], "New")
+        self.assertEqual(missing, ["v3"])
+        self.assertEqual(errors, [])
+
+    @patch("src.lib.video.manager.BatchExecutor")
+    def test_plan_metadata_updates_reports_fetch_errors(self, mock_executor):
+        ids = [f"v{i}" for i in range(51)]
+        mock_executor.return_value.execute.return_value = {
+            0: {"ok": False, "response": None, "error": Exception("500")},
+            50: {"ok": True, "response": {"items": []}, "error": None},
+        }
+
+        updates, missing, errors = self.manager.plan_metadata_updates({vid: {"title": "New"} for vid in ids})
+
+        self.assertEqual(updates, {})
+        # 取得に失敗したチャンクは "Not found" ではなく fetch error
+        self.assertEqual(missing, ["v50"])
+        self.assertEqual(errors, ids[:50])
+
+    @patch("src.lib.video.manager.BatchExecutor")
+    def test_apply_metadata_updates(self, mock_executor):
+        mock_executor.return_value.execute.return_value = {
+            "v1": {"ok": True, "response": {}, "error": None},
+        }
+        snippet = {"title": "New", "description": "", "tags": [], "categoryId": "22"}
+
+        self.assertEqual(self.manager.apply_metadata_updates({"v1": snippet}, concurrency=3), {"v1": True})
+        mock_executor.assert_called_once_with(self.mock_credentials, max_workers=3)
+        operations = mock_executor.return_value.execute.call_args[0][0]
+        service = MagicMock()
+        operations[0][1](service)
+        service.videos().update.assert_called_with(part="snippet", body={"id": "v1", "snippet": snippet})
+
+    @patch("src.lib.video.manager.BatchExecutor")
+    def test_delete_videos(self, mock_executor):
+        mock_executor.return_value.execute.return_value = {
+            "vid1": {"ok": True, "response": "", "error": None},
+        }
+
+        self.assertEqual(self.manager.delete_videos(["vid1"]), {"vid1": True})
+        operations = mock_executor.return_value.execute.call_args[0][0]
+        service = MagicMock()
+        operations[0][1](service)
+        service.videos().delete.assert_called_with(id="vid1")
+
+    @patch("src.lib.video.enrich.get_service")
+    @patch("src.lib.video.manager.get_service")
+    def test_get_all_uploaded_videos_success(self, mock_build, mock_enrich_build):
+        mock_service = MagicMock()
+        mock_build.return_value = mock_service
+        mock_enrich_build.return_value = mock_service
 
         # 1. Mock channel list
         mock_service.channels().list().execute.return_value = {
@@ -246,7 +372,7 @@ class TestVideoManager(unittest.TestCase):
         self.assertEqual(videos[1]["id"], "VID2")
         self.assertEqual(videos[1]["privacy"], "private")
 
-    @patch("src.lib.video.manager.build")
+    @patch("src.lib.video.manager.get_service")
     def test_get_all_uploaded_videos_no_channel(self, mock_build):
         mock_service = MagicMock()
         mock_build.return_value = mock_service
@@ -255,7 +381,7 @@ class TestVideoManager(unittest.TestCase):
         videos = self.manager.get_all_uploaded_videos()
         self.assertEqual(videos, [])
 
-    @patch("src.lib.video.manager.build")
+    @patch("src.lib.video.manager.get_service")
     def test_get_all_uploaded_videos_http_error(self, mock_build):
         mock_service = MagicMock()
         mock_build.return_value = mock_service
@@ -265,3 +391,153 @@ class TestVideoManager(unittest.TestCase):
 
         videos = self.manager.get_all_uploaded_videos()
         self.assertEqual(videos, [])
+
+    @patch("src.lib.video.manager.get_service")
+    def test_get_all_uploaded_videos_from_catalog(self, mock_build):
+        catalog = MagicMock()
+        catalog.videos.return_value = [{"id": "VID1", "title": "Title 1", "privacy": "public"}]
+        manager = VideoManager(self.mock_credentials, catalog=catalog)
+
+        videos = manager.get_all_uploaded_videos(full_refresh=True)
+
+        self.assertEqual(videos, catalog.videos.return_value)
+        catalog.refresh.assert_called_once()
+        self.assertEqual(catalog.refresh.call_args[0][0], mock_build.return_value)
+        self.assertTrue(catalog.refresh.call_args[1]["full"])
+        mock_build.return_value.playlistItems().list.assert_not_called()
+
+    @patch("src.lib.video.manager.VideoEnricher")
+    @patch("src.lib.video.manager.get_service")
+    def test_get_all_uploaded_videos_extra_parts(self, mock_build, mock_enricher):
+        catalog = MagicMock()
+        catalog.videos.return_value = [{"id": "VID1", "title": "Title 1", "privacy": "public"}]
+        enricher = mock_enricher.return_value.__enter__.return_value
+        enricher.results.return_value = {
+            "VID1": {"id": "VID1", "processingDetails": {"processingStatus": "succeeded"}},
+        }
+        manager = VideoManager(self.mock_credentials, catalog=catalog)
+
+        videos = manager.get_all_uploaded_videos(parts=("status", "processingDetails"))
+
+        self.assertEqual(videos[0]["privacy"], "public")
+        self.assertEqual(videos[0]["processingDetails"], {"processingStatus": "succeeded"})
+        self.assertEqual(mock_enricher.call_args_list[-1][0][1], ("processingDetails",))
+
+    def _paged_service(self, pages):
+        """uploads プレイリストを pages (動画 ID のリストのリスト) で返すフェイク service。"""
+        service = MagicMock()
+        service.channels().list().execute.return_value = {
+            "items": [{"contentDetails": {"relatedPlaylists": {"uploads": "UU1"}}}]
+        }
+        responses = []
+        for i, ids in enumerate(pages):
+            response = {"items": [{"contentDetails": {"videoId": v}, "snippet": {"title": v}} for v in ids]}
+            if i + 1 < len(pages):
+                response["nextPageToken"] = f"p{i + 1}"
+            responses.append(response)
+        service.playlistItems().list().execute.side_effect = responses
+        service.playlistItems().list.reset_mock()
+        return service
+
+    @patch("src.lib.video.enrich.get_service")
+    @patch("src.lib.video.manager.get_service")
+    def test_iter_uploaded_videos_filters_while_streaming(self, mock_build, mock_enrich_service):
+        mock_build.return_value = self._paged_service([["V1", "V2"], ["V3"]])
+        mock_enrich_service.return_value.videos().list().execute.side_effect = [
+            {"items": [{"id": "V1", "status": {"privacyStatus": "public"}},
+                       {"id": "V2", "status": {"privacyStatus": "private"}}]},
+            {"items": [{"id": "V3", "status": {"privacyStatus": "public"}}]},
+        ]
+
+        videos = list(self.manager.iter_uploaded_videos(privacy="public"))
+
+        self.assertEqual([v["id"] for v in videos], ["V1", "V3"])
+        self.assertEqual(videos[0], {"id": "V1", "title": "V1", "privacy": "public"})
+
+    @patch("src.lib.video.enrich.get_service")
+    @patch("src.lib.video.manager.get_service")
+    def test_iter_uploaded_videos_limit_stops_paging(self, mock_build, mock_enrich_service):
+        service = self._paged_service([["V1", "V2"], ["V3", "V4"], ["V5"]])
+        mock_build.return_value = service
+        mock_enrich_service.return_value.videos().list().execute.return_value = {
+            "items": [{"id": v, "status": {"privacyStatus": "private"}} for v in ("V1", "V2")]
+        }
+
+        videos = list(self.manager.iter_uploaded_videos(limit=2))
+
+        self.assertEqual([v["id"] for v in videos], ["V1", "V2"])
+        # 最初のページで limit に届くので次のページは読まない
+        self.assertEqual(service.playlistItems().list.call_count, 1)
+
+    @patch("src.lib.video.manager.get_service")
+    def test_iter_uploaded_videos_from_catalog(self, mock_build):
+        catalog = MagicMock()
+        catalog.full_refresh_due.return_value = False
+        catalog.iter_videos.return_value = iter([{"id": "VID1", "title": "Title 1", "privacy": "public"}])
+        manager = VideoManager(self.mock_credentials, catalog=catalog)
+
+        videos = list(manager.iter_uploaded_videos(privacy="public", limit=5))
+
+        self.assertEqual([v["id"] for v in videos], ["VID1"])
+        catalog.refresh.assert_called_once()
+        catalog.iter_videos.assert_called_once_with(privacy="public", limit=5)
+
+    @patch("src.lib.video.enrich.get_service")
+    @patch("src.lib.video.manager.get_service")
+    def test_iter_uploaded_videos_streams_when_catalog_needs_full_refresh(self, mock_build, mock_enrich_service):
+        catalog = MagicMock()
+        catalog.full_refresh_due.return_value = True
+        service = self._paged_service([["V1", "V2"], ["V3"]])
+        mock_build.return_value = service
+        mock_enrich_service.return_value.videos().list().execute.return_value = {
+            "items": [{"id": v, "status": {"privacyStatus": "public"}} for v in ("V1", "V2")]
+        }
+        manager = VideoManager(self.mock_credentials, catalog=catalog)
+
+        videos = list(manager.iter_uploaded_videos(full_refresh=True, limit=2))
+
+        self.assertEqual([v["id"] for v in videos], ["V1", "V2"])
+        self.assertEqual(service.playlistItems().list.call_count, 1)
+        catalog.full_refresh_due.assert_called_once_with(True)
+        catalog.refresh.assert_not_called()
+        # 途中で打ち切った一覧ではミラーを置き換えない
+        catalog.replace.assert_not_called()
+
+    @patch("src.lib.video.enrich.get_service")
+    @patch("src.lib.video.manager.get_service")
+    def test_iter_uploaded_videos_replaces_catalog_after_full_read(self, mock_build, mock_enrich_service):
+        catalog = MagicMock()
+        catalog.full_refresh_due.return_value = True
+        mock_build.return_value = self._paged_service([["V1", "V2"], ["V3"]])
+        mock_enrich_service.return_value.videos().list().execute.side_effect = [
+            {"items": [{"id": "V1", "status": {"privacyStatus": "public"}},
+                       {"id": "V2", "status": {"privacyStatus": "private"}}]},
+            {"items": [{"id": "V3", "status": {"privacyStatus": "public"}}]},
+        ]
+        manager = VideoManager(self.mock_credentials, catalog=catalog)
+
+        videos = list(manager.iter_uploaded_videos(privacy="public"))
+
+        self.assertEqual([v["id"] for v in videos], ["V1", "V3"])
+        uploads_playlist_id, fetched = catalog.replace.call_args[0]
+        self.assertEqual(uploads_playlist_id, "UU1")
+        self.assertEqual([(v["id"], v["privacy"]) for v in fetched],
+                         [("V1", "public"), ("V2", "private"), ("V3", "public")])
+
+    @patch("src.lib.video.manager.BatchExecutor")
+    def test_bulk_changes_write_through_to_catalog(self, mock_executor):
+        catalog = MagicMock()
+        manager = VideoManager(self.mock_credentials, catalog=catalog)
+        mock_executor.return_value.execute.return_value = {
+            "v1": {"ok": True, "response": {}, "error": None},
+            "v2": {"ok": False, "response": None, "error": Exception("boom")},
+        }
+
+        manager.update_privacy_status_bulk(["v1", "v2"], "public")
+        catalog.update_privacy.assert_called_once_with(["v1"], "public")
+
+        manager.delete_videos(["v1", "v2"])
+        catalog.remove.assert_called_once_with(["v1"])
+
+        manager.apply_metadata_updates({"v1": {"title": "New"}, "v2": {"title": "Other"}})
+        catalog.update_titles.assert_called_once_with({"v1": "New"})
@@ -0,0 +1,54 @@
+import pytest
+
+from src.lib.video.media import ReadAheadMediaFileUpload
+
+
+@pytest.fixture
+def video_file(tmp_path):
+    path = tmp_path / "video.mp4"
+    path.write_bytes(bytes(range(100)))
+    return path
+
+
+def test_getbytes_sequential(video_file):
+    media = ReadAheadMediaFileUpload(str(video_file), chunksize=30, read_ahead=2)
+    try:
+        assert media.getbytes(0, 30) == bytes(range(0, 30))
+        # The next two chunks should already be queued
+        assert set(media._pending) == {30, 60}
+        assert media.getbytes(30, 30) == bytes(range(30, 60))
+        assert media.getbytes(60, 30) == bytes(range(60, 90))
+        assert media.getbytes(90, 30) == bytes(range(90, 100))
+        assert media._pending == {}
+    finally:
+        media.close()
+
+
+def test_getbytes_after_partial_ack(video_file):
+    media = ReadAheadMediaFileUpload(str(video_file), chunksize=30, read_ahead=2)
+    try:
+        media.getbytes(0, 30)
+        # Server acknowledged only part of the chunk: offsets shift
+        assert media.getbytes(25, 30) == bytes(range(25, 55))
+        assert set(media._pending) == {55, 85}
+    finally:
+        media.close()
+
+
+def test_read_ahead_bounded(video_file):
+    media = ReadAheadMediaFileUpload(str(video_file), chunksize=10, read_ahead=3)
+    try:
+        media.getbytes(0, 10)
+        assert len(media._pending) == 3
+    finally:
+        media.close()
+
+
+def test_uses_getbytes_not_stream(video_file):
+    media = ReadAheadMediaFileUpload(str(video_file), chunksize=10)
+    try:
+        assert media.has_stream() is False
+        assert media.size() == 100
+        assert media.resumable() is True
+    finally:
+        media.close()
@@ -7,7 +7,7 @@ class TestPlaylistManager(unittest.TestCase):
         self.mock_creds = MagicMock()
         self.manager = PlaylistManager(self.mock_creds)
 
-    @patch("src.lib.video.playlist.build")
+    @patch("src.lib.video.playlist.get_service")
     def test_get_or_create_existing(self, mock_build):
         # Mock Service
         mock_service = MagicMock()
@@ -24,10 +24,10 @@ class TestPlaylistManager(unittest.TestCase):
         playlist_id = self.manager.get_or_create_playlist("Existing Playlist")
         self.assertEqual(playlist_id, "PL123")
         
-        # Verify fresh service was built
-        mock_build.assert_called_with("youtube", "v3", credentials=self.mock_creds, cache_discovery=False)
+        # Verify the shared service factory was used
+        mock_build.assert_called_with(self.mock_creds)
 
-    @patch("src.lib.video.playlist.build")
+    @patch("src.lib.video.playlist.get_service")
     def test_get_or_create_new(self, mock_build):
         mock_service = MagicMock()
         mock_build.return_value = mock_service
@@ -44,11 +44,35 @@ class TestPlaylistManager(unittest.TestCase):
         
         self.assertEqual(playlist_id, "PL_NEW")
         mock_service.playlists().insert.assert_called()
-        # Verify build called twice (once for ensure_cache, once for create in this flow?)
-        # Actually _ensure_cache calls build, then insert calls build again.
+        # _ensure_cache and insert each ask the factory for a service
         self.assertTrue(mock_build.call_count >= 1)
 
-    @patch("src.lib.video.playlist.build")
+    @patch("src.lib.video.playlist.get_service")
+    def test_get_or_create_single_flight(self, mock_build):
+        import threading
+        import time
+        from concurrent.futures import ThreadPoolExecutor
+
+        mock_service = MagicMock()
+        mock_build.return_value = mock_service
+        mock_service.playlists().list.return_value.execute.return_value = {}
+
+        insert_calls = []
+
+        def slow_insert():
+            insert_calls.append(threading.get_ident())
+            time.sleep(0.05)  # 作成中に他のスレッドが到着する
+            return {"id": "PL_ONE"}
+
+        mock_service.playlists().insert.return_value.execute.side_effect = slow_insert
+
+        with ThreadPoolExecutor(max_workers=8) as pool:
+            results = list(pool.map(lambda _: self.manager.get_or_create_playlist("Trip"), range(8)))
+
+        self.assertEqual(results, ["PL_ONE"] * 8)
+        self.assertEqual(len(insert_calls), 1)
+
+    @patch("src.lib.video.playlist.get_service")
     def test_add_video_to_playlist(self, mock_build):
         mock_service = MagicMock()
         mock_build.return_value = mock_service
@@ -61,7 +85,7 @@ class TestPlaylistManager(unittest.TestCase):
         mock_service.playlistItems().insert.assert_called()
         mock_build.assert_called()
 
-    @patch("src.lib.video.playlist.build")
+    @patch("src.lib.video.playlist.get_service")
     def test_remove_video_from_playlist(self, mock_build):
         # Setup mocks
         mock_service = MagicMock()
@@ -86,12 +110,13 @@ class TestPlaylistManager(unittest.TestCase):
         mock_service.playlistItems().list.assert_called_with(
             part="id",
             playlistId="playlist_id_abc",
-            videoId="video_id_xyz"
+            videoId="video_id_xyz",
+            fields="items/id",
         )
         mock_service.playlistItems().delete.assert_called_with(id="playlist_item_id_123")
         mock_delete.execute.assert_called_once()
         
-    @patch("src.lib.video.playlist.build")
+    @patch("src.lib.video.playlist.get_service")
     def test_remove_video_from_playlist_not_found(self, mock_build):
         # Setup mocks
         mock_service = MagicMock()
@@ -107,7 +132,7 @@ class TestPlaylistManager(unittest.TestCase):
         self.assertFalse(result)
         mock_service.playlistItems().delete.assert_not_called()
 
-    @patch("src.lib.video.playlist.build")
+    @patch("src.lib.video.playlist.get_service")
     def test_rename_playlist_success(self, mock_build):
         # Setup mocks
         mock_service = MagicMock()
@@ -156,7 +181,7 @@ class TestPlaylistManager(unittest.TestCase):
         self.assertIn("New Name", self.manager._playlist_cache)
         self.assertNotIn("Old Name", self.manager._playlist_cache)
 
-    @patch("src.lib.video.playlist.build")
+    @patch("src.lib.video.playlist.get_service")
     def test_ensure_cache_http_error(self, mock_build):
         from googleapiclient.errors import HttpError
         import httplib2
@@ -172,7 +197,7 @@ class TestPlaylistManager(unittest.TestCase):
         self.manager._ensure_cache()
         self.assertFalse(self.manager._initialized)
 
-    @patch("src.lib.video.playlist.build")
+    @patch("src.lib.video.playlist.get_service")
     def test_get_or_create_http_error(self, mock_build):
         from googleapiclient.errors import HttpError
         import httplib2
@@ -188,7 +213,7 @@ class TestPlaylistManager(unittest.TestCase):
         playlist_id = self.manager.get_or_create_playlist("New Playlist")
         self.assertIsNone(playlist_id)
 
-    @patch("src.lib.video.playlist.build")
+    @patch("src.lib.video.playlist.get_service")
     def test_add_video_to_playlist_already_in(self, mock_build):
         from googleapiclient.errors import HttpError
         import httplib2
@@ -202,7 +227,7 @@ class TestPlaylistManager(unittest.TestCase):
         success = self.manager.add_video_to_playlist("PL123", "VID999")
         self.assertTrue(success)
 
-    @patch("src.lib.video.playlist.build")
+    @patch("src.lib.video.playlist.get_service")
     def test_add_video_to_playlist_http_error(self, mock_build):
         from googleapiclient.errors import HttpError
         import httplib2
@@ -216,7 +241,7 @@ class TestPlaylistManager(unittest.TestCase):
         success = self.manager.add_video_to_playlist("PL123", "VID999")
         self.assertFalse(success)
 
-    @patch("src.lib.video.playlist.build")
+    @patch("src.lib.video.playlist.get_service")
     def test_remove_video_from_playlist_http_error(self, mock_build):
         from googleapiclient.errors import HttpError
         import httplib2
@@ -231,7 +256,7 @@ class TestPlaylistManager(unittest.TestCase):
         self.assertFalse(success)
 
     @patch.object(PlaylistManager, "get_or_create_playlist")
-    @patch("src.lib.video.playlist.build")
+    @patch("src.lib.video.playlist.get_service")
     def test_get_video_ids_from_playlist(self, mock_build, mock_get_playlist):
         mock_get_playlist.return_value = "PL123"
         
@@ -259,7 +284,7 @@ class TestPlaylistManager(unittest.TestCase):
         self.assertEqual(video_ids, [])
 
     @patch.object(PlaylistManager, "get_or_create_playlist")
-    @patch("src.lib.video.playlist.build")
+    @patch("src.lib.video.playlist.get_service")
     def test_get_video_ids_from_playlist_http_error(self, mock_build, mock_get_playlist):
         from googleapiclient.errors import HttpError
         import httplib2
@@ -276,10 +301,7 @@ class TestPlaylistManager(unittest.TestCase):
         self.assertEqual(video_ids, [])
 
     def test_find_playlist_id(self):
-        self.manager._playlist_cache = {
-            "Playlist A": "PL123",
-            "Playlist B": "PL456"
-        }
+        self.manager._set_playlists({"PL123": "Playlist A", "PL456": "Playlist B"})
         self.manager._initialized = True
         
         # Test by title
@@ -291,7 +313,7 @@ class TestPlaylistManager(unittest.TestCase):
         # Not found
         self.assertIsNone(self.manager.find_playlist_id("Unknown"))
 
-    @patch("src.lib.video.playlist.build")
+    @patch("src.lib.video.playlist.get_service")
     def test_rename_playlist_not_found(self, mock_build):
         self.manager._playlist_cache = {}
         self.manager._initialized = True
@@ -307,7 +329,7 @@ class TestPlaylistManager(unittest.TestCase):
         
         self.assertFalse(self.manager.rename_playlist("PLUnknown", "New Name"))
 
-    @patch("src.lib.video.playlist.build")
+    @patch("src.lib.video.playlist.get_service")
     def test_rename_playlist_http_error(self, mock_build):
         from googleapiclient.errors import HttpError
         import httplib2
@@ -323,7 +345,7 @@ class TestPlaylistManager(unittest.TestCase):
         
         self.assertFalse(self.manager.rename_playlist("Title", "New Name"))
 
-    @patch("src.lib.video.playlist.build")
+    @patch("src.lib.video.playlist.get_service")
     def test_list_playlists(self, mock_build):
         mock_service = MagicMock()
         mock_build.return_value = mock_service
@@ -352,7 +374,7 @@ class TestPlaylistManager(unittest.TestCase):
         self.assertEqual(playlists[0]["item_count"], 5)
         self.assertEqual(playlists[1]["privacy"], "public")
 
-    @patch("src.lib.video.playlist.build")
+    @patch("src.lib.video.playlist.get_service")
     def test_list_playlists_http_error(self, mock_build):
         from googleapiclient.errors import HttpError
         import httplib2
@@ -367,7 +389,7 @@ class TestPlaylistManager(unittest.TestCase):
         self.assertEqual(playlists, [])
 
     @patch.object(PlaylistManager, "find_playlist_id")
-    @patch("src.lib.video.playlist.build")
+    @patch("src.lib.video.playlist.get_service")
     def test_list_playlist_items(self, mock_build, mock_find_id):
         mock_find_id.return_value = "PL123"
         
@@ -377,6 +399,7 @@ class TestPlaylistManager(unittest.TestCase):
         mock_service.playlistItems().list().execute.return_value = {
             "items": [
                 {
+                    "id": "ITEM1",
                     "snippet": {"title": "Vid 1", "position": 0},
                     "contentDetails": {"videoId": "VID1"}
                 }
@@ -387,6 +410,7 @@ class TestPlaylistManager(unittest.TestCase):
         items = self.manager.list_playlist_items("MyList")
         self.assertEqual(len(items), 1)
         self.assertEqual(items[0]["video_id"], "VID1")
+        self.assertEqual(items[0]["item_id"], "ITEM1")
         self.assertEqual(items[0]["title"], "Vid 1")
         self.assertEqual(items[0]["position"], 0)
 
@@ -397,7 +421,7 @@ class TestPlaylistManager(unittest.TestCase):
         self.assertEqual(items, [])
 
     @patch.object(PlaylistManager, "find_playlist_id")
-    @patch("src.lib.video.playlist.build")
+    @patch("src.lib.video.playlist.get_service")
     def test_list_playlist_items_http_error(self, mock_build, mock_find_id):
         from googleapiclient.errors import HttpError
         import httplib2
@@ -413,42 +437,51 @@ class TestPlaylistManager(unittest.TestCase):
         items = self.manager.list_playlist_items("MyList")
         self.assertEqual(items, [])
         
-    @patch("src.lib.video.playlist.build")
+    @patch("src.lib.video.playlist.get_service")
     def test_get_all_playlists_map(self, mock_build):
-        self.manager._playlist_cache = {
-            "List1": "PL1",
-            "List2": "PL2"
-        }
+        # 同名のプレイリストも別々に読む
+        self.manager._set_playlists({"PL1": "List", "PL2": "List"})
         self.manager._initialized = True
         
         mock_service = MagicMock()
         mock_build.return_value = mock_service
         
-        # We need mock execute sequences for multiple calls
-        mock_execute = MagicMock()
-        mock_service.playlistItems().list().execute = mock_execute
-        
+        # Playlists are fetched concurrently, so answer by playlistId
         # PL1 returns VID1, VID2. PL2 returns VID3
-        mock_execute.side_effect = [
-            {"items": [{"contentDetails": {"videoId": "VID1"}}, {"contentDetails": {"videoId": "VID2"}}]},
-            {"items": [{"contentDetails": {"videoId": "VID3"}}]}
-        ]
-        
+        responses = {
+            "PL1": {"items": [{"contentDetails": {"videoId": "VID1"}}, {"contentDetails": {"videoId": "VID2"}}]},
+            "PL2": {"items": [{"contentDetails": {"videoId": "VID3"}}]},
+        }
+
+        def list_items(**kwargs):
+            request = MagicMock()
+            request.execute.return_value = responses[kwargs["playlistId"]]
+            return request
+
+        mock_service.playlistItems().list.side_effect = list_items
         mock_service.playlistItems().list_next.return_value = None
         
-        playlist_map = self.manager.get_all_playlists_map()
+        progress = []
+        playlist_map = self.manager.get_all_playlists_map(
+            max_workers=2, progress_callback=lambda done, total: progress.append((done, total))
+        )
         
+        self.assertEqual(progress, [(1, 2), (2, 2)])
+        self.assertEqual(
+            mock_service.playlistItems().list.call_args.kwargs["fields"],
+            "nextPageToken,items(id,contentDetails/videoId)",
+        )
         self.assertIn("PL1", playlist_map)
         self.assertIn("PL2", playlist_map)
         self.assertEqual(playlist_map["PL1"], {"VID1", "VID2"})
         self.assertEqual(playlist_map["PL2"], {"VID3"})
 
-    @patch("src.lib.video.playlist.build")
+    @patch("src.lib.video.playlist.get_service")
     def test_get_all_playlists_map_http_error(self, mock_build):
         from googleapiclient.errors import HttpError
         import httplib2
         
-        self.manager._playlist_cache = {"List1": "PL1"}
+        self.manager._set_playlists({"PL1": "List1"})
         self.manager._initialized = True
         
         mock_service = MagicMock()
@@ -460,5 +493,299 @@ class TestPlaylistManager(unittest.TestCase):
         playlist_map = self.manager.get_all_playlists_map()
         self.assertEqual(playlist_map, {})
 
+    @patch("src.lib.video.playlist.BatchExecutor")
+    def test_add_videos_to_playlists(self, mock_executor):
+        mock_executor.return_value.execute.return_value = {
+            ("PL1", "v1"): {"ok": True, "response": {}, "error": None},
+            ("PL1", "v2"): {"ok": False, "response": None, "error": Exception("videoAlreadyInPlaylist")},
+            ("PL2", "v3"): {"ok": False, "response": None, "error": Exception("forbidden")},
+        }
+
+        results = self.manager.add_videos_to_playlists([("PL1", "v1"), ("PL1", "v2"), ("PL2", "v3")])
+
+        self.assertEqual(
+            results, {("PL1", "v1"): True, ("PL1", "v2"): True, ("PL2", "v3"): False}
+        )
+        operations = mock_executor.return_value.execute.call_args[0][0]
+        service = MagicMock()
+        operations[2][1](service)
+        body = service.playlistItems().insert.call_args[1]["body"]
+        self.assertEqual(body["snippet"]["playlistId"], "PL2")
+        self.assertEqual(body["snippet"]["resourceId"]["videoId"], "v3")
+
+    def _index(self):
+        import tempfile
+        from pathlib import Path
+
+        from src.lib.data.playlist_index import PlaylistIndex
+
+        tmp = tempfile.TemporaryDirectory()
+        self.addCleanup(tmp.cleanup)
+        index = PlaylistIndex(db_path=str(Path(tmp.name) / "history.db"), channel="default")
+        self.addCleanup(index.close)
+        return index
+
+    @patch("src.lib.video.playlist.get_service")
+    def test_ensure_cache_paginates(self, mock_build):
+        mock_service = MagicMock()
+        mock_build.return_value = mock_service
+        mock_service.playlists().list.return_value.execute.side_effect = [
+            {"items": [{"id": f"PL{i}", "snippet": {"title": f"List{i}"}} for i in range(50)],
+             "nextPageToken": "P2", "etag": "e1"},
+            {"items": [{"id": "PL50", "snippet": {"title": "List50"}}], "etag": "e2"},
+        ]
+
+        self.assertEqual(self.manager.find_playlist_id("List50"), "PL50")
+        self.assertEqual(len(self.manager._playlist_cache), 51)
+        mock_service.playlists().list.assert_called_with(
+            part="snippet", mine=True, maxResults=50, pageToken="P2",
+            fields="etag,nextPageToken,items(id,snippet/title)",
+        )
+
+    @patch("src.lib.video.playlist.get_service")
+    def test_persistent_index_skips_api_when_fresh(self, mock_build):
+        index = self._index()
+        index.replace(
+            [{"page_token": None, "next_page_token": None, "etag": "e1", "playlist_ids": ["PL1"]}],
+            {"PL1": "Trip"},
+        )
+        manager = PlaylistManager(self.mock_creds, index=index)
+
+        self.assertEqual(manager.get_or_create_playlist("Trip"), "PL1")
+        mock_build.return_value.playlists().list.assert_not_called()
+
+    @patch("src.lib.video.playlist.config")
+    @patch("src.lib.video.playlist.get_service")
+    def test_persistent_index_reuses_unmodified_pages(self, mock_build, mock_config):
+        import httplib2
+        from googleapiclient.errors import HttpError
+
+        mock_config.api.playlist_cache_ttl = 0  # 常に再検証
+        index = self._index()
+        index.replace(
+            [
+                {"page_token": None, "next_page_token": "P2", "etag": "e1", "playlist_ids": ["PL1"]},
+                {"page_token": "P2", "next_page_token": None, "etag": "e2", "playlist_ids": ["PL2"]},
+            ],
+            {"PL1": "Trip", "PL2": "Food"},
+        )
+
+        mock_service = MagicMock()
+        mock_build.return_value = mock_service
+        first, second = MagicMock(headers={}), MagicMock(headers={})
+        first.execute.side_effect = HttpError(httplib2.Response({"status": "304"}), b"")
+        second.execute.return_value = {"items": [{"id": "PL2", "snippet": {"title": "Food 2"}}], "etag": "e3"}
+        mock_service.playlists().list.side_effect = [first, second]
+
+        manager = PlaylistManager(self.mock_creds, index=index)
+        manager._ensure_cache()
+
+        self.assertEqual(first.headers["If-None-Match"], "e1")
+        self.assertEqual(second.headers["If-None-Match"], "e2")
+        self.assertEqual(manager._playlist_cache, {"Trip": "PL1", "Food 2": "PL2"})
+        self.assertEqual(index.playlists(), {"PL1": "Trip", "PL2": "Food 2"})
+        self.assertEqual(index.pages()[1]["etag"], "e3")
+
+    @patch("src.lib.video.playlist.config")
+    @patch("src.lib.video.playlist.get_service")
+    def test_persistent_index_reuses_pages_with_duplicate_titles(self, mock_build, mock_config):
+        import httplib2
+        from googleapiclient.errors import HttpError
+
+        mock_config.api.playlist_cache_ttl = 0
+        index = self._index()
+        index.replace(
+            [{"page_token": None, "next_page_token": None, "etag": "e1", "playlist_ids": ["PL1", "PL2"]}],
+            {"PL1": "Trip", "PL2": "Trip"},
+        )
+
+        mock_service = MagicMock()
+        mock_build.return_value = mock_service
+        page = MagicMock(headers={})
+        page.execute.side_effect = HttpError(httplib2.Response({"status": "304"}), b"")
+        mock_service.playlists().list.side_effect = [page]
+
+        manager = PlaylistManager(self.mock_creds, index=index)
+
+        manager._ensure_cache()
+
+        self.assertEqual(manager._playlists, {"PL1": "Trip", "PL2": "Trip"})
+        self.assertEqual(index.playlists(), {"PL1": "Trip", "PL2": "Trip"})
+        self.assertEqual(index.pages()[0]["etag"], "e1")
+
+    @patch("src.lib.video.playlist.get_service")
+    def test_create_updates_persistent_index(self, mock_build):
+        index = self._index()
+        index.replace([], {})
+        mock_service = MagicMock()
+        mock_build.return_value = mock_service
+        mock_service.playlists().insert.return_value.execute.return_value = {"id": "PL_NEW"}
+
+        manager = PlaylistManager(self.mock_creds, index=index)
+        self.assertEqual(manager.get_or_create_playlist("New"), "PL_NEW")
+
+        self.assertEqual(index.playlists(), {"PL_NEW": "New"})
+
+    def _loaded_index(self):
+        index = self._index()
+        index.replace_items("PL1", [{"video_id": "v1", "item_id": "item1", "position": 0}])
+        return index
+
+    @patch("src.lib.video.playlist.get_service")
+    def test_add_video_skipped_when_in_local_index(self, mock_build):
+        manager = PlaylistManager(self.mock_creds, index=self._loaded_index())
+
+        self.assertTrue(manager.add_video_to_playlist("PL1", "v1"))
+        mock_build.return_value.playlistItems().insert.assert_not_called()
+
+    @patch("src.lib.video.playlist.get_service")
+    def test_add_video_records_item_in_local_index(self, mock_build):
+        index = self._loaded_index()
+        mock_build.return_value.playlistItems().insert.return_value.execute.return_value = {
+            "id": "item2", "snippet": {"position": 1}
+        }
+        manager = PlaylistManager(self.mock_creds, index=index)
+
+        self.assertTrue(manager.add_video_to_playlist("PL1", "v2"))
+        self.assertEqual(index.find_item("PL1", "v2"), "item2")
+
+    @patch("src.lib.video.playlist.get_service")
+    def test_remove_video_uses_local_item_id(self, mock_build):
+        index = self._loaded_index()
+        mock_service = MagicMock()
+        mock_build.return_value = mock_service
+        manager = PlaylistManager(self.mock_creds, index=index)
+
+        self.assertTrue(manager.remove_video_from_playlist("PL1", "v1"))
+        mock_service.playlistItems().list.assert_not_called()
+        mock_service.playlistItems().delete.assert_called_with(id="item1")
+        self.assertIsNone(index.find_item("PL1", "v1"))
+
+    @patch("src.lib.video.playlist.get_service")
+    def test_remove_video_stale_local_item_falls_back(self, mock_build):
+        import httplib2
+        from googleapiclient.errors import HttpError
+
+        index = self._loaded_index()
+        mock_service = MagicMock()
+        mock_build.return_value = mock_service
+        stale, fresh = MagicMock(), MagicMock()
+        stale.execute.side_effect = HttpError(httplib2.Response({"status": "404"}), b"Not Found")
+        mock_service.playlistItems().delete.side_effect = [stale, fresh]
+        mock_service.playlistItems().list().execute.return_value = {"items": [{"id": "item9"}]}
+        manager = PlaylistManager(self.mock_creds, index=index)
+
+        self.assertTrue(manager.remove_video_from_playlist("PL1", "v1"))
+        fresh.execute.assert_called_once()
+
+    @patch("src.lib.video.playlist.BatchExecutor")
+    def test_add_videos_to_playlists_skips_known(self, mock_executor):
+        index = self._loaded_index()
+        mock_executor.return_value.execute.return_value = {
+            ("PL1", "v2"): {"ok": True, "response": {"id": "item2", "snippet": {"position": 1}}, "error": None},
+        }
+        manager = PlaylistManager(self.mock_creds, index=index)
+
+        results = manager.add_videos_to_playlists([("PL1", "v1"), ("PL1", "v2")])
+
+        self.assertEqual(results, {("PL1", "v1"): True, ("PL1", "v2"): True})
+        operations = mock_executor.return_value.execute.call_args[0][0]
+        self.assertEqual([key for key, _ in operations], [("PL1", "v2")])
+        self.assertEqual(index.find_item("PL1", "v2"), "item2")
+
+    @patch("src.lib.video.playlist.get_service")
+    def test_move_playlist_item_updates_position(self, mock_build):
+        index = self._index()
+        index.replace_items("PL1", [
+            {"video_id": "v1", "item_id": "item1", "position": 0},
+            {"video_id": "v2", "item_id": "item2", "position": 1},
+        ])
+        manager = PlaylistManager(self.mock_creds, index=index)
+
+        self.assertTrue(manager.move_playlist_item("PL1", "item2", "v2", 0))
+
+        body = mock_build.return_value.playlistItems().update.call_args[1]["body"]
+        self.assertEqual(body["id"], "item2")
+        self.assertEqual(body["snippet"]["position"], 0)
+        self.assertEqual(body["snippet"]["resourceId"]["videoId"], "v2")
+        # ローカルインデックスの並びも更新される
+        self.assertEqual(index.find_item("PL1", "v2"), "item2")
+
+    @patch("src.lib.video.playlist.get_service")
+    def test_apply_moves_stops_at_first_failure(self, mock_build):
+        import httplib2
+        from googleapiclient.errors import HttpError
+
+        ok, failed = MagicMock(), MagicMock()
+        failed.execute.side_effect = HttpError(httplib2.Response({"status": "400"}), b"Bad Request")
+        mock_build.return_value.playlistItems().update.side_effect = [ok, failed]
+        items = [
+            {"item_id": "item1", "video_id": "v1"},
+            {"item_id": "item2", "video_id": "v2"},
+            {"item_id": "item3", "video_id": "v3"},
+        ]
+
+        applied = self.manager.apply_moves("PL1", items, [("item3", 0), ("item1", 2), ("item2", 0)])
+
+        self.assertEqual(applied, 1)
+        self.assertEqual(mock_build.return_value.playlistItems().update.call_count, 2)
+
+    @patch("src.lib.video.playlist.get_service")
+    def test_find_duplicate_items_keeps_first(self, mock_build):
+        mock_service = MagicMock()
+        mock_build.return_value = mock_service
+        mock_service.playlistItems().list().execute.return_value = {"items": [
+            {"id": "item1", "contentDetails": {"videoId": "v1"}},
+            {"id": "item2", "contentDetails": {"videoId": "v2"}},
+            {"id": "item3", "contentDetails": {"videoId": "v1"}},
+            {"id": "item4", "contentDetails": {"videoId": "v1"}},
+        ]}
+        mock_service.playlistItems().list_next.return_value = None
+
+        duplicates = self.manager.find_duplicate_items(["PL1"])
+
+        self.assertEqual(duplicates, {"PL1": {"v1": ["item3", "item4"]}})
+
+    @patch("src.lib.video.playlist.get_service")
+    def test_find_duplicate_items_scans_playlists_sharing_a_title(self, mock_build):
+        self.manager._set_playlists({"PL1": "Trip", "PL2": "Trip"})
+        self.manager._initialized = True
+        mock_service = MagicMock()
+        mock_build.return_value = mock_service
+        mock_service.playlistItems().list().execute.return_value = {"items": [
+            {"id": "item1", "contentDetails": {"videoId": "v1"}},
+            {"id": "item2", "contentDetails": {"videoId": "v1"}},
+        ]}
+        mock_service.playlistItems().list_next.return_value = None
+
+        duplicates = self.manager.find_duplicate_items()
+
+        self.assertEqual(set(duplicates), {"PL1", "PL2"})
+
+    @patch("src.lib.video.playlist.BatchExecutor")
+    def test_delete_playlist_items_updates_index(self, mock_executor):
+        import httplib2
+        from googleapiclient.errors import HttpError
+
+        index = self._index()
+        index.replace_items("PL1", [
+            {"video_id": "v1", "item_id": "item1", "position": 0},
+            {"video_id": "v1", "item_id": "item2", "position": 1},
+            {"video_id": "v1", "item_id": "item3", "position": 2},
+        ])
+        mock_executor.return_value.execute.return_value = {
+            "item2": {"ok": True, "response": {}, "error": None},
+            "item3": {"ok": False, "response": None,
+                      "error": HttpError(httplib2.Response({"status": "404"}), b"Not Found")},
+        }
+        manager = PlaylistManager(self.mock_creds, index=index)
+
+        results = manager.delete_playlist_items(["item2", "item3"])
+
+        self.assertEqual(results, {"item2": True, "item3": True})
+        self.assertEqual(index.find_item("PL1", "v1"), "item1")
+        operations = mock_executor.return_value.execute.call_args[0][0]
+        self.assertEqual([key for key, _ in operations], ["item2", "item3"])
+
 if __name__ == '__main__':
     unittest.main()
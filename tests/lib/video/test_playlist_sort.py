@@ -0,0 +1,53 @@
+import random
+import unittest
+
+from src.lib.video.playlist_sort import (
+    longest_increasing_subsequence,
+    plan_moves,
+    target_order,
+)
+
+
+def _apply(order, moves):
+    order = list(order)
+    for item, position in moves:
+        order.remove(item)
+        order.insert(position, item)
+    return order
+
+
+class TestPlaylistSort(unittest.TestCase):
+    def test_lis(self):
+        seq = [3, 1, 4, 1, 5, 9, 2, 6]
+        indices = longest_increasing_subsequence(seq)
+        values = [seq[i] for i in indices]
+        self.assertEqual(len(values), 4)
+        self.assertEqual(values, sorted(set(values)))
+        self.assertEqual(longest_increasing_subsequence([]), [])
+
+    def test_already_sorted_needs_no_moves(self):
+        self.assertEqual(plan_moves(["a", "b", "c"], ["a", "b", "c"]), [])
+
+    def test_single_misplaced_item_is_one_move(self):
+        moves = plan_moves(["b", "c", "d", "a"], ["a", "b", "c", "d"])
+        self.assertEqual(moves, [("a", 0)])
+
+    def test_moves_reach_target_with_minimum_count(self):
+        rng = random.Random(0)
+        for n in range(1, 60):
+            current = list(range(n))
+            rng.shuffle(current)
+            target = sorted(current)
+            moves = plan_moves(current, target)
+            self.assertEqual(_apply(current, moves), target)
+            self.assertEqual(len(moves), n - len(longest_increasing_subsequence(current)))
+
+    def test_target_order_puts_unkeyed_last(self):
+        items = [{"item_id": i} for i in ("i1", "i2", "i3", "i4")]
+        keys = {"i1": "b", "i2": None, "i3": "a", "i4": "b"}
+        self.assertEqual(target_order(items, keys), ["i3", "i1", "i4", "i2"])
+        self.assertEqual(target_order(items, keys, reverse=True), ["i1", "i4", "i3", "i2"])
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -1,5 +1,5 @@
 import asyncio
-from unittest.mock import MagicMock, patch
+from unittest.mock import AsyncMock, MagicMock, patch
 
 import pytest
 from googleapiclient.errors import HttpError
@@ -20,14 +20,15 @@ def uploader():
 
 @pytest.fixture(autouse=True)
 def mock_media_file_upload():
-    with patch("src.lib.video.uploader.MediaFileUpload") as mock:
+    with patch("src.lib.video.uploader.MediaFileUpload") as mock, \
+         patch("src.lib.video.uploader.ReadAheadMediaFileUpload"):
         yield mock
 
 
 @pytest.fixture(autouse=True)
-def mock_build(mock_service):
-    with patch("src.lib.video.uploader.build") as mock:
-        mock.return_value = mock_service
+def mock_pool(mock_service):
+    with patch("src.lib.video.uploader.service_pool") as mock:
+        mock.lease.return_value.__enter__.return_value = mock_service
         yield mock
 
 
@@ -65,6 +66,48 @@ async def test_upload_video_success(uploader, mock_service):
     assert mock_request.next_chunk.call_count == 2
 
 
+@pytest.mark.asyncio
+async def test_execute_upload_charges_acknowledged_bytes(uploader):
+    uploader.bandwidth_limiter = MagicMock(acquire=AsyncMock())
+    uploader.host_governor = MagicMock(acquire_bandwidth=AsyncMock())
+    request = MagicMock(resumable_progress=0)
+    request.resumable.size.return_value = 25
+    request.next_chunk.side_effect = [
+        (MagicMock(resumable_progress=10, total_size=25), None),
+        (MagicMock(resumable_progress=10, total_size=25), None),  # 進まなかったチャンクは課金しない
+        (MagicMock(resumable_progress=20, total_size=25), None),
+        (None, {"id": "vid1"}),
+    ]
+    path = MagicMock()
+    path.name = "test.mp4"
+
+    assert await uploader._execute_upload(request, path, None) == "vid1"
+
+    # 最後のチャンクは残りの 5 バイトだけ
+    assert [c.args[0] for c in uploader.bandwidth_limiter.acquire.await_args_list] == [10, 10, 5]
+    assert [c.args[0] for c in uploader.host_governor.acquire_bandwidth.await_args_list] == [10, 10, 5]
+
+
+@pytest.mark.asyncio
+async def test_execute_upload_reports_chunk_latency(uploader):
+    latencies = []
+    uploader.latency_listener = lambda seconds, nbytes: latencies.append((seconds, nbytes))
+    request = MagicMock(resumable_progress=0)
+    request.resumable.size.return_value = 15
+    request.next_chunk.side_effect = [
+        (MagicMock(resumable_progress=10, total_size=15), None),
+        (None, {"id": "vid1"}),
+    ]
+    path = MagicMock()
+    path.name = "test.mp4"
+
+    with patch("src.lib.video.uploader.time") as mock_time:
+        mock_time.monotonic.side_effect = [0, 1, 3, 3, 4]
+        assert await uploader._execute_upload(request, path, None) == "vid1"
+
+    assert latencies == [(2, 10), (1, 5)]
+
+
 @pytest.mark.asyncio
 async def test_upload_video_api_error(uploader, mock_service):
     mock_insert = mock_service.videos().insert
@@ -103,6 +146,138 @@ async def test_upload_video_unexpected_failure(uploader, mock_service):
     assert video_id is None
 
 
+@pytest.mark.asyncio
+async def test_upload_video_closes_read_ahead_media(uploader, mock_service):
+    mock_request = mock_service.videos().insert.return_value
+    mock_request.next_chunk.return_value = (None, {"id": "vid1"})
+
+    path = MagicMock()
+    path.__str__.return_value = "/tmp/test.mp4"
+    path.name = "test.mp4"
+
+    with patch("src.lib.video.uploader.ReadAheadMediaFileUpload") as mock_media, \
+         patch("src.lib.video.uploader.config") as mock_config:
+        mock_config.upload.read_ahead_chunks = 2
+        mock_config.upload.chunk_size = 1024
+        mock_config.upload.stall_timeout = 0
+        await uploader.upload_video(path, {})
+
+    mock_media.assert_called_once_with("/tmp/test.mp4", chunksize=1024, read_ahead=2)
+    mock_media.return_value.close.assert_called_once()
+
+
+@pytest.mark.asyncio
+async def test_upload_video_closes_read_ahead_media_when_insert_fails(uploader, mock_service):
+    mock_service.videos().insert.side_effect = RuntimeError("insert failed")
+
+    path = MagicMock()
+    path.__str__.return_value = "/tmp/test.mp4"
+    path.name = "test.mp4"
+
+    with patch("src.lib.video.uploader.ReadAheadMediaFileUpload") as mock_media, \
+         patch("src.lib.video.uploader.config") as mock_config:
+        mock_config.upload.read_ahead_chunks = 2
+        mock_config.upload.chunk_size = 1024
+        with pytest.raises(RuntimeError):
+            await uploader.upload_video(path, {})
+
+    mock_media.return_value.close.assert_called_once()
+
+
+@pytest.mark.asyncio
+async def test_upload_video_stall_resets_and_resumes(uploader, mock_service):
+    import socket
+    import threading
+
+    mock_request = mock_service.videos().insert.return_value
+    unblock = threading.Event()
+
+    def stalled_chunk():
+        # Half-open socket: blocks until the watchdog shuts it down
+        unblock.wait(5)
+        raise socket.error("Connection reset")
+
+    calls = []
+
+    def next_chunk():
+        calls.append(1)
+        if len(calls) == 1:
+            stalled_chunk()
+        return (None, {"id": "vid_resumed"})
+
+    mock_request.next_chunk = next_chunk
+
+    path = MagicMock()
+    path.__str__.return_value = "/tmp/test.mp4"
+    path.name = "test.mp4"
+
+    with patch("src.lib.video.uploader._reset_connections", side_effect=lambda http: unblock.set()) as mock_reset, \
+         patch("src.lib.video.uploader.config") as mock_config:
+        mock_config.upload.read_ahead_chunks = 0
+        mock_config.upload.stall_timeout = 0.05
+        video_id = await uploader.upload_video(path, {})
+
+    assert video_id == "vid_resumed"
+    assert len(calls) == 2
+    mock_reset.assert_called_once_with(mock_request.http)
+
+
+@pytest.mark.asyncio
+async def test_execute_upload_gives_up_after_max_stalls(uploader):
+    import socket
+    import threading
+
+    unblock = threading.Event()
+    request = MagicMock()
+
+    def next_chunk():
+        unblock.wait(5)
+        unblock.clear()
+        raise socket.error("Connection reset")
+
+    request.next_chunk = next_chunk
+
+    path = MagicMock()
+    path.name = "test.mp4"
+
+    with patch("src.lib.video.uploader._reset_connections", side_effect=lambda http: unblock.set()) as mock_reset, \
+         patch("src.lib.video.uploader.config") as mock_config:
+        mock_config.upload.stall_timeout = 0.05
+        with pytest.raises(socket.timeout):
+            await uploader._execute_upload(request, path, None)
+
+    assert mock_reset.call_count == 3
+
+
+def test_reset_connections_shuts_down_sockets():
+    import socket
+
+    from src.lib.video.uploader import _reset_connections
+
+    conn = MagicMock()
+    idle = MagicMock(sock=None)
+    http = MagicMock()
+    http.http.connections = {"https:upload": conn, "https:idle": idle}
+
+    _reset_connections(http)
+
+    conn.sock.shutdown.assert_called_once_with(socket.SHUT_RDWR)
+
+
+def test_notify_retry_calls_listener(uploader):
+    from src.lib.video.uploader import _notify_retry
+
+    listener = MagicMock()
+    uploader.retry_listener = listener
+    error = HttpError(MagicMock(status=503), b"")
+    retry_state = MagicMock(args=(uploader,))
+    retry_state.outcome.exception.return_value = error
+
+    _notify_retry(retry_state)
+
+    listener.assert_called_once_with(error)
+
+
 def test_should_retry_exception():
     from src.lib.video.uploader import should_retry_exception
     import socket